@@ -0,0 +1,109 @@
+import numpy as np
+
+MAX_BITS = 64
+
+
+def _word_mask(bits):
+    return np.uint64((1 << bits) - 1)
+
+
+def _check_bits(bits):
+    if not 1 <= bits <= MAX_BITS:
+        raise ValueError(f"Ошибка: разрядность должна быть от 1 до {MAX_BITS}")
+
+
+# Модуль числа в uint64 без переполнения на минимальном int64
+def _magnitude(nums, negative):
+    words = nums.astype(np.uint64)
+    return np.where(negative, ~words + np.uint64(1), words)
+
+
+# Разворачивание слов в матрицу битов (старший бит слева, как в decimal_to_binary)
+def unpack_bits(words, bits=8):
+    _check_bits(bits)
+    words = np.asarray(words, dtype=np.uint64)
+    shifts = np.arange(bits - 1, -1, -1, dtype=np.uint64)
+    return ((words[..., None] >> shifts) & np.uint64(1)).astype(np.uint8)
+
+
+# Упакованная матрица битов: по (bits + 7) // 8 байт на слово, старший бит первым,
+# та же раскладка, что у np.packbits(unpack_bits(words, bits), axis=-1)
+def pack_bits(words, bits=8):
+    _check_bits(bits)
+    words = np.asarray(words, dtype=np.uint64) << np.uint64(MAX_BITS - bits)
+    packed = words.astype('>u8').view(np.uint8).reshape(words.shape + (8,))
+    return packed[..., :(bits + 7) // 8]
+
+
+# Прямой, обратный и дополнительный коды для массива чисел.
+# Быстрый вариант - слова uint64 (или packed=True, матрицы pack_bits);
+# as_bits=True даёт побитовую матрицу uint8 для сверки с decimal_to_binary,
+# она на порядок медленнее слов
+def decimal_to_binary_batch(nums, bits=8, as_bits=False, packed=False):
+    _check_bits(bits)
+    nums = np.asarray(nums)
+    if nums.dtype.kind not in 'iu':
+        raise TypeError("Ошибка: ожидается целочисленный массив")
+    nums = nums.astype(np.int64)
+    negative = nums < 0
+    magnitude = _magnitude(nums, negative)
+    if bits < MAX_BITS and np.any(magnitude >> np.uint64(bits)):
+        raise ValueError(f"Ошибка: число не помещается в {bits} бит")
+
+    mask = _word_mask(bits)
+    sign_bit = np.uint64(1 << (bits - 1))
+    direct_code = np.where(negative, magnitude | sign_bit, magnitude)
+    reverse_code = np.where(negative, ~magnitude & mask, magnitude)
+    complement_code = np.where(negative, (reverse_code + np.uint64(1)) & mask, magnitude)
+
+    if packed:
+        return pack_bits(direct_code, bits), pack_bits(reverse_code, bits), pack_bits(complement_code, bits)
+    if as_bits:
+        return unpack_bits(direct_code, bits), unpack_bits(reverse_code, bits), unpack_bits(complement_code, bits)
+    return direct_code, reverse_code, complement_code
+
+
+_FLOAT_TYPES = {32: (np.float32, np.uint32), 64: (np.float64, np.uint64)}
+
+
+def _float_types(bits):
+    if bits not in _FLOAT_TYPES:
+        raise ValueError("Ошибка: поддерживаются только форматы binary32 и binary64")
+    return _FLOAT_TYPES[bits]
+
+
+# Массив чисел -> слова IEEE-754 (или матрица битов)
+def float_to_ieee_batch(values, bits=32, as_bits=False):
+    float_type, word_type = _float_types(bits)
+    with np.errstate(over='ignore'):
+        words = np.ascontiguousarray(values, dtype=float_type).view(word_type)
+    return unpack_bits(words, bits) if as_bits else words
+
+
+def ieee_to_float_batch(words, bits=32):
+    float_type, word_type = _float_types(bits)
+    return np.ascontiguousarray(words, dtype=word_type).view(float_type)
+
+
+# Частные с precision двоичными знаками для массивов операндов:
+# результат q_i = trunc(a_i * 2^precision / b_i), т.е. a_i / b_i ≈ q_i / 2^precision.
+# Если слово не помещается в int64, вычисление идёт в целых Python (dtype=object)
+def binary_divide_batch(dividends, divisors, precision=5):
+    dividends = np.asarray(dividends)
+    divisors = np.asarray(divisors)
+    if dividends.dtype.kind not in 'iu' or divisors.dtype.kind not in 'iu':
+        raise TypeError("Ошибка: ожидаются целочисленные массивы")
+    if np.any(divisors == 0):
+        raise ValueError("Ошибка: Деление на ноль")
+    negative = (dividends < 0) != (divisors < 0)
+
+    bound = 1 << max(62 - precision, 0)
+    if precision < 62 and np.all((dividends > -bound) & (dividends < bound)):
+        dividends = np.abs(dividends.astype(np.int64))
+        divisors = _magnitude(divisors, divisors < 0)
+        quotients = ((dividends << precision).astype(np.uint64) // divisors).astype(np.int64)
+    else:
+        dividends = np.abs(dividends.astype(object))
+        divisors = np.abs(divisors.astype(object))
+        quotients = (dividends << precision) // divisors
+    return np.where(negative, -quotients, quotients)
@@ -0,0 +1,291 @@
+import argparse
+import itertools
+import json
+import math
+import platform
+import random
+import struct
+import sys
+import time
+from fractions import Fraction
+
+import numpy as np
+
+from batch import decimal_to_binary_batch, float_to_ieee_batch, binary_divide_batch
+from division import restoring_divide, non_restoring_divide, divide_fraction
+from run import (
+    decimal_to_binary, bin_to_dec, addition_bin, subtract_bin,
+    binary_multiply, binary_divide, float_to_ieee, ieee_to_float, ieee_add
+)
+from word_arithmetic import add_words, subtract_words, multiply_words
+
+CHUNK = 10_000
+DEFAULT_WIDTHS = (4, 8, 16, 32, 64)
+FLOAT_WIDTHS = (32, 64)
+
+
+# ---------- Эталоны на встроенной арифметике Python ----------
+
+def wrap(value, bits):
+    half = 1 << (bits - 1)
+    return (value + half) % (1 << bits) - half
+
+
+def ref_codes(num, bits):
+    mask = (1 << bits) - 1
+    if num >= 0:
+        return (num, num, num)
+    return (-num | (1 << (bits - 1)), ~(-num) & mask, num & mask)
+
+
+def ref_float32(value):
+    try:
+        return struct.unpack('>f', struct.pack('>f', value))[0]
+    except OverflowError:
+        return math.copysign(math.inf, value)
+
+
+def ref_float_word(value, bits):
+    fmt = ('>f', '>I') if bits == 32 else ('>d', '>Q')
+    if bits == 32:
+        value = ref_float32(value)
+    return struct.unpack(fmt[1], struct.pack(fmt[0], value))[0]
+
+
+def word_float(word, bits):
+    fmt = ('>I', '>f') if bits == 32 else ('>Q', '>d')
+    return struct.unpack(fmt[1], struct.pack(fmt[0], word))[0]
+
+
+def truncated_quotient(first_num, sec_num, precision):
+    quotient = (abs(first_num) << precision) // abs(sec_num)
+    negative = (first_num < 0) != (sec_num < 0)
+    return -quotient if negative else quotient
+
+
+def same_float(result, expected):
+    if isinstance(result, float) and math.isnan(result):
+        return isinstance(expected, float) and math.isnan(expected)
+    return struct.pack('>d', result) == struct.pack('>d', expected)
+
+
+def same_float_word(result, expected, bits):
+    result_value, expected_value = word_float(result, bits), word_float(expected, bits)
+    if math.isnan(result_value) or math.isnan(expected_value):
+        return math.isnan(result_value) and math.isnan(expected_value)
+    return result == expected
+
+
+# ---------- Генераторы входных данных ----------
+# Если область меньше count, она перебирается полностью
+
+def _sample(domain_size, count, enumerate_all, draw):
+    if domain_size <= count:
+        return iter(enumerate_all()), 'exhaustive', domain_size
+    return (draw() for _ in range(count)), 'random', count
+
+
+def sign_code_values(bits, rng, count):
+    low, high = -(1 << (bits - 1)) + 1, (1 << (bits - 1)) - 1
+    return _sample(high - low + 1, count, lambda: range(low, high + 1), lambda: rng.randint(low, high))
+
+
+def word_pairs(bits, rng, count):
+    low, high = -(1 << (bits - 1)), (1 << (bits - 1)) - 1
+    size = high - low + 1
+    return _sample(size * size, count,
+                   lambda: itertools.product(range(low, high + 1), repeat=2),
+                   lambda: (rng.randint(low, high), rng.randint(low, high)))
+
+
+def divisor_pairs(bits, rng, count):
+    pairs, mode, size = word_pairs(bits, rng, count)
+    pairs = ((a, b) for a, b in pairs if b != 0)
+    return pairs, mode, size
+
+
+def unsigned_pairs(bits, rng, count):
+    high = (1 << bits) - 1
+    size = (high + 1) * high
+    return _sample(size, count,
+                   lambda: itertools.product(range(high + 1), range(1, high + 1)),
+                   lambda: (rng.randint(0, high), rng.randint(1, high)))
+
+
+def float_words(bits, rng, count):
+    return (rng.getrandbits(bits) for _ in range(count)), 'random', count
+
+
+def float_word_pairs(bits, rng, count):
+    return ((rng.getrandbits(bits), rng.getrandbits(bits)) for _ in range(count)), 'random', count
+
+
+# ---------- Проверяемые операции ----------
+
+class Case:
+    def __init__(self, name, inputs, run, expected, check=None, widths=None, batched=False):
+        self.name = name
+        self.inputs = inputs
+        self.run = run
+        self.expected = expected
+        self.check = check or (lambda result, expected, bits: result == expected)
+        self.widths = widths
+        self.batched = batched
+
+
+def _codes_as_lists(codes, bits):
+    return tuple(list(format(code, f'0{bits}b')) for code in codes)
+
+
+def _divide_matches(result, expected, bits):
+    full_binary, decimal = result
+    sign, digits = full_binary.split(' ')
+    expected_sign, expected_quotient = expected
+    value = Fraction(-expected_quotient if expected_sign else expected_quotient, 1 << bits)
+    return ((int(sign), int(digits.replace('.', ''), 2)) == expected
+            and abs(decimal - float(value)) <= 1e-5)
+
+
+CASES = [
+    Case('decimal_to_binary', sign_code_values,
+         lambda num, bits: decimal_to_binary(num, bits),
+         lambda num, bits: _codes_as_lists(ref_codes(num, bits), bits)),
+    Case('decimal_to_binary_batch', sign_code_values,
+         lambda nums, bits: list(zip(*(code.tolist() for code in decimal_to_binary_batch(np.array(nums), bits)))),
+         ref_codes, batched=True),
+    Case('bin_to_dec', sign_code_values,
+         lambda num, bits: bin_to_dec([int(bit) for bit in format(num & ((1 << bits) - 1), f'0{bits}b')]),
+         lambda num, bits: num),
+    Case('addition_bin', word_pairs,
+         lambda pair, bits: addition_bin(pair[0], pair[1], bits),
+         lambda pair, bits: (wrap(sum(pair), bits), list(format(sum(pair) & ((1 << bits) - 1), f'0{bits}b')))),
+    Case('subtract_bin', word_pairs,
+         lambda pair, bits: subtract_bin(pair[0], pair[1], bits),
+         lambda pair, bits: (wrap(pair[0] - pair[1], bits),
+                             list(format((pair[0] - pair[1]) & ((1 << bits) - 1), f'0{bits}b')))),
+    Case('binary_multiply', word_pairs,
+         lambda pair, bits: binary_multiply(pair[0], pair[1], bits),
+         lambda pair, bits: (f"{int((pair[0] < 0) != (pair[1] < 0))} {abs(pair[0] * pair[1]):b}",
+                             ('-' if (pair[0] < 0) != (pair[1] < 0) else '') + str(abs(pair[0] * pair[1])))),
+    Case('add_words', word_pairs,
+         lambda pair, bits: add_words(pair[0], pair[1], bits),
+         lambda pair, bits: (wrap(sum(pair), bits), wrap(sum(pair), bits) != sum(pair))),
+    Case('subtract_words', word_pairs,
+         lambda pair, bits: subtract_words(pair[0], pair[1], bits),
+         lambda pair, bits: (wrap(pair[0] - pair[1], bits), wrap(pair[0] - pair[1], bits) != pair[0] - pair[1])),
+    Case('multiply_words', word_pairs,
+         lambda pair, bits: multiply_words(pair[0], pair[1], bits),
+         lambda pair, bits: (wrap(pair[0] * pair[1], bits), wrap(pair[0] * pair[1], bits) != pair[0] * pair[1])),
+    Case('restoring_divide', unsigned_pairs,
+         lambda pair, bits: restoring_divide(pair[0], pair[1], bits),
+         lambda pair, bits: divmod(*pair)),
+    Case('non_restoring_divide', unsigned_pairs,
+         lambda pair, bits: non_restoring_divide(pair[0], pair[1], bits),
+         lambda pair, bits: divmod(*pair)),
+    Case('divide_fraction', divisor_pairs,
+         lambda pair, bits: divide_fraction(pair[0], pair[1], bits),
+         lambda pair, bits: Fraction(truncated_quotient(pair[0], pair[1], bits), 1 << bits)),
+    Case('binary_divide', divisor_pairs,
+         lambda pair, bits: binary_divide(pair[0], pair[1], bits),
+         lambda pair, bits: (int((pair[0] < 0) != (pair[1] < 0)), (abs(pair[0]) << bits) // abs(pair[1])),
+         check=_divide_matches),
+    Case('binary_divide_batch', divisor_pairs,
+         lambda pairs, bits: binary_divide_batch(*(np.array(side) for side in zip(*pairs)), bits).tolist(),
+         lambda pair, bits: truncated_quotient(pair[0], pair[1], bits), batched=True),
+    Case('float_to_ieee', float_words,
+         lambda word, bits: float_to_ieee(word_float(word, bits), bits),
+         lambda word, bits: word,
+         check=lambda result, word, bits: same_float_word(int(result, 2), word, bits), widths=FLOAT_WIDTHS),
+    Case('ieee_to_float', float_words,
+         lambda word, bits: ieee_to_float(format(word, f'0{bits}b')),
+         lambda word, bits: word_float(word, bits),
+         check=lambda result, value, bits: same_float(result, value), widths=FLOAT_WIDTHS),
+    Case('float_to_ieee_batch', float_words,
+         lambda words, bits: float_to_ieee_batch([word_float(word, bits) for word in words], bits).tolist(),
+         lambda word, bits: word,
+         check=same_float_word, widths=FLOAT_WIDTHS, batched=True),
+    Case('ieee_add', float_word_pairs,
+         lambda pair, bits: ieee_add(word_float(pair[0], bits), word_float(pair[1], bits), bits)[0],
+         lambda pair, bits: word_float(ref_float_word(word_float(pair[0], bits) + word_float(pair[1], bits), bits), bits),
+         check=lambda result, value, bits: same_float(result, value), widths=FLOAT_WIDTHS),
+]
+
+
+def run_case(case, bits, rng, count):
+    inputs, mode, _ = case.inputs(bits, rng, count)
+    cases = 0
+    mismatches = 0
+    first_mismatch = None
+    seconds = 0.0
+    while True:
+        chunk = list(itertools.islice(inputs, CHUNK))
+        if not chunk:
+            break
+        start = time.perf_counter()
+        if case.batched:
+            results = case.run(chunk, bits)
+        else:
+            results = [case.run(args, bits) for args in chunk]
+        seconds += time.perf_counter() - start
+        for args, result in zip(chunk, results):
+            expected = case.expected(args, bits)
+            if not case.check(result, expected, bits):
+                mismatches += 1
+                if first_mismatch is None:
+                    first_mismatch = {'input': repr(args), 'result': repr(result), 'expected': repr(expected)}
+        cases += len(chunk)
+    return {
+        'function': case.name,
+        'width': bits,
+        'mode': mode,
+        'cases': cases,
+        'mismatches': mismatches,
+        'first_mismatch': first_mismatch,
+        'seconds': round(seconds, 6),
+        'ops_per_sec': round(cases / seconds, 1) if seconds else None,
+    }
+
+
+def run_benchmark(count=100_000, seed=0, widths=DEFAULT_WIDTHS, functions=None):
+    results = []
+    for case in CASES:
+        if functions and case.name not in functions:
+            continue
+        for bits in case.widths or widths:
+            if bits not in widths:
+                continue
+            rng = random.Random(f'{seed}:{case.name}:{bits}')
+            results.append(run_case(case, bits, rng, count))
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'count': count,
+        'seed': seed,
+        'results': results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Дифференциальное тестирование и замер скорости операций Lab_01")
+    parser.add_argument('--count', type=int, default=100_000, help="число случайных входов на функцию и разрядность")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--widths', type=int, nargs='+', default=list(DEFAULT_WIDTHS))
+    parser.add_argument('--functions', nargs='+', choices=[case.name for case in CASES])
+    parser.add_argument('--output', help="файл для JSON-отчёта (по умолчанию stdout)")
+    args = parser.parse_args(argv)
+    if any(bits < 2 for bits in args.widths):
+        parser.error("разрядность должна быть не меньше 2")
+
+    report = run_benchmark(args.count, args.seed, args.widths, args.functions)
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            file.write(text + '\n')
+    else:
+        print(text)
+    return 1 if any(result['mismatches'] for result in report['results']) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+from fractions import Fraction
+
+
+# Деление с восстановлением остатка: беззнаковые слова, bits — разрядность делимого
+def restoring_divide(dividend, divisor, bits):
+    remainder = 0
+    quotient = 0
+    for bit in format(dividend, f'0{bits}b'):
+        remainder = (remainder << 1) + (bit == '1') - divisor
+        if remainder < 0:
+            remainder += divisor
+            quotient <<= 1
+        else:
+            quotient = (quotient << 1) | 1
+    return quotient, remainder
+
+
+# Деление без восстановления остатка: знак остатка выбирает вычитание или сложение
+def non_restoring_divide(dividend, divisor, bits):
+    remainder = 0
+    quotient = 0
+    for bit in format(dividend, f'0{bits}b'):
+        if remainder >= 0:
+            remainder = (remainder << 1) + (bit == '1') - divisor
+        else:
+            remainder = (remainder << 1) + (bit == '1') + divisor
+        quotient = (quotient << 1) | (remainder >= 0)
+    if remainder < 0:
+        remainder += divisor
+    return quotient, remainder
+
+
+METHODS = {
+    'restoring': restoring_divide,
+    'non_restoring': non_restoring_divide,
+}
+
+
+# Знак и модуль частного с precision двоичными знаками после точки:
+# |first_num / sec_num| = quotient / 2^precision (с отбрасыванием остатка)
+def fixed_point_divide(first_num, sec_num, precision=5, method='restoring'):
+    if sec_num == 0:
+        raise ValueError("Ошибка: Деление на ноль")
+    if method not in METHODS:
+        raise ValueError(f"Ошибка: неизвестный метод деления '{method}'")
+    sign = 0 if (first_num >= 0 and sec_num > 0) or (first_num < 0 and sec_num < 0) else 1
+    dividend = abs(first_num) << precision
+    quotient, _ = METHODS[method](dividend, abs(sec_num), max(dividend.bit_length(), 1))
+    return sign, quotient
+
+
+def divide_fraction(first_num, sec_num, precision=5, method='restoring'):
+    sign, quotient = fixed_point_divide(first_num, sec_num, precision, method)
+    value = Fraction(quotient, 1 << precision)
+    return -value if sign else value
+
+
+def divide_many(dividends, divisors, precision=5, method='restoring'):
+    return [divide_fraction(int(a), int(b), precision, method) for a, b in zip(dividends, divisors)]
@@ -0,0 +1,116 @@
+import math
+import struct
+
+# разрядность: (бит порядка, бит мантиссы, формат float, формат слова)
+FORMATS = {
+    32: (8, 23, '>f', '>I'),
+    64: (11, 52, '>d', '>Q'),
+}
+
+
+def _format(bits):
+    if bits not in FORMATS:
+        raise ValueError("Ошибка: поддерживаются только форматы binary32 и binary64")
+    return FORMATS[bits]
+
+
+def _quiet_nan(bits):
+    exp_bits, frac_bits, _, _ = _format(bits)
+    return (((1 << exp_bits) - 1) << frac_bits) | (1 << (frac_bits - 1))
+
+
+# Число -> слово IEEE-754 (округление к ближайшему чётному)
+def float_to_word(num, bits=32):
+    _, _, float_fmt, word_fmt = _format(bits)
+    try:
+        packed = struct.pack(float_fmt, num)
+    except OverflowError:
+        # конечное число за пределами binary32 округляется до бесконечности
+        packed = struct.pack(float_fmt, math.copysign(math.inf, num))
+    return struct.unpack(word_fmt, packed)[0]
+
+
+def word_to_float(word, bits=32):
+    _, _, float_fmt, word_fmt = _format(bits)
+    return struct.unpack(float_fmt, struct.pack(word_fmt, word))[0]
+
+
+def encode(num, bits=32):
+    return format(float_to_word(num, bits), f'0{bits}b')
+
+
+def decode(binary, bits=32):
+    if len(binary) != bits:
+        raise ValueError(f"Ошибка: ожидается строка из {bits} бит")
+    return word_to_float(int(binary, 2), bits)
+
+
+# Знак, смещённый порядок и дробная часть мантиссы
+def split_word(word, bits=32):
+    exp_bits, frac_bits, _, _ = _format(bits)
+    sign = word >> (bits - 1)
+    exponent = (word >> frac_bits) & ((1 << exp_bits) - 1)
+    fraction = word & ((1 << frac_bits) - 1)
+    return sign, exponent, fraction
+
+
+# Сложение двух слов IEEE-754 на уровне битов с округлением к ближайшему чётному
+def add_words(a_word, b_word, bits=32):
+    exp_bits, frac_bits, _, _ = _format(bits)
+    exp_max = (1 << exp_bits) - 1
+    bias = exp_max >> 1
+    a_sign, a_exp, a_frac = split_word(a_word, bits)
+    b_sign, b_exp, b_frac = split_word(b_word, bits)
+
+    if a_exp == exp_max or b_exp == exp_max:
+        a_nan = a_exp == exp_max and a_frac
+        b_nan = b_exp == exp_max and b_frac
+        if a_nan or b_nan:
+            return _quiet_nan(bits)
+        if a_exp == exp_max and b_exp == exp_max and a_sign != b_sign:
+            return _quiet_nan(bits)
+        return a_word if a_exp == exp_max else b_word
+
+    # значащая часть и порядок (у денормализованных порядок равен 1)
+    a_sig = a_frac | (1 << frac_bits) if a_exp else a_frac
+    b_sig = b_frac | (1 << frac_bits) if b_exp else b_frac
+    a_exp = a_exp or 1
+    b_exp = b_exp or 1
+
+    # точная сумма: total * 2^(low_exp - bias - frac_bits)
+    low_exp = min(a_exp, b_exp)
+    a_val = a_sig << (a_exp - low_exp)
+    b_val = b_sig << (b_exp - low_exp)
+    total = (-a_val if a_sign else a_val) + (-b_val if b_sign else b_val)
+    if total == 0:
+        return (a_sign & b_sign) << (bits - 1)
+
+    sign = 1 if total < 0 else 0
+    magnitude = abs(total)
+    unit = low_exp - bias - frac_bits
+    min_unit = 1 - bias - frac_bits
+    target = max(unit + magnitude.bit_length() - 1 - frac_bits, min_unit)
+    shift = target - unit
+    if shift > 0:
+        sig = magnitude >> shift
+        rest = magnitude & ((1 << shift) - 1)
+        half = 1 << (shift - 1)
+        if rest > half or (rest == half and sig & 1):
+            sig += 1
+    else:
+        sig = magnitude << -shift
+    if sig >> (frac_bits + 1):
+        sig >>= 1
+        target += 1
+
+    if sig >> frac_bits:
+        exponent = target + bias + frac_bits
+        if exponent >= exp_max:
+            return (sign << (bits - 1)) | (exp_max << frac_bits)
+        return (sign << (bits - 1)) | (exponent << frac_bits) | (sig & ((1 << frac_bits) - 1))
+    return (sign << (bits - 1)) | sig
+
+
+def add(a_float, b_float, bits=32):
+    word = add_words(float_to_word(a_float, bits), float_to_word(b_float, bits), bits)
+    return word_to_float(word, bits), format(word, f'0{bits}b')
@@ -1,3 +1,9 @@
+from fractions import Fraction
+
+import ieee754
+from division import fixed_point_divide
+from word_arithmetic import add_words, subtract_words, multiply_words, word_mask
+
 def decimal_to_binary(num, bits=8):
     if num >= 0:
         binary = bin(num)[2:].zfill(bits)  # Прямой код для положительного числа
@@ -37,138 +43,54 @@ def bin_to_dec(bin_num):
     rev = [1] + [1 - a for a in rev[1:]]
     return -int(''.join(map(str, rev[1:])), 2)
 
-def addition_bin(first_num: int, sec_num: int):
-    sec_num = [int(item) for item in decimal_to_binary(sec_num)[2]]
-    first_num = [int(item) for item in decimal_to_binary(first_num)[2]]
-    res = [0]*len(first_num)
-    carry = 0
-    for i in range(len(first_num) - 1, -1, -1):
-        total = first_num[i] + sec_num[i] + carry
-        res[i] = total % 2
-        carry = total // 2
-
-    res = bin_to_dec(res)
-    res_bin = decimal_to_binary(res)[2]
+def addition_bin(first_num: int, sec_num: int, bits=8):
+    res, _ = add_words(first_num, sec_num, bits)
+    res_bin = decimal_to_binary(res, bits)[2]
     return res, res_bin
 
-def subtract_bin(first_num: int, sec_num: int):
-    sec_num = -sec_num
-    res, res_bin = addition_bin(first_num, sec_num)
+def subtract_bin(first_num: int, sec_num: int, bits=8):
+    res, _ = subtract_words(first_num, sec_num, bits)
+    res_bin = decimal_to_binary(res, bits)[2]
     return res, res_bin
 
 def binary_multiply(first_num, sec_num, bits=8):
     sign_a = 0 if first_num >= 0 else 1
     sign_b = 0 if sec_num >= 0 else 1
     sign_res = sign_a ^ sign_b
-    a_abs = abs(first_num)
-    b_abs = abs(sec_num)
+    b_abs = abs(sec_num) & word_mask(bits)
 
-    result = 0
-    for i in range(bits):
-        if (b_abs >> i) & 1:
-            result += a_abs << i
-
-    bin_res =''.join(decimal_to_binary(result)[0])
-    binary_number = bin_res.lstrip('0') or '0'
-    res_bin = str(sign_res)+ ' ' + binary_number
+    # произведение двух bits-разрядных слов помещается в 2·bits разрядов
+    product, _ = multiply_words(first_num, -b_abs if sign_b else b_abs, 2 * bits)
+    result = abs(product)
+    res_bin = str(sign_res) + ' ' + format(result, 'b')
     result = "-" + str(result) if sign_res == 1 else str(result)
     return res_bin, result
 
-def binary_divide(first_num, sec_num, precision=5):
-    if sec_num == 0:
-        raise ValueError("Ошибка: Деление на ноль")
-
-    sign = 0 if (first_num >= 0 and sec_num > 0) or (first_num < 0 and sec_num < 0) else 1
-    a_abs = abs(first_num)
-    b_abs = abs(sec_num)
-    int_part = a_abs // b_abs
-    remainder = a_abs % b_abs
-
-    frac_binary = ""
-    frac_decimal = 0
-    for i in range(1, precision + 1):
-        remainder *= 2
-        bit = remainder // b_abs
-        frac_binary += str(bit)
-        frac_decimal += bit * (1 / (2 ** i))
-        remainder %= b_abs
-
-    int_bin = ''.join(decimal_to_binary(int_part)[0])
+def binary_divide(first_num, sec_num, precision=5, method='restoring'):
+    sign, quotient = fixed_point_divide(first_num, sec_num, precision, method)
+    int_part = quotient >> precision
+    frac_binary = format(quotient & ((1 << precision) - 1), f'0{precision}b') if precision else ''
+
+    int_bin = format(int_part, 'b').zfill(8)
     int_bin = int_bin.rjust(precision, '0')
     full_binary = f"{sign} {int_bin}.{frac_binary}"
 
-    result_decimal = int_part + frac_decimal
+    result_decimal = Fraction(quotient, 1 << precision)
     if sign == 1:
         result_decimal *= -1
-    result_decimal = round(result_decimal, 5)
+    result_decimal = round(float(result_decimal), 5)
 
     return full_binary, result_decimal
 
-def float_to_ieee(num):
-    sign = 0 if num >= 0 else 1
-    num = abs(num)
-    int_part = int(num)
-    frac_part = num - int_part
-
-    int_bin = ""
-    while int_part > 0:
-        int_bin = str(int_part % 2) + int_bin
-        int_part //= 2
-    int_bin = int_bin or "0"
-
-    frac_bin = ""
-    frac = frac_part
-    while len(frac_bin) < 30:
-        frac *= 2
-        bit = int(frac)
-        frac_bin += str(bit)
-        frac -= bit
-
-    if int_bin != "0":
-        exponent = len(int_bin) - 1
-        mantissa = int_bin[1:] + frac_bin
-    else:
-        first_one = frac_bin.find('1')
-        exponent = - (first_one + 1)
-        mantissa = frac_bin[first_one + 1:]
-
-    exponent_bits = bin(exponent + 127)[2:].rjust(8, '0')
-    mantissa_bits = (mantissa + "0"*23)[:23]
-
-    ieee_bin = f"{sign}{exponent_bits}{mantissa_bits}"
-    return ieee_bin
+def float_to_ieee(num, bits=32):
+    return ieee754.encode(num, bits)
 
 def ieee_to_float(binary):
-    sign = int(binary[0])
-    exponent = int(binary[1:9], 2) - 127
-    mantissa = binary[9:]
-
-    full = "1" + mantissa
-    if exponent >= 0:
-        int_part = full[:exponent + 1]
-        frac_part = full[exponent + 1:]
-    else:
-        int_part = "0"
-        frac_part = "0" * (-exponent - 1) + full
-
-    int_val = int(int_part, 2) if int_part else 0
-    frac_val = sum([int(a) * (2 ** -(i + 1)) for i, a in enumerate(frac_part)])
-
-    result = int_val + frac_val
-    return -result if sign else result
-
-
-def ieee_add(a_float, b_float):
-    a_bin = float_to_ieee(a_float)
-    b_bin = float_to_ieee(b_float)
-
-    a_val = ieee_to_float(a_bin)
-    b_val = ieee_to_float(b_bin)
+    return ieee754.decode(binary, len(binary))
 
-    result = a_val + b_val
-    result_bin = float_to_ieee(result)
 
-    return result, result_bin
+def ieee_add(a_float, b_float, bits=32):
+    return ieee754.add(a_float, b_float, bits)
 
 def main():
     while True:
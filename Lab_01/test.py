@@ -1,4 +1,18 @@
 import unittest
+import json
+import math
+from fractions import Fraction
+import random
+import struct
+import numpy as np
+import ieee754
+from benchmark import run_benchmark
+from batch import (
+    decimal_to_binary_batch, unpack_bits, pack_bits, float_to_ieee_batch, ieee_to_float_batch,
+    binary_divide_batch
+)
+from division import restoring_divide, non_restoring_divide, divide_fraction, divide_many
+from word_arithmetic import add_words, subtract_words, multiply_words, to_signed, to_unsigned
 from run import (
     decimal_to_binary, bin_to_dec, addition_bin, subtract_bin,
     binary_multiply, binary_divide, float_to_ieee, ieee_to_float, ieee_add
@@ -97,5 +111,189 @@ class TestBinaryMath(unittest.TestCase):
         self.assertAlmostEqual(result, 3.75, places=5)
         self.assertEqual(float_to_ieee(result), ieee_result)
 
+class TestBatchCodes(unittest.TestCase):
+
+    def test_batch_matches_scalar(self):
+        nums = np.arange(-255, 256)
+        direct, reverse, complement = decimal_to_binary_batch(nums, bits=8, as_bits=True)
+        for i, num in enumerate(nums):
+            expected = decimal_to_binary(int(num), bits=8)
+            actual = tuple([str(bit) for bit in code[i]] for code in (direct, reverse, complement))
+            self.assertEqual(actual, expected)
+
+    def test_batch_words(self):
+        direct, reverse, complement = decimal_to_binary_batch(np.array([-5, 5]), bits=8)
+        self.assertEqual(direct.tolist(), [0b10000101, 0b00000101])
+        self.assertEqual(reverse.tolist(), [0b11111010, 0b00000101])
+        self.assertEqual(complement.tolist(), [0b11111011, 0b00000101])
+
+    def test_batch_64_bits_min_int(self):
+        nums = np.array([np.iinfo(np.int64).min, -1])
+        _, _, complement = decimal_to_binary_batch(nums, bits=64)
+        self.assertEqual(complement.tolist(), [1 << 63, (1 << 64) - 1])
+
+    def test_batch_out_of_range(self):
+        with self.assertRaises(ValueError):
+            decimal_to_binary_batch(np.array([256]), bits=8)
+        with self.assertRaises(ValueError):
+            decimal_to_binary_batch(np.array([1]), bits=65)
+
+    def test_batch_rejects_floats(self):
+        with self.assertRaises(TypeError):
+            decimal_to_binary_batch(np.array([1.5]))
+
+    def test_unpack_bits(self):
+        self.assertEqual(unpack_bits(np.array([5]), bits=4).tolist(), [[0, 1, 0, 1]])
+
+    def test_pack_bits_matches_packbits(self):
+        words = np.array([0, 1, 0x2A5, (1 << 12) - 1], dtype=np.uint64)
+        for bits in (1, 8, 12, 13, 64):
+            masked = words & np.uint64((1 << bits) - 1)
+            expected = np.packbits(unpack_bits(masked, bits), axis=-1)
+            self.assertEqual(pack_bits(masked, bits).tolist(), expected.tolist())
+
+    def test_batch_packed(self):
+        direct, _, complement = decimal_to_binary_batch(np.array([-5, 300]), bits=12, packed=True)
+        self.assertEqual(direct.tolist(), [[0x80, 0x50], [0x12, 0xC0]])
+        self.assertEqual(complement.tolist(), [[0xFF, 0xB0], [0x12, 0xC0]])
+
+class TestWordArithmetic(unittest.TestCase):
+
+    def test_add_wraps_with_overflow(self):
+        self.assertEqual(add_words(100, 100, bits=8), (-56, True))
+        self.assertEqual(add_words(-64, -64, bits=8), (-128, False))
+        self.assertEqual(add_words(5, -3, bits=8), (2, False))
+
+    def test_subtract(self):
+        self.assertEqual(subtract_words(-128, 1, bits=8), (127, True))
+        self.assertEqual(subtract_words(0, -128, bits=8), (-128, True))
+
+    def test_multiply_wide(self):
+        a, b = (1 << 3000) + 7, (1 << 2999) - 3
+        product, overflow = multiply_words(a, b, bits=6002)
+        self.assertEqual(product, a * b)
+        self.assertFalse(overflow)
+        self.assertEqual(multiply_words(16, 8, bits=8), (-128, True))
+
+    def test_signed_unsigned(self):
+        self.assertEqual(to_unsigned(-1, bits=16), 0xFFFF)
+        self.assertEqual(to_signed(0x8000, bits=16), -32768)
+        with self.assertRaises(ValueError):
+            to_signed(1, bits=0)
+
+    def test_wrappers_match_engine(self):
+        for a in range(-128, 128, 7):
+            for b in range(-128, 128, 5):
+                res, res_bin = addition_bin(a, b)
+                self.assertEqual(res, add_words(a, b)[0])
+                self.assertEqual(res_bin, decimal_to_binary(res)[2])
+                self.assertEqual(subtract_bin(a, b)[0], subtract_words(a, b)[0])
+
+    def test_addition_bin_wider(self):
+        result, bin_result = addition_bin(30000, 2767, bits=16)
+        self.assertEqual(result, 32767)
+        self.assertEqual(bin_result, list('0111111111111111'))
+
+class TestIEEE754(unittest.TestCase):
+
+    def test_special_values(self):
+        self.assertEqual(float_to_ieee(0.0), '0' * 32)
+        self.assertEqual(float_to_ieee(-0.0), '1' + '0' * 31)
+        self.assertEqual(float_to_ieee(math.inf), '0' + '1' * 8 + '0' * 23)
+        self.assertEqual(float_to_ieee(1e300), '0' + '1' * 8 + '0' * 23)
+        self.assertTrue(math.isnan(ieee_to_float(float_to_ieee(math.nan))))
+
+    def test_subnormal_round_trip(self):
+        smallest = ieee_to_float('0' * 31 + '1')
+        self.assertEqual(smallest, 2.0 ** -149)
+        self.assertEqual(float_to_ieee(smallest), '0' * 31 + '1')
+
+    def test_binary64_round_trip(self):
+        for value in (0.1, -2.5e-310, 1.7976931348623157e308):
+            self.assertEqual(ieee754.decode(ieee754.encode(value, 64), 64), value)
+
+    def test_add_matches_hardware(self):
+        rng = random.Random(7)
+        for bits, word_fmt, float_fmt in ((32, '<I', '<f'), (64, '<Q', '<d')):
+            words = [rng.getrandbits(bits) for _ in range(2000)]
+            for a_word, b_word in zip(words[::2], words[1::2]):
+                a, b = ieee754.word_to_float(a_word, bits), ieee754.word_to_float(b_word, bits)
+                if bits == 32:
+                    expected = np.float32(a) + np.float32(b)
+                else:
+                    expected = a + b
+                result = ieee754.word_to_float(ieee754.add_words(a_word, b_word, bits), bits)
+                if math.isnan(expected):
+                    self.assertTrue(math.isnan(result))
+                else:
+                    self.assertEqual(struct.pack(float_fmt, result), struct.pack(float_fmt, expected))
+
+    def test_add_special_values(self):
+        self.assertTrue(math.isnan(ieee_add(math.inf, -math.inf)[0]))
+        self.assertEqual(ieee_add(math.inf, 1.0)[0], math.inf)
+        self.assertEqual(float_to_ieee(ieee_add(-0.0, -0.0)[0]), '1' + '0' * 31)
+        self.assertEqual(ieee_add(3.4e38, 3.4e38)[0], math.inf)
+
+    def test_batch_codec(self):
+        values = np.array([1.5, -0.0, np.inf, 2.0 ** -149], dtype=np.float32)
+        words = float_to_ieee_batch(values)
+        self.assertEqual(words.dtype, np.uint32)
+        self.assertEqual([format(w, '032b') for w in words.tolist()],
+                         [float_to_ieee(float(v)) for v in values])
+        self.assertTrue(np.array_equal(ieee_to_float_batch(words), values))
+        bit_rows = float_to_ieee_batch([0.1], bits=64, as_bits=True)
+        self.assertEqual(''.join(map(str, bit_rows[0])), ieee754.encode(0.1, 64))
+
+class TestDivision(unittest.TestCase):
+
+    def test_kernels_match_divmod(self):
+        for kernel in (restoring_divide, non_restoring_divide):
+            for dividend in range(0, 64):
+                for divisor in range(1, 20):
+                    self.assertEqual(kernel(dividend, divisor, 6), divmod(dividend, divisor))
+
+    def test_long_precision_is_exact(self):
+        precision = 4000
+        expected = Fraction(-((1 << precision) // 3), 1 << precision)
+        self.assertEqual(divide_fraction(-1, 3, precision), expected)
+        self.assertEqual(divide_fraction(-1, 3, precision, method='non_restoring'), expected)
+        self.assertLess(abs(expected + Fraction(1, 3)), Fraction(1, 1 << (precision - 1)))
+
+    def test_divide_fraction_errors(self):
+        with self.assertRaises(ValueError):
+            divide_fraction(1, 0)
+        with self.assertRaises(ValueError):
+            divide_fraction(1, 2, method='srt')
+
+    def test_binary_divide_methods_agree(self):
+        for a in range(-20, 21):
+            for b in (-7, -2, 3, 5):
+                self.assertEqual(binary_divide(a, b, 8), binary_divide(a, b, 8, method='non_restoring'))
+        self.assertEqual(binary_divide(5, 2), ('0 00000010.10000', 2.5))
+
+    def test_divide_batch(self):
+        dividends = np.array([7, -7, 1, 100])
+        divisors = np.array([2, 2, 3, -7])
+        expected = divide_many(dividends, divisors, precision=6)
+        quotients = binary_divide_batch(dividends, divisors, precision=6)
+        self.assertEqual(quotients.dtype, np.int64)
+        self.assertEqual([Fraction(int(q), 1 << 6) for q in quotients], expected)
+        wide = binary_divide_batch(dividends, divisors, precision=200)
+        self.assertEqual([Fraction(int(q), 1 << 200) for q in wide],
+                         divide_many(dividends, divisors, precision=200))
+        with self.assertRaises(ValueError):
+            binary_divide_batch(dividends, np.array([1, 0, 1, 1]))
+
+class TestBenchmark(unittest.TestCase):
+
+    def test_differential_run_has_no_mismatches(self):
+        report = run_benchmark(count=300, seed=1, widths=(4, 8, 32))
+        self.assertTrue(report['results'])
+        for result in report['results']:
+            self.assertEqual(result['mismatches'], 0, result['first_mismatch'])
+            self.assertGreater(result['cases'], 0)
+        self.assertIn('exhaustive', {result['mode'] for result in report['results']})
+        json.loads(json.dumps(report))
+
 if __name__ == '__main__':
     unittest.main()
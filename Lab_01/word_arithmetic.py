@@ -0,0 +1,44 @@
+def _check_bits(bits):
+    if bits < 1:
+        raise ValueError("Ошибка: разрядность должна быть положительной")
+
+
+def word_mask(bits):
+    _check_bits(bits)
+    return (1 << bits) - 1
+
+
+# Значение по модулю 2^bits (беззнаковое слово)
+def to_unsigned(value, bits=8):
+    return value & word_mask(bits)
+
+
+# Интерпретация слова как числа в дополнительном коде
+def to_signed(word, bits=8):
+    word &= word_mask(bits)
+    return word - (1 << bits) if word >> (bits - 1) else word
+
+
+# Помещается ли число в bits-битное знаковое слово
+def fits(value, bits=8):
+    _check_bits(bits)
+    return -(1 << (bits - 1)) <= value < (1 << (bits - 1))
+
+
+# Сложение с переносом по модулю 2^bits; флаг — знаковое переполнение
+def add_words(first_num, sec_num, bits=8):
+    total = first_num + sec_num
+    result = to_signed(total, bits)
+    return result, not fits(total, bits)
+
+
+def subtract_words(first_num, sec_num, bits=8):
+    return add_words(first_num, -sec_num, bits)
+
+
+# Умножение целых слов. Для больших разрядностей CPython сам переходит
+# на алгоритм Карацубы (операнды длиннее ~70 цифр по 30 бит)
+def multiply_words(first_num, sec_num, bits=8):
+    product = first_num * sec_num
+    result = to_signed(product, bits)
+    return result, not fits(product, bits)
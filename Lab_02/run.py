@@ -1,165 +1,169 @@
-import re
-import operator
+import itertools
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from logic import expression as logic_expression
+
+
+# Вычисление одного блока строк в процессе-исполнителе
+def _evaluate_shard(expr, start, size):
+    tt = TruthTable(expr)
+    return tt.evaluate_block(tt.compile_expression(), start, size)
+
 
 class TruthTable:
+    CHUNK_SIZE = 1 << 16
+
     def __init__(self, expr):
         self.expression = expr.replace('∨', '|').replace('∧', '&').replace(' ', '')
-        self.used_vars = sorted(set(re.findall(r'[a-zA-Z_]\w*', expr)))
-        self.operators = {
-            'and': operator.and_,
-            'or': operator.or_,
-            'not': operator.not_,
-        }
-
-    # Функция для преобразования строки в логическое выражение
-    @staticmethod
-    def parse_expression(expr):
-        expr = re.sub(r'\s*->\s*', ' or not ', expr)
-        expr = expr.replace('~', 'not ')
-        expr = expr.replace('&', ' and ')
-        expr = expr.replace('|', ' or ')
-        expr = expr.replace('!', 'not ')
-        return expr.strip()
+        # граф выражения: ! — отрицание, & — и, ^ — исключающее или, | — или,
+        # -> — импликация (правоассоциативна), ~ — эквивалентность
+        self.graph = logic_expression.parse(expr)
+        self.used_vars = self.graph.variables()
+
+    # Разобранное выражение с расставленными по приоритетам скобками
+    def formula(self):
+        return self.graph.format()
 
     # Функция для генерации всех возможных комбинаций значений переменных
     @staticmethod
     def generate_combinations(num_vars):
-        combinations = []
-        for i in range(2 ** num_vars):
-            binary = bin(i)[2:].zfill(num_vars)
-            combinations.append([int(bit) for bit in binary])
-        return combinations
-
-    # Алгоритм сортировочной станции для преобразования в постфиксную запись
-    def shunting_yard(self, tokens):
-        precedence = {'not': 3, 'and': 2, 'or': 1}
-        output = []
-        operators = []
-        for token_type, token_value in tokens:
-            if token_type == 'NUMBER':
-                output.append(token_value)
-            elif token_type == 'VARIABLE':
-                output.append(token_value)
-            elif token_type == 'OPERATOR':
-                if token_value == '(':
-                    operators.append(token_value)
-                elif token_value == ')':
-                    while operators and operators[-1] != '(':
-                        output.append(operators.pop())
-                    operators.pop()
-                else:
-                    while (operators and operators[-1] != '(' and
-                           precedence[operators[-1]] >= precedence[token_value]):
-                        output.append(operators.pop())
-                    operators.append(token_value)
-        while operators:
-            output.append(operators.pop())
-        return output
-
-    # Функция для токенизации
-    def tokenize(self, expr):
-        token_pattern = re.compile(r'\s*(=>|or|and|not|\(|\)|\w+|\d+)\s*')
-        tokens = []
-        for match in token_pattern.finditer(expr):
-            token = match.group(1)
-            if token.isdigit():
-                tokens.append(('NUMBER', int(token)))
-            elif token in self.operators or token in ('(', ')'):
-                tokens.append(('OPERATOR', token))
-            else:
-                tokens.append(('VARIABLE', token))
-        return tokens
-
-    # Вычисление постфиксного выражения
-    def evaluate_postfix(self, postfix, env):
-        stack = []
-        for token in postfix:
-            if isinstance(token, int):
-                stack.append(token)
-            elif token in self.used_vars:
-                stack.append(env[token])
-            elif token in self.operators:
-                if token == 'not':
-                    operand = stack.pop()
-                    stack.append(self.operators[token](operand))
-                else:
-                    right = stack.pop()
-                    left = stack.pop()
-                    stack.append(self.operators[token](left, right))
-        return int(stack.pop())
-
-    # Функция для вычисления логического выражения
-    def eval_expr(self, expr, env):
-        tokens = self.tokenize(expr)
-        postfix = self.shunting_yard(tokens)
-        return self.evaluate_postfix(postfix, env)
+        return list(TruthTable.iter_combinations(num_vars))
+
+    # Ленивый перебор комбинаций без хранения всех 2^n наборов
+    @staticmethod
+    def iter_combinations(num_vars):
+        return (list(values) for values in itertools.product((0, 1), repeat=num_vars))
+
+    # Компиляция выражения: разбор выполняется один раз, результат — массив
+    # инструкций (операция, операнд, операнд) над ячейками; первые ячейки — переменные,
+    # общие подвыражения графа вычисляются один раз
+    def compile_expression(self):
+        return self.graph.compile(self.used_vars)
+
+    # Вычисление скомпилированного выражения на одном наборе значений
+    @staticmethod
+    def evaluate_compiled(program, values):
+        return logic_expression.evaluate(program, values)
+
+    # Битовый столбец переменной: значение в строке r хранится в бите 2^n - 1 - r,
+    # так что строка 0 — старший бит, как в индексной форме.
+    # start и size выделяют блок строк (size — степень двойки, start кратен size)
+    @staticmethod
+    def variable_column(index, num_vars, start=0, size=None):
+        return logic_expression.variable_column(index, num_vars, start, size)
+
+    # Побитовое вычисление: каждая операция обрабатывает сразу весь столбец
+    @staticmethod
+    def evaluate_columns(program, columns, full):
+        return logic_expression.evaluate_columns(program, columns, full)
+
+    # Побитовое вычисление блока строк [start, start + size)
+    def evaluate_block(self, program, start, size):
+        return logic_expression.evaluate_block(program, len(self.used_vars), start, size)
+
+    # Столбец результата для всех 2^n строк в виде одного целого числа.
+    # При workers > 1 пространство строк делится на непрерывные блоки,
+    # которые считаются параллельно в ProcessPoolExecutor и склеиваются по порядку
+    def build_column(self, workers=1):
+        total = 1 << len(self.used_vars)
+        shards = 1 << (4 * workers - 1).bit_length()
+        shard_size = max(total // shards, self.CHUNK_SIZE)
+        if workers <= 1 or shard_size >= total:
+            return self.evaluate_block(self.compile_expression(), 0, total)
+
+        starts = range(0, total, shard_size)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            columns = executor.map(_evaluate_shard, itertools.repeat(self.expression), starts,
+                                   itertools.repeat(shard_size))
+            data = b''.join(column.to_bytes(shard_size // 8, 'big') for column in columns)
+        return int.from_bytes(data, 'big')
+
+    # Поток блоков таблицы: (первая строка, число строк, битовый столбец блока).
+    # Память — O(chunk_size) независимо от числа переменных
+    def iter_chunks(self, chunk_size=None):
+        program = self.compile_expression()
+        total = 1 << len(self.used_vars)
+        size = min(1 << ((chunk_size or self.CHUNK_SIZE).bit_length() - 1), total)
+        for start in range(0, total, size):
+            yield start, size, self.evaluate_block(program, start, size)
+
+    # Ленивый перебор строк таблицы: значения переменных + результат
+    def iter_rows(self, chunk_size=None):
+        num_vars = len(self.used_vars)
+        for start, size, column in self.iter_chunks(chunk_size):
+            for offset, bit in enumerate(format(column, f'0{size}b')):
+                row = start + offset
+                yield [(row >> (num_vars - 1 - i)) & 1 for i in range(num_vars)] + [int(bit)]
 
     # Функция для создания таблицы истинности
     def build_truth_table(self):
-        parsed_expr = self.parse_expression(self.expression)
+        return list(self.iter_rows())
+
+    # Значения результата по строкам: из списка строк, битового столбца
+    # или (при table=None) из потока блоков
+    def result_bits(self, table=None):
+        if table is None:
+            return ''.join(format(column, f'0{size}b') for _, size, column in self.iter_chunks())
+        if isinstance(table, int):
+            return format(table, f'0{1 << len(self.used_vars)}b')
+        return ''.join(str(row[-1]) for row in table)
+
+    # Номера строк, в которых результат равен value; без таблицы — по потоку блоков
+    def iter_indices(self, table, value):
+        target = str(value)
+        if table is None:
+            for start, size, column in self.iter_chunks():
+                for offset, bit in enumerate(format(column, f'0{size}b')):
+                    if bit == target:
+                        yield start + offset
+        else:
+            for i, bit in enumerate(self.result_bits(table)):
+                if bit == target:
+                    yield i
+
+    # Литералы конъюнкции (или дизъюнкции при negate=True) для строки с номером index
+    def row_literals(self, index, negate=False):
         num_vars = len(self.used_vars)
-        truth_table_list = []
-        combinations = self.generate_combinations(num_vars)
-        for values in combinations:
-            substitution = {}
-            for var, val in zip(self.used_vars, values):
-                substitution[var] = bool(val)
-            result = self.eval_expr(parsed_expr, substitution)
-            truth_table_list.append(values + [result])
-        return truth_table_list
-
-    # Функция для печати таблицы истинности
-    def print_truth_table(self, truth_table_list):
+        literals = []
+        for i, var in enumerate(self.used_vars):
+            value = (index >> (num_vars - 1 - i)) & 1
+            literals.append(var if value != negate else f"¬{var}")
+        return literals
+
+    # Функция для печати таблицы истинности (без аргумента — потоком)
+    def print_truth_table(self, truth_table_list=None):
+        if truth_table_list is None:
+            truth_table_list = self.iter_rows()
         header = self.used_vars + ['result']
         print(' | '.join(header))
         print('-' * (len(header) * 3 - 1))
         for row in truth_table_list:
             print(' | '.join(map(str, row)))
 
-    # Функция для получения СДНФ
-    def get_dnf(self, truth_table_list):
-        dnf_terms = []
-        for row in truth_table_list:
-            values = row[:-1]
-            result = row[-1]
-            term_dnf = []
-            for i, var in enumerate(self.used_vars):
-                if values[i] == 1:
-                    term_dnf.append(var)
-                else:
-                    term_dnf.append(f"¬{var}")
-            if result == 1:
-                dnf_terms.append("(" + " ∧ ".join(term_dnf) + ")")
-
+    # Функция для получения СДНФ (по списку строк, битовому столбцу или потоку)
+    def get_dnf(self, truth_table_list=None):
+        dnf_num_list = list(self.iter_indices(truth_table_list, 1))
+        dnf_terms = ["(" + " ∧ ".join(self.row_literals(i)) + ")" for i in dnf_num_list]
         dnf = " ∨ ".join(dnf_terms)
-        dnf_num_list = [i for i, row in enumerate(truth_table_list) if row[-1] == 1]
         dnf_num = ",".join(map(str, dnf_num_list))
         return dnf, dnf_num
 
-    # Функция для получения СКНФ
-    def get_cnf(self, truth_table_list):
-        cnf_terms = []
-        for row in truth_table_list:
-            values = row[:-1]
-            result = row[-1]
-            term_cnf = []
-            for i, var in enumerate(self.used_vars):
-                if values[i] == 1:
-                    term_cnf.append(f"¬{var}")
-                else:
-                    term_cnf.append(var)
-            if result == 0:
-                cnf_terms.append("(" + " ∨ ".join(term_cnf) + ")")
-
+    # Функция для получения СКНФ (по списку строк, битовому столбцу или потоку)
+    def get_cnf(self, truth_table_list=None):
+        cnf_num_list = list(self.iter_indices(truth_table_list, 0))
+        cnf_terms = ["(" + " ∨ ".join(self.row_literals(i, negate=True)) + ")" for i in cnf_num_list]
         cnf = " ∧ ".join(cnf_terms)
-        cnf_num_list = [i for i, row in enumerate(truth_table_list) if row[-1] == 0]
-        cnf_num =",".join(map(str, cnf_num_list))
+        cnf_num = ",".join(map(str, cnf_num_list))
         return cnf, cnf_num
 
     # Функция для получения индексной формы
-    def index_form(self, table):
-        bin_form = [i[-1] for i in table]
-        bin_str = ''.join(map(str, bin_form))
+    def index_form(self, table=None):
+        if isinstance(table, int):
+            return self.result_bits(table), table
+        bin_str = self.result_bits(table)
         num_form = int(bin_str, 2)
         return bin_str, num_form
 
@@ -167,14 +171,16 @@ if __name__ == "__main__":
     expression = 'a & b'
     tt = TruthTable(expression)
     # Создание и печать таблицы истинности
-    print(tt.parse_expression(expression))
-    tt_list = tt.build_truth_table()
+    print(tt.formula())
     print('\nТаблица истинности:')
-    tt.print_truth_table(tt_list)
+    tt.print_truth_table()
     # СДНФ и СКНФ в символьной и числовой форме
-    print(f'\nСовершенная дизъюнктивная нормальная форма (СДНФ): {tt.get_dnf(tt_list)[0]} '
-          f'\nСовершенная конъюнктивная нормальная форма (СKНФ): {tt.get_cnf(tt_list)[0]}')
-    print(f'\nЧисловые формы: \n({tt.get_dnf(tt_list)[1]}) v '
-          f'\n({tt.get_cnf(tt_list)[1]}) ∧')
+    dnf, dnf_num = tt.get_dnf()
+    cnf, cnf_num = tt.get_cnf()
+    print(f'\nСовершенная дизъюнктивная нормальная форма (СДНФ): {dnf} '
+          f'\nСовершенная конъюнктивная нормальная форма (СKНФ): {cnf}')
+    print(f'\nЧисловые формы: \n({dnf_num}) v '
+          f'\n({cnf_num}) ∧')
     # Индексная форма
-    print(f'\nИндексная форма: {tt.index_form(tt_list)[1]} - {tt.index_form(tt_list)[0]}\n')
\ No newline at end of file
+    bin_str, num_form = tt.index_form()
+    print(f'\nИндексная форма: {num_form} - {bin_str}\n')
\ No newline at end of file
@@ -1,37 +1,20 @@
+import io
 import unittest
+from unittest.mock import patch
 from run import TruthTable
 
 
 class TestTruthTable(unittest.TestCase):
 
-    def test_parse_expression(self):
-        self.assertEqual(TruthTable.parse_expression("a->b"), "a or not b")
-        self.assertEqual(TruthTable.parse_expression("a&b"), "a and b")
-        self.assertEqual(TruthTable.parse_expression("a|b"), "a or b")
+    def test_formula(self):
+        self.assertEqual(TruthTable("a->b").formula(), "b | !a")
+        self.assertEqual(TruthTable("a&b").formula(), "a & b")
+        self.assertEqual(TruthTable("a | b & !c").formula(), "a | b & !c")
+        self.assertEqual(TruthTable("(a | b) & c").formula(), "(a | b) & c")
 
     def test_generate_combinations(self):
         self.assertEqual(TruthTable.generate_combinations(2), [[0, 0], [0, 1], [1, 0], [1, 1]])
 
-    def test_tokenize(self):
-        tt = TruthTable("a & b")
-        tokens = tt.tokenize("a and b")
-        expected_tokens = [("VARIABLE", "a"), ("OPERATOR", "and"), ("VARIABLE", "b")]
-        self.assertEqual(tokens, expected_tokens)
-
-    def test_shunting_yard(self):
-        tt = TruthTable("a & b")
-        tokens = [("VARIABLE", "a"), ("OPERATOR", "and"), ("VARIABLE", "b")]
-        postfix = tt.shunting_yard(tokens)
-        self.assertEqual(postfix, ["a", "b", "and"])
-
-    def test_evaluate_postfix(self):
-        tt = TruthTable("a & b")
-        postfix = ["a", "b", "and"]
-        env = {"a": 1, "b": 0}
-        self.assertEqual(tt.evaluate_postfix(postfix, env), 0)
-        env = {"a": 1, "b": 1}
-        self.assertEqual(tt.evaluate_postfix(postfix, env), 1)
-
     def test_build_truth_table(self):
         tt = TruthTable("a & b")
         truth_table = tt.build_truth_table()
@@ -64,6 +47,103 @@ class TestTruthTable(unittest.TestCase):
         self.assertEqual(bin_str, "0001")
         self.assertEqual(num_form, 1)
 
+    def test_compile_expression(self):
+        tt = TruthTable("a & !b")
+        instructions, output = tt.compile_expression()
+        self.assertEqual(instructions, [("not", 1, None), ("and", 0, 2)])
+        self.assertEqual(output, 3)
+
+    def test_evaluate_compiled(self):
+        tt = TruthTable("a | b & c")
+        program = tt.compile_expression()
+        self.assertEqual(tt.evaluate_compiled(program, [0, 1, 1]), 1)
+        self.assertEqual(tt.evaluate_compiled(program, [0, 1, 0]), 0)
+
+    def test_build_truth_table_matches_formula(self):
+        tt = TruthTable("(a | b) & !(c & d) | 1 & a")
+        for a, b, c, d, result in tt.build_truth_table():
+            self.assertEqual(result, int(bool((a or b) and not (c and d) or a)))
+        self.assertEqual(TruthTable(tt.formula()).build_column(), tt.build_column())
+
+    def test_compiled_single_variable(self):
+        tt = TruthTable("b | a")
+        self.assertEqual(tt.index_form(tt.build_truth_table())[0], "0111")
+
+    def test_variable_column(self):
+        self.assertEqual(TruthTable.variable_column(0, 2), 0b0011)
+        self.assertEqual(TruthTable.variable_column(1, 2), 0b0101)
+        self.assertEqual(TruthTable.variable_column(2, 3), 0b01010101)
+
+    def test_build_column(self):
+        tt = TruthTable("a & b")
+        column = tt.build_column()
+        self.assertEqual(column, 1)
+        self.assertEqual(tt.index_form(column), ("0001", 1))
+        self.assertEqual(tt.get_dnf(column), tt.get_dnf(tt.build_truth_table()))
+        self.assertEqual(tt.get_cnf(column), ("(a ∨ b) ∧ (a ∨ ¬b) ∧ (¬a ∨ b)", "0,1,2"))
+
+    def test_build_column_many_vars(self):
+        names = [f"x{i}" for i in range(24)]
+        tt = TruthTable(" & ".join(names))
+        column = tt.build_column()
+        self.assertEqual(column, 1)
+        tt = TruthTable(" | ".join(names))
+        self.assertEqual(tt.build_column(), (1 << ((1 << 24) - 1)) - 1)
+
+    def test_iter_combinations_is_lazy(self):
+        combinations = TruthTable.iter_combinations(40)
+        self.assertEqual(next(combinations), [0] * 40)
+        self.assertEqual(next(combinations), [0] * 39 + [1])
+
+    def test_iter_chunks(self):
+        tt = TruthTable("a | b & c")
+        chunks = list(tt.iter_chunks(chunk_size=2))
+        self.assertEqual([(start, size) for start, size, _ in chunks], [(0, 2), (2, 2), (4, 2), (6, 2)])
+        joined = "".join(format(column, f"0{size}b") for _, size, column in chunks)
+        self.assertEqual(joined, tt.index_form(tt.build_column())[0])
+
+    def test_iter_rows_matches_table(self):
+        tt = TruthTable("(a | b) & !(c & d)")
+        self.assertEqual(list(tt.iter_rows(chunk_size=4)), tt.build_truth_table())
+
+    def test_streamed_forms(self):
+        tt = TruthTable("a & b")
+        self.assertEqual(tt.get_dnf(), ("(a ∧ b)", "3"))
+        self.assertEqual(tt.get_cnf()[1], "0,1,2")
+        self.assertEqual(tt.index_form(), ("0001", 1))
+
+    def test_print_truth_table_streams(self):
+        tt = TruthTable("a & b")
+        with patch("sys.stdout", new_callable=io.StringIO) as output:
+            tt.print_truth_table()
+        self.assertIn("1 | 1 | 1", output.getvalue())
+
+    def test_build_column_parallel(self):
+        names = [f"x{i}" for i in range(18)]
+        tt = TruthTable(" | ".join(f"({a} & !{b})" for a, b in zip(names, names[1:])))
+        self.assertEqual(tt.build_column(workers=2), tt.build_column())
+
+    def test_build_column_parallel_small_table(self):
+        tt = TruthTable("a & b")
+        self.assertEqual(tt.build_column(workers=4), 1)
+
+    def test_implication_precedence(self):
+        tt = TruthTable("a | b -> c")
+        self.assertEqual(tt.index_form(tt.build_column())[0], "11010101")
+
+    def test_equivalence_and_xor(self):
+        self.assertEqual(TruthTable("a ~ b").index_form()[0], "1001")
+        self.assertEqual(TruthTable("a ^ b").index_form()[0], "0110")
+
+    def test_variables_named_like_keywords(self):
+        tt = TruthTable("order & nota")
+        self.assertEqual(tt.used_vars, ["nota", "order"])
+        self.assertEqual(tt.index_form()[0], "0001")
+
+    def test_invalid_expression(self):
+        with self.assertRaises(ValueError):
+            TruthTable("a & & b")
+
 
 if __name__ == "__main__":
     unittest.main()
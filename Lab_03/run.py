@@ -1,8 +1,18 @@
+import functools
 import itertools
+import os
 import re
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from logic import cover_cache
+from logic import expression as logic_expression
+from logic import minimizer
+from logic import qmc
 
 allowed_var = {'a', 'b', 'c', 'd', 'e'}
 allowed_sym = {'&', '|', '!', '->', '~', '(', ')'}
+allowed_ops = {'&', '|', '!', '->', '~'}
 
 def is_valid_expression(expr):
     expr = expr.replace('->', 'IMPL').replace('~', 'EQV')
@@ -20,23 +30,35 @@ def parse_expression(expr):
     expr = expr.replace('|', ' or ')
     return expr
 
-def build_truth_table(variables, expr):
-    truth_table = []
-    dnf = []
-    cnf = []
-    for values in itertools.product([0, 1], repeat=len(variables)):
-        context = dict(zip(variables, values))
-        try:
-            result = eval(parse_expression(expr), {}, context)
-        except Exception as e:
-            raise ValueError(f"Ошибка в выражении: {e}")
-        truth_table.append((values, result))
-        if result:
-            dnf.append(values)
-        else:
-            cnf.append(values)
+# Разбор и компиляция выполняются один раз на выражение, без eval:
+# допускаются только операции &, |, !, ->, ~, переменные variables и константы 0/1
+@functools.lru_cache(maxsize=128)
+def compile_expression(expr, variables):
+    return logic_expression.parse(expr, allowed_ops).compile(variables)
+
+# Построчное вычисление на одном наборе значений
+def evaluate_expression(expr, context):
+    variables = tuple(sorted(context))
+    program = compile_expression(expr, variables)
+    return logic_expression.evaluate(program, [context[var] for var in variables])
+
+# Таблица истинности считается побитово по столбцам и кэшируется, поэтому
+# минимизация СДНФ, СКНФ и карта Карно используют одну таблицу на выражение
+@functools.lru_cache(maxsize=128)
+def _truth_table(variables, expr):
+    program = compile_expression(expr, variables)
+    size = 1 << len(variables)
+    column = logic_expression.evaluate_block(program, len(variables), 0, size)
+    truth_table = tuple(zip(itertools.product([0, 1], repeat=len(variables)),
+                            map(int, format(column, f'0{size}b'))))
+    dnf = tuple(values for values, result in truth_table if result)
+    cnf = tuple(values for values, result in truth_table if not result)
     return truth_table, dnf, cnf
 
+def build_truth_table(variables, expr):
+    truth_table, dnf, cnf = _truth_table(tuple(variables), expr)
+    return list(truth_table), list(dnf), list(cnf)
+
 def glue_impl(impl):
     def can_glue(a, b):
         diff = 0
@@ -76,78 +98,117 @@ def impl_to_str(imp, variables, mode='dnf'):
 
     return connector.join(terms)
 
-def minimize_dnf(expr, variables):
-    _, dnf, _ = build_truth_table(variables, expr)
-    impl = [tuple(val) for val in dnf]
-    print("Начальные импликанты СДНФ:")
+# Кэш покрытий: функции, отличающиеся перестановкой и инверсией переменных,
+# минимизируются один раз
+COVER_CACHE = cover_cache.CoverCache()
+
+# Минимизация через общее ядро logic.minimizer (метод Квайна–Мак-Класки на
+# целочисленных импликантах). dont_cares — наборы (кортежи значений), на которых
+# значение функции безразлично: они участвуют в склеивании, но не обязаны быть покрыты
+def minimize_impl(impl, variables, mode='dnf', dont_cares=()):
+    title = 'СДНФ' if mode == 'dnf' else 'СКНФ'
+    dc = {tuple(values) for values in dont_cares}
+    impl = [imp for imp in impl if tuple(imp) not in dc]
+    print(f"Начальные импликанты {title}:")
     for i, imp in enumerate(impl):
         print(f"{i+1}: {imp}")
-    stage = 1
-    while True:
-        new_impl = glue_impl(impl)
-        if new_impl == impl:
-            break
-        print(f"\nСтадия склеивания {stage} (СДНФ):")
-        for i, imp in enumerate(new_impl):
-            print(f"{impl_to_str(imp, variables, mode='dnf')}")
-        impl = new_impl
-        stage += 1
-    return impl
-
-def minimize_cnf(expr, variables):
+
+    def print_stage(stage, cubes):
+        print(f"\nСтадия склеивания {stage} ({title}):")
+        for cube in cubes:
+            print(f"{impl_to_str(qmc.cube_to_tuple(cube, len(variables)), variables, mode=mode)}")
+
+    on = minimizer.to_bitset(qmc.tuple_to_cube(imp)[0] for imp in impl)
+    dc = minimizer.to_bitset(qmc.tuple_to_cube(values)[0] for values in dc)
+    misses = COVER_CACHE.misses
+    cover = COVER_CACHE.minimize(len(variables), on, dc, on_stage=print_stage)
+    if COVER_CACHE.misses == misses:
+        print(f"\nПокрытие {title} взято из кэша")
+    return [qmc.cube_to_tuple(cube, len(variables)) for cube in cover]
+
+def minimize_dnf(expr, variables, dont_cares=()):
+    _, dnf, _ = build_truth_table(variables, expr)
+    return minimize_impl(dnf, variables, mode='dnf', dont_cares=dont_cares)
+
+def minimize_cnf(expr, variables, dont_cares=()):
     _, _, cnf = build_truth_table(variables, expr)
-    impl = [tuple(val) for val in cnf]
-    print("Начальные импликанты СКНФ:")
-    for i, imp in enumerate(impl):
-        print(f"{i+1}: {imp}")
-    stage = 1
-    while True:
-        new_impl = glue_impl(impl)
-        if new_impl == impl:
-            break
-        print(f"\nСтадия склеивания {stage} (СКНФ):")
-        for i, imp in enumerate(new_impl):
-            print(f"{impl_to_str(imp, variables, mode='cnf')}")
-        impl = new_impl
-        stage += 1
-    return impl
-
-def generate_karnaugh_map(truth_table, variables):
+    return minimize_impl(cnf, variables, mode='cnf', dont_cares=dont_cares)
+
+# Коды Грея для осей карты. Ось из 3 переменных — два зеркально отражённых
+# блока по 2 переменные, поэтому карты на 5 и 6 переменных складываются из
+# 2 и 4 карт на 4 переменные
+GRAY_CODES = {bits: [i ^ (i >> 1) for i in range(1 << bits)] for bits in range(4)}
+
+# Ячейки (номера наборов), в которых разряд bit равен нулю, как битовое множество
+def _zero_cells(num_vars, bit):
+    return sum(1 << cell for cell in range(1 << num_vars) if not cell >> bit & 1)
+
+# Максимальные группы карты: прямоугольники из 2^k ячеек с переносом через край —
+# это кубы (value, mask), все ячейки которых входят в cells.
+# groups[mask] — битовое множество ячеек value, с которых начинаются группы с маской mask;
+# группа mask | b составляется из двух групп mask, отличающихся разрядом b
+def karnaugh_groups(cells, num_vars):
+    zero_cells = [_zero_cells(num_vars, bit) for bit in range(num_vars)]
+    groups = [0] * (1 << num_vars)
+    groups[0] = cells
+    for mask in range(1, 1 << num_vars):
+        bit = (mask & -mask).bit_length() - 1
+        prev = groups[mask & ~(1 << bit)]
+        groups[mask] = prev & (prev >> (1 << bit)) & zero_cells[bit]
+
+    primes = []
+    for mask, starts in enumerate(groups):
+        for bit in range(num_vars):
+            if not mask >> bit & 1:
+                bigger = groups[mask | 1 << bit]
+                starts &= ~(bigger | bigger << (1 << bit))
+        primes.extend((value, mask) for value in qmc.iter_bits(starts))
+    return primes
+
+def generate_karnaugh_map(truth_table, variables, mode='dnf'):
     n = len(variables)
-    if n < 2 or n > 4:
-        raise ValueError("Метод Карно поддерживает 2–4 переменные.")
-        return []
-
-    if n == 2:
-        row_vars = [variables[0]]
-        col_vars = [variables[1]]
-    elif n == 3:
-        row_vars = [variables[0]]
-        col_vars = [variables[1], variables[2]]
-    elif n == 4:
-        row_vars = [variables[0], variables[1]]
-        col_vars = [variables[2], variables[3]]
-
-    row_labels = [format(i ^ (i >> 1), f'0{len(row_vars)}b') for i in range(2 ** len(row_vars))]
-    col_labels = [format(i ^ (i >> 1), f'0{len(col_vars)}b') for i in range(2 ** len(col_vars))]
-    value_map = {}
+    if n < 2 or n > 6:
+        raise ValueError("Метод Карно поддерживает 2–6 переменных.")
+
+    row_bits = n // 2
+    col_bits = n - row_bits
+    row_vars = variables[:row_bits]
+    col_vars = variables[row_bits:]
+    ones = 0
     for values, result in truth_table:
-        var_dict = dict(zip(variables, values))
-        row_key = ''.join(str(var_dict[v]) for v in row_vars)
-        col_key = ''.join(str(var_dict[v]) for v in col_vars)
-        value_map[(row_key, col_key)] = result
+        if result:
+            ones |= 1 << qmc.tuple_to_cube(values)[0]
 
-    print("\nКарта Карно:")
-    header = "   " + "  ".join(col_labels)
-    print(header)
-    for r in row_labels:
-        row = f"{r} |"
-        for c in col_labels:
-            val = value_map.get((r, c), ' ')
-            row += f" {int(val)} " if isinstance(val, int) else "   "
-        print(row)
-    selected = []
+    row_labels = [format(code, f'0{row_bits}b') for code in GRAY_CODES[row_bits]]
+    col_labels = [format(code, f'0{col_bits}b') for code in GRAY_CODES[col_bits]]
+    half = len(col_labels) // 2 if col_bits == 3 else None
 
+    print("\nКарта Карно:")
+    print(f"{''.join(row_vars)}\\{''.join(col_vars)}")
+    header = " " * (row_bits + 1)
+    for c, label in enumerate(col_labels):
+        header += (" " if c == half else "") + f"{label:^{col_bits}} "
+    print(header.rstrip())
+    for r, row_code in enumerate(GRAY_CODES[row_bits]):
+        if row_bits == 3 and r == len(row_labels) // 2:
+            print()
+        row = f"{row_labels[r]} "
+        for c, col_code in enumerate(GRAY_CODES[col_bits]):
+            if c == half:
+                row += "|"
+            row += f"{ones >> (row_code << col_bits | col_code) & 1:^{col_bits}} "
+        print(row.rstrip())
+
+    # группы единиц для СДНФ, нулей — для СКНФ
+    size = 1 << n
+    cells = ones if mode == 'dnf' else ~ones & ((1 << size) - 1)
+    primes = karnaugh_groups(cells, n)
+    cover = qmc.minimal_cover(primes, list(qmc.iter_bits(cells)), n)
+    selected = [qmc.cube_to_tuple(cube, n) for cube in cover]
+
+    print("Выбранные группы:")
+    for imp in selected:
+        print(impl_to_str(imp, variables, mode=mode) or ('1' if mode == 'dnf' else '0'))
     return selected
 
 if __name__ == "__main__":
@@ -179,4 +240,6 @@ if __name__ == "__main__":
                 print("\n=== Метод Карно ===")
                 truth_table, _, _ = build_truth_table(used_vars, user_input)
                 karnaugh_imp_dnf = generate_karnaugh_map(truth_table, used_vars)
+                print("\nМинимизированная СДНФ (Карно):")
+                print(' ∨ '.join(f"({impl_to_str(imp, used_vars, mode='dnf')})" for imp in karnaugh_imp_dnf))
                 break
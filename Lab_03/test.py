@@ -2,7 +2,8 @@ import unittest
 import re
 from run import (
     is_valid_expression, parse_expression, build_truth_table,
-    minimize_dnf, minimize_cnf, glue_impl, impl_to_str, generate_karnaugh_map
+    COVER_CACHE, minimize_dnf, minimize_cnf, glue_impl, impl_to_str, generate_karnaugh_map,
+    compile_expression, evaluate_expression, karnaugh_groups
 )
 
 
@@ -79,7 +80,7 @@ class TestLogicMinimizer(unittest.TestCase):
         expr = 'a & b'
         truth_table, _, _ = build_truth_table(variables, expr)
         selected = generate_karnaugh_map(truth_table, variables)
-        self.assertEqual(selected, [])
+        self.assertEqual(selected, [(1, 1)])
 
     def test_generate_karnaugh_map_invalid(self):
         variables = ['a']
@@ -133,14 +134,14 @@ class TestLogicMinimizer(unittest.TestCase):
         expr = '(a&b)|c'
         truth_table, _, _ = build_truth_table(variables, expr)
         selected = generate_karnaugh_map(truth_table, variables)
-        self.assertEqual(selected, [])
+        self.assertEqual(sorted(selected, key=str), [('X', 'X', 1), (1, 1, 'X')])
 
     def test_generate_karnaugh_map_4_vars(self):
         variables = ['a', 'b', 'c', 'd']
         expr = '(a&b)|(c&d)'
         truth_table, _, _ = build_truth_table(variables, expr)
         selected = generate_karnaugh_map(truth_table, variables)
-        self.assertEqual(selected, [])
+        self.assertEqual(sorted(selected, key=str), [('X', 'X', 1, 1), (1, 1, 'X', 'X')])
 
     def test_invalid_expression_too_many_vars(self):
         expr = 'a&b&c&d&e&a'
@@ -167,5 +168,105 @@ class TestLogicMinimizer(unittest.TestCase):
         result = impl_to_str(imp, variables, mode='dnf')
         self.assertEqual(result, '¬a & ¬b & ¬c')
 
+    def test_build_truth_table_rejects_code(self):
+        for expr in ('__import__("os").system("ls")', 'a + b', 'a ^ b', 'x & a'):
+            with self.assertRaises(ValueError):
+                build_truth_table(['a', 'b'], expr)
+
+    def test_build_truth_table_compound_implication(self):
+        truth_table, dnf, _ = build_truth_table(['a', 'b', 'c'], '(a|b)->!c')
+        expected = [int(not (a or b) or not c) for (a, b, c), _ in truth_table]
+        self.assertEqual([result for _, result in truth_table], expected)
+        self.assertNotIn((1, 0, 1), dnf)
+
+    def test_evaluate_expression(self):
+        self.assertEqual(evaluate_expression('a -> b', {'a': 1, 'b': 0}), 0)
+        self.assertEqual(evaluate_expression('a ~ !b', {'a': 1, 'b': 0}), 1)
+
+    def test_truth_table_is_shared(self):
+        variables = ['a', 'b', 'c']
+        expr = '(a & b) | (c ~ a)'
+        first = build_truth_table(variables, expr)
+        info = compile_expression.cache_info()
+        minimize_dnf(expr, variables)
+        minimize_cnf(expr, variables)
+        self.assertEqual(compile_expression.cache_info().misses, info.misses)
+        self.assertEqual(build_truth_table(variables, expr), first)
+
+    def test_minimize_dnf_minimal_cover(self):
+        variables = ['a', 'b', 'c']
+        minimized = minimize_dnf('a & b | a & !b | c', variables)
+        self.assertEqual(sorted(minimized, key=str), [('X', 'X', 1), (1, 'X', 'X')])
+
+    def test_minimize_dnf_drops_redundant_prime(self):
+        # a&b | !a&c | b&c: простая импликанта b&c не входит в минимальное покрытие
+        variables = ['a', 'b', 'c']
+        minimized = minimize_dnf('a & b | !a & c | b & c', variables)
+        self.assertEqual(sorted(minimized, key=str), [(0, 'X', 1), (1, 1, 'X')])
+
+    def test_minimize_cnf_minimal_cover(self):
+        variables = ['a', 'b', 'c']
+        minimized = minimize_cnf('(a | b) & (a | c)', variables)
+        self.assertEqual(sorted(minimized, key=str), [(0, 'X', 0), (0, 0, 'X')])
+
+    def test_karnaugh_groups_wraparound(self):
+        # ячейки 0, 2, 8, 10 — четыре угла карты на 4 переменные
+        groups = karnaugh_groups(1 << 0 | 1 << 2 | 1 << 8 | 1 << 10, 4)
+        self.assertEqual(groups, [(0, 0b1010)])
+
+    def test_karnaugh_groups_maximal(self):
+        # a | b на 2 переменных: две группы по две ячейки
+        self.assertEqual(sorted(karnaugh_groups(0b1110, 2)), [(1, 0b10), (2, 0b01)])
+
+    def test_generate_karnaugh_map_5_vars(self):
+        variables = ['a', 'b', 'c', 'd', 'e']
+        truth_table, _, _ = build_truth_table(variables, 'a & b | c & !d | e')
+        selected = generate_karnaugh_map(truth_table, variables)
+        self.assertEqual(sorted(impl_to_str(imp, variables) for imp in selected), ['a & b', 'c & ¬d', 'e'])
+
+    def test_generate_karnaugh_map_6_vars_mirrored(self):
+        # группа ¬a¬b¬c¬e¬f соединяет столбцы 000 и 100 через ось отражения
+        variables = ['a', 'b', 'c', 'd', 'e', 'f']
+        expr = 'a & b & c | d & !e & !f | a & f | !a & !b & !c & !d & !e & !f'
+        truth_table, _, _ = build_truth_table(variables, expr)
+        selected = generate_karnaugh_map(truth_table, variables)
+        self.assertEqual(len(selected), 4)
+        self.assertIn((0, 0, 0, 'X', 0, 0), selected)
+        for values, result in truth_table:
+            covered = any(all(v == 'X' or v == x for v, x in zip(imp, values)) for imp in selected)
+            self.assertEqual(covered, bool(result))
+
+    def test_generate_karnaugh_map_cnf(self):
+        variables = ['a', 'b', 'c']
+        truth_table, _, _ = build_truth_table(variables, '(a | b) & (a | c)')
+        selected = generate_karnaugh_map(truth_table, variables, mode='cnf')
+        self.assertEqual(sorted(selected, key=str), [(0, 'X', 0), (0, 0, 'X')])
+
+    def test_generate_karnaugh_map_too_many_vars(self):
+        variables = ['a', 'b', 'c', 'd', 'e', 'f', 'g']
+        with self.assertRaises(ValueError):
+            generate_karnaugh_map([], variables)
+
+    def test_minimize_dnf_dont_cares(self):
+        # набор (1, 1) безразличен: a ^ b доопределяется до a | b
+        variables = ['a', 'b']
+        minimized = minimize_dnf('a & !b | !a & b', variables, dont_cares=[(1, 1)])
+        self.assertEqual(sorted(minimized, key=str), [('X', 1), (1, 'X')])
+
+    def test_minimize_cnf_dont_cares(self):
+        variables = ['a', 'b']
+        minimized = minimize_cnf('a & b', variables, dont_cares=[(0, 1), (1, 0)])
+        # оба однолитеральных покрытия минимальны
+        self.assertIn(minimized, ([(0, 'X')], [('X', 0)]))
+
+    def test_cover_cache_hit_remaps_variables(self):
+        variables = ['a', 'b', 'c']
+        COVER_CACHE.clear()
+        first = minimize_dnf('a & !b | c', variables)
+        second = minimize_dnf('!b & c | a', variables)
+        self.assertEqual(COVER_CACHE.hits, 1)
+        self.assertEqual(sorted(first, key=str), [('X', 'X', 1), (1, 0, 'X')])
+        self.assertEqual(sorted(second, key=str), [('X', 0, 1), (1, 'X', 'X')])
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -1,129 +1,172 @@
+import argparse
+import os
+import sys
+
+import numpy as np
 from prettytable import PrettyTable
-from minim import *
+from minim import cube_to_letters, formiration_result_cdnf
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from logic import circ
+from logic import minimizer
+from logic import multi_output
+from logic import netsim
 
-VARIABLES4 = "abcd"
+OUTPUTS4 = "SPFG"
 
 TOTAL_BITS = 4
 
-def unmarked_code(number):
-    number = abs(number)
-    binary_code = ''
-    while number > 0:
-        binary_code += str(number % 2)
-        number //= 2
-    binary_code += '0' * (TOTAL_BITS - len(binary_code))
-    binary_code = binary_code[::-1]
-    return binary_code[-8:]
-
-def sum() -> None:
-    for element in combinations_znaczenii:
-        result_values_1 = summa_extra_code(element)
-        perem = convert_from_2_to_10(result_values_1)
-        perem = perem % 10
-        result_values_1 = unmarked_code(perem)
-
-        result_values_s.append(result_values_1[0])
-        result_values_p.append(result_values_1[1])
-        result_values_f.append(result_values_1[2])
-        result_values_g.append(result_values_1[3])
-        result_value.append(result_values_1)
-
-    all_values['S'] = result_values_s
-    all_values['P'] = result_values_p
-    all_values['F'] = result_values_f
-    all_values['G'] = result_values_g
-
-def truth_table() -> None:
+# Буквы входов многоразрядного кода: по четыре на тетраду
+INPUT_LETTERS = "abcdefghijklmnopqrstuvwx"
+
+# Таблица сложения одной тетрады с цифрой addend_digit. Индекс —
+# перенос · 10 + цифра, значения — цифра суммы и перенос в следующую тетраду
+def digit_sum_table(addend_digit: int):
+    carry, digit = np.divmod(np.arange(20), 10)
+    total = digit + addend_digit + carry
+    return total % 10, total // 10
+
+# Флаги наборов в битовое множество (бит m — набор m)
+def flags_to_bitset(flags) -> int:
+    return int.from_bytes(np.packbits(flags, bitorder='little').tobytes(), 'little')
+
+# Генератор преобразователя кода D8421: к числу из digits десятичных разрядов
+# прибавляется addend (по модулю 10 ** digits), результат выдаётся в коде
+# с избытком excess (0 — D8421, 3 — код с избытком 3). Старшая тетрада —
+# старшие разряды номера набора; наборы с тетрадами 1010–1111 безразличны
+class BCDCodeGenerator:
+    def __init__(self, addend: int = 5, digits: int = 1, excess: int = 0):
+        if not 1 <= digits <= len(INPUT_LETTERS) // TOTAL_BITS:
+            raise ValueError(f"Ошибка: число тетрад должно быть от 1 до {len(INPUT_LETTERS) // TOTAL_BITS}")
+        if not 0 <= excess <= 6:
+            raise ValueError("Ошибка: избыток кода должен быть от 0 до 6")
+        self.digits = digits
+        self.addend = addend % 10 ** digits
+        self.excess = excess
+        self.num_inputs = TOTAL_BITS * digits
+        self.inputs = INPUT_LETTERS[:self.num_inputs]
+        if digits == 1:
+            self.outputs = list(OUTPUTS4)
+        else:
+            self.outputs = [f"{letter}{k + 1}" for k in range(digits) for letter in OUTPUTS4]
+        # таблицы сложения тетрад, начиная с младшей
+        self._sum_tables = [digit_sum_table(self.addend // 10 ** k % 10) for k in range(digits)]
+        self._table = None
+
+    # Векторный путь: тетрады всех кодов складываются выборкой из таблиц
+    # сложения, перенос передаётся массивом. Возвращает выходные слова и
+    # признак того, что все тетрады кода — цифры
+    def convert(self, codes):
+        codes = np.asarray(codes, dtype=np.int64)
+        words = np.zeros_like(codes)
+        valid = np.ones(codes.shape, dtype=bool)
+        carry = np.zeros_like(codes)
+        for k, (sums, carries) in enumerate(self._sum_tables):
+            digit = (codes >> (TOTAL_BITS * k)) & 15
+            valid &= digit < 10
+            index = carry * 10 + np.minimum(digit, 9)
+            words |= (sums[index] + self.excess) << (TOTAL_BITS * k)
+            carry = carries[index]
+        return words, valid
+
+    # Выходные слова и признаки допустимости на всех наборах (строится один раз)
+    def table(self):
+        if self._table is None:
+            self._table = self.convert(np.arange(1 << self.num_inputs))
+        return self._table
+
+    # Пары (код, выходное слово) для допустимых кодов
+    def rows(self):
+        words, valid = self.table()
+        return [(int(code), int(words[code])) for code in np.flatnonzero(valid)]
+
+    def dont_cares(self) -> int:
+        return flags_to_bitset(~self.table()[1])
+
+    # Единицы выходов как битовые множества; первый выход — старший разряд слова
+    def on_sets(self):
+        words, valid = self.table()
+        return [flags_to_bitset(valid & (words >> bit & 1).astype(bool))
+                for bit in range(self.num_inputs - 1, -1, -1)]
+
+    def minimize(self):
+        dc = self.dont_cares()
+        return {name: minimizer.minimize(self.num_inputs, on, dc)
+                for name, on in zip(self.outputs, self.on_sets())}
+
+    # Минимизированные СДНФ выходов в буквенной записи
+    def equations(self):
+        return {name: formiration_result_cdnf([cube_to_letters(cube, self.inputs) for cube in cover])
+                for name, cover in self.minimize().items()}
+
+    # Совместная минимизация выходов: термы (куб, маска выходов) и площадь PLA
+    def shared(self):
+        on_sets = self.on_sets()
+        terms = multi_output.minimize(self.num_inputs, on_sets, [self.dont_cares()] * len(on_sets))
+        return terms, multi_output.pla_area(terms, self.num_inputs, len(on_sets))
+
+    # Граф вентилей по совместно минимизированным выходам
+    def netlist(self):
+        return circ.Netlist.from_terms(self.inputs, self.outputs, self.shared()[0])
+
+    # Выходы в виде слов uint64 по всем наборам (разряд j слова w — набор 64 · w + j)
+    def _packed(self, flags):
+        flags = np.resize(flags, max(64, flags.size))
+        return np.packbits(flags, bitorder='little').view('<u8')
+
+    # Полная проверка схемы (graph с полями nodes, inputs, outputs — например,
+    # netlist() или схема из .circ с входами-буквами) на всех допустимых
+    # кодах. Результат — первый код с неверным выходом или None
+    def verify(self, graph):
+        compiled = netsim.CompiledNetlist(graph)
+        words, valid = self.table()
+        valid = self._packed(valid)
+        expected = {name: self._packed((words >> bit & 1).astype(bool))
+                    for name, bit in zip(self.outputs, range(self.num_inputs - 1, -1, -1))}
+        for start, outputs in compiled.blocks(self.inputs):
+            end = start + len(outputs[self.outputs[0]])
+            diff = np.zeros(end - start, dtype=np.uint64)
+            for name in self.outputs:
+                diff |= outputs[name] ^ expected[name][start:end]
+            diff &= valid[start:end]
+            for word in np.flatnonzero(diff)[:1]:
+                bits = int(diff[word])
+                return (start + int(word)) * 64 + (bits & -bits).bit_length() - 1
+        return None
+
+def truth_table(generator: BCDCodeGenerator) -> None:
     table = PrettyTable()
-    table.field_names = list(all_values.keys())
-    for i in range(10):
-        row = [all_values[col][i] for col in table.field_names]
-        table.add_row(row)
+    table.field_names = list(generator.inputs) + generator.outputs
+    for code, word in generator.rows():
+        table.add_row(list(format(code, f'0{generator.num_inputs}b') + format(word, f'0{generator.num_inputs}b')))
     print(table)
 
-def cdnf(key: str) -> str:
-    line = ''
-    result_value = all_values[key]
-    for i in range(10):
-        if result_value[i] == '1':
-            counter = 0
-            line += '('
-            for element in VARIABLES4:
-                if all_values[element][i] == '1':
-                    line += element
-                else:
-                    line += ('!' + element)
-                if len(VARIABLES4) - 1 > counter:
-                    line += '&'
-                    counter += 1
-            line += ')|'
-    return line[:-1]
-
-def summa_extra_code(binary_code_1: str, binary_code_2: str = '0101') -> str:
-    digit = '0'
-    sum_binary_code = ''
-    max_len = max(len(binary_code_1), len(binary_code_2))
-    binary_code_1 = binary_code_1.zfill(max_len)[::-1]
-    binary_code_2 = binary_code_2.zfill(max_len)[::-1]
-    for i in range(max_len):
-        if ((binary_code_1[i] == '1' and binary_code_2[i] == '0') or (binary_code_1[i] == '0' and binary_code_2[i] == '1')) and digit == '0':
-            sum_binary_code += '1'
-        elif ((binary_code_1[i] == '1' and binary_code_2[i] == '0') or (binary_code_1[i] == '0' and binary_code_2[i] == '1')) and digit == '1':
-            sum_binary_code += '0'
-        elif (binary_code_1[i] == '0' and  binary_code_2[i] == '0') and digit == '1':
-            digit = '0'
-            sum_binary_code += '1'
-        elif (binary_code_1[i] == '0' and  binary_code_2[i] == '0') and digit == '0':
-            sum_binary_code += '0'
-        elif (binary_code_1[i] == '1' and  binary_code_2[i] == '1') and digit == '0':
-            digit = '1'
-            sum_binary_code += '0'
-        elif (binary_code_1[i] == '1' and  binary_code_2[i] == '1') and digit == '1':
-            sum_binary_code += '1'
-    sum_binary_code = sum_binary_code[::-1]
-    return sum_binary_code
-
-# 2 код -> 10 код
-def convert_from_2_to_10(binary_code: str) -> int:
-    result = 0
-    for bit in range(len(binary_code)):
-        result += int(binary_code[bit]) * (2 ** (len(binary_code) - 1 - bit))
-    return result
-
-
-combinations_znaczenii = list()
-all_values = {}
-for i in range(10):
-    peremen = unmarked_code(i)
-    combinations_znaczenii.append(peremen)
-for i in range(len(VARIABLES4)):
-    values = list()
-    for element in combinations_znaczenii:
-        values.append(element[i])
-    all_values[VARIABLES4[i]] = values
-result_values_s = []
-result_values_p = []
-result_values_f = []
-result_values_g = []
-result_value = []
-
-
-sum()
-truth_table()
-
-x1 = cdnf('S')
-x2 = cdnf('P')
-x3 = cdnf('F')
-x4 = cdnf('G')
-
-
-
-print('Результат:')
-print("Минимизированная СДНФ S:")
-minimization_cdnf(x1)
-print("\nМинимизированная СДНФ P:")
-minimization_cdnf(x2)
-print("\nМинимизированная СДНФ F:")
-minimization_cdnf(x3)
-print("\nМинимизированная СДНФ G:")
-minimization_cdnf(x4)
+# Совместная минимизация выходов: общие термы занимают одну строку PLA
+def shared_minimization(generator: BCDCodeGenerator) -> None:
+    terms, area = generator.shared()
+    for index, name in enumerate(generator.outputs):
+        used = [cube_to_letters(cube, generator.inputs) for cube, mask in terms if mask >> index & 1]
+        print(f"{name} = {formiration_result_cdnf(used)}")
+    shared = [cube_to_letters(cube, generator.inputs) for cube, mask in terms if mask & (mask - 1)]
+    print("Общие термы:", formiration_result_cdnf(shared) or '-')
+    print("Площадь PLA:", area)
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Синтез преобразователя кода D8421 + n")
+    parser.add_argument('--addend', type=int, default=5, help="прибавляемое число")
+    parser.add_argument('--digits', type=int, default=1, help="число десятичных разрядов")
+    parser.add_argument('--excess', type=int, default=0, help="избыток выходного кода")
+    args = parser.parse_args(argv)
+
+    generator = BCDCodeGenerator(args.addend, args.digits, args.excess)
+    truth_table(generator)
+    print('Результат:')
+    for index, (name, equation) in enumerate(generator.equations().items()):
+        print(("\n" if index else "") + f"Минимизированная СДНФ {name}:")
+        print(equation)
+
+    print(f"\nСовместная минимизация {', '.join(generator.outputs)}:")
+    shared_minimization(generator)
+
+if __name__ == "__main__":
+    main()
@@ -1,91 +1,32 @@
 from tabulate import tabulate
+import argparse
+import functools
 import itertools
 import math
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from logic import circ
+from logic import cover_cache
+from logic import cubes
+from logic import minimizer
+from logic import multi_output
+from logic import netsim
+from logic import qmc
 
 VARIABLES = ['X1', 'X2', 'X3']
-TRUTH_TABLE = [
-    (0, 0, 0, 0, 0),
-    (0, 0, 1, 0, 1),
-    (0, 1, 0, 0, 1),
-    (0, 1, 1, 1, 0),
-    (1, 0, 0, 0, 1),
-    (1, 0, 1, 1, 0),
-    (1, 1, 0, 1, 0),
-    (1, 1, 1, 1, 1),
-]
-
-def binary(n, width):
-    return bin(n)[2:].zfill(width)
-
-def bit_count(string, symbol):
-    return string.count(symbol)
-
-def merge_terms(term1, term2):
-    mismatch = 0
-    result = []
-    for a, b in zip(term1, term2):
-        if a == b:
-            result.append(a)
-        else:
-            mismatch += 1
-            result.append('-')
-            if mismatch > 1:
-                return None
-    return ''.join(result)
-
-def extract_primes(mint_list, count):
-    grouped = {}
-    for m in mint_list:
-        b = binary(m, count)
-        ones = bit_count(b, '1')
-        grouped.setdefault(ones, set()).add(b)
-
-    prime_set = set()
-    while grouped:
-        temp = {}
-        visited = set()
-        for i in sorted(grouped):
-            next_group = grouped.get(i + 1)
-            if not next_group:
-                continue
-            for a, b in itertools.product(grouped[i], next_group):
-                merged = merge_terms(a, b)
-                if merged:
-                    visited.update([a, b])
-                    ones = bit_count(merged, '1')
-                    temp.setdefault(ones, set()).add(merged)
-        for group in grouped.values():
-            for term in group:
-                if term not in visited:
-                    prime_set.add(term)
-        grouped = temp
-    return prime_set
-
-def matches(impl, term, count):
-    bits = binary(term, count)
-    return all(ic == '-' or ic == bc for ic, bc in zip(impl, bits))
 
+# Простые импликанты в виде строк из 0, 1, - (общее ядро logic.qmc);
+# безразличные наборы участвуют в склеивании
+def extract_primes(mint_list, count, dont_cares=()):
+    return {cubes.format_cube(cube, count) for cube in qmc.prime_implicants(mint_list, dont_cares)}
+
+# Минимальное покрытие наборов term: существенные импликанты и перебор
+# с ветвями и границами вместо жадного добора
 def find_essential(primes, term, count):
-    table = {imp: {m for m in term if matches(imp, m, count)} for imp in primes}
-    term_map = {}
-    for imp, covers in table.items():
-        for m in covers:
-            term_map.setdefault(m, []).append(imp)
-
-    essentials = set()
-    covered = set()
-    for m, imps in term_map.items():
-        if len(imps) == 1:
-            essentials.add(imps[0])
-            covered.update(table[imps[0]])
-
-    uncovered = set(term) - covered
-    while uncovered:
-        best_impl = max(table, key=lambda x: len(table[x] & uncovered))
-        essentials.add(best_impl)
-        covered.update(table[best_impl])
-        uncovered = set(term) - covered
-    return essentials
+    cover = qmc.minimal_cover(sorted(cubes.parse_cube(imp) for imp in primes), term, count)
+    return {cubes.format_cube(cube, count) for cube in cover}
 
 def format_impl(imp):
     literals = []
@@ -96,31 +37,311 @@ def format_impl(imp):
             literals.append(f'¬{var}')
     return f"({' ∨ '.join(literals)})"
 
-def minimize(term, count):
+# Кэш покрытий (logic.cover_cache): при попадании простые импликанты не ищутся
+COVER_CACHE = cover_cache.CoverCache()
+
+def _solve(count, target, dc, on_stage=None):
+    term = minimizer.from_bitset(target)
+    primes = extract_primes(term, count, minimizer.from_bitset(dc))
+    return sorted(cubes.parse_cube(imp) for imp in find_essential(primes, term, count))
+
+def minimize(term, count, dont_cares=()):
     if not term:
         return '0'
-    primes = extract_primes(term, count)
-    essentials = find_essential(primes, term, count)
-    return ' ∧ '.join(format_impl(imp) for imp in sorted(essentials))
-
-var_count = int(math.log2(len(TRUTH_TABLE)))
-
-P_terms = []
-D_terms = []
-for x1, x2, x3, p_out, d_out in TRUTH_TABLE:
-    index = (x1 << 2) | (x2 << 1) | x3
-    if p_out:
-        P_terms.append(index)
-    if d_out:
-        D_terms.append(index)
-
-table_headers = ["X1", "X2", "X3", "P", "D"]
-table_data = [[x1, x2, x3, p, d] for x1, x2, x3, p, d in TRUTH_TABLE]
-print(tabulate(table_data, headers=table_headers, tablefmt="grid"))
-
-result_P = minimize(P_terms, var_count)
-result_D = minimize(D_terms, var_count)
-
-print("\nМинимизированная СКНФ:")
-print("P  =", result_P)
-print("D  =", result_D)
\ No newline at end of file
+    cover = COVER_CACHE.minimize(count, minimizer.to_bitset(term), minimizer.to_bitset(dont_cares), _solve)
+    return ' ∧ '.join(format_impl(imp) for imp in sorted(cubes.format_cube(cube, count) for cube in cover))
+
+# Совместная минимизация нескольких выходов: терм, общий для выходов,
+# занимает одну строку PLA. Возвращает термы (строка из 0, 1, -, номера выходов)
+# и отчёт о площади PLA
+def minimize_shared(term_lists, count, dont_cares=()):
+    on_sets = [minimizer.to_bitset(term) for term in term_lists]
+    dc_sets = [minimizer.to_bitset(dont_cares)] * len(on_sets)
+    terms = multi_output.minimize(count, on_sets, dc_sets)
+    shared = [(cubes.format_cube(cube, count), multi_output.term_outputs(mask, len(on_sets)))
+              for cube, mask in terms]
+    return shared, multi_output.pla_area(terms, count, len(on_sets))
+
+# Функции одноразрядной ячейки: сумматор (P — перенос, D — сумма) и
+# вычитатель X1 - X2 - X3 (P — заём, D — разность)
+CELL_KINDS = ('add', 'sub')
+
+def cell_function(x1, x2, x3, kind='add'):
+    if kind not in CELL_KINDS:
+        raise ValueError(f"Ошибка: неизвестный тип ячейки '{kind}'")
+    if kind == 'add':
+        total = x1 + x2 + x3
+        return total >> 1, total & 1
+    difference = x1 - x2 - x3
+    return int(difference < 0), difference & 1
+
+def cell_truth_table(kind='add'):
+    return [(x1, x2, x3) + cell_function(x1, x2, x3, kind)
+            for x1, x2, x3 in itertools.product((0, 1), repeat=3)]
+
+TRUTH_TABLE = cell_truth_table('add')
+
+# Покрытие функции count переменных через extract_primes/find_essential:
+# строки из 0, 1, - в порядке аргументов function
+def derive_cover(function, count):
+    term = [index for index, values in enumerate(itertools.product((0, 1), repeat=count)) if function(*values)]
+    if not term:
+        return []
+    return sorted(find_essential(extract_primes(term, count), term, count))
+
+# Уравнения ячейки: перенос и сумма от трёх входов, те же функции при
+# постоянном входном переносе (0 и 1) — для выбора переноса; перенос при
+# входном 0 — генерация, при входном 1 — распространение
+@functools.lru_cache(maxsize=None)
+def cell_equations(kind='add'):
+    carry = lambda x1, x2, x3: cell_function(x1, x2, x3, kind)[0]
+    total = lambda x1, x2, x3: cell_function(x1, x2, x3, kind)[1]
+    return {
+        'carry': derive_cover(carry, 3),
+        'sum': derive_cover(total, 3),
+        'carry0': derive_cover(lambda x1, x2: carry(x1, x2, 0), 2),
+        'sum0': derive_cover(lambda x1, x2: total(x1, x2, 0), 2),
+        'carry1': derive_cover(lambda x1, x2: carry(x1, x2, 1), 2),
+        'sum1': derive_cover(lambda x1, x2: total(x1, x2, 1), 2),
+    }
+
+# Схема из элементов НЕ, И, ИЛИ (И и ИЛИ — с любым числом входов). Узел —
+# номер в списке nodes; одинаковые элементы не дублируются, константы
+# свёртываются. Глубина — число элементов на самом длинном пути от входа
+class Network:
+    GATES = ('NOT', 'AND', 'OR')
+
+    def __init__(self):
+        self.nodes = []
+        self.levels = []
+        self.inputs = {}
+        self.outputs = {}
+        self._index = {}
+
+    def _add(self, kind, args):
+        key = (kind, args)
+        if key not in self._index:
+            self._index[key] = len(self.nodes)
+            self.nodes.append(key)
+            self.levels.append(1 + max((self.levels[arg] for arg in args), default=-1)
+                               if kind in self.GATES else 0)
+        return self._index[key]
+
+    def add_input(self, name):
+        self.inputs[name] = self._add('IN', (name,))
+        return self.inputs[name]
+
+    def const(self, value):
+        return self._add('CONST', (value,))
+
+    def not_(self, node):
+        kind, args = self.nodes[node]
+        if kind == 'NOT':
+            return args[0]
+        if kind == 'CONST':
+            return self.const(1 - args[0])
+        return self._add('NOT', (node,))
+
+    def _gate(self, kind, args):
+        neutral = 1 if kind == 'AND' else 0
+        result = set()
+        for node in args:
+            node_kind, node_args = self.nodes[node]
+            if node_kind == 'CONST':
+                if node_args[0] != neutral:
+                    return node
+                continue
+            result.add(node)
+        if not result:
+            return self.const(neutral)
+        if len(result) == 1:
+            return result.pop()
+        return self._add(kind, tuple(sorted(result)))
+
+    def and_(self, *args):
+        return self._gate('AND', args)
+
+    def or_(self, *args):
+        return self._gate('OR', args)
+
+    # Двухуровневая реализация покрытия (строки из 0, 1, -) над сигналами signals
+    def sop(self, cover, signals):
+        terms = []
+        for imp in cover:
+            literals = [signal if bit == '1' else self.not_(signal)
+                        for bit, signal in zip(imp, signals) if bit != '-']
+            terms.append(self.and_(*literals))
+        return self.or_(*terms)
+
+    def mux(self, select, one, zero):
+        return self.or_(self.and_(select, one), self.and_(self.not_(select), zero))
+
+    def gate_count(self):
+        return sum(1 for kind, _ in self.nodes if kind in self.GATES)
+
+    def depth(self):
+        return max((self.levels[node] for node in self.outputs.values()), default=0)
+
+    def evaluate(self, values):
+        results = []
+        for kind, args in self.nodes:
+            if kind == 'IN':
+                results.append(values[args[0]])
+            elif kind == 'CONST':
+                results.append(args[0])
+            elif kind == 'NOT':
+                results.append(1 - results[args[0]])
+            elif kind == 'AND':
+                results.append(int(all(results[arg] for arg in args)))
+            else:
+                results.append(int(any(results[arg] for arg in args)))
+        return {name: results[node] for name, node in self.outputs.items()}
+
+def _ripple(net, equations, xs, ys, carry_in):
+    sums = []
+    carry = carry_in
+    for x, y in zip(xs, ys):
+        sums.append(net.sop(equations['sum'], [x, y, carry]))
+        carry = net.sop(equations['carry'], [x, y, carry])
+    return sums, carry
+
+# Переносы на выходах разрядов по генерации gs и распространению ps.
+# До group разрядов — прямое двухуровневое раскрытие, иначе разряды
+# делятся на группы, для групп рекурсивно строится следующий уровень
+def _lookahead(net, gs, ps, carry_in, group):
+    if len(gs) <= group:
+        carries = []
+        for i in range(len(gs)):
+            terms = [gs[i]]
+            for j in range(i - 1, -1, -1):
+                terms.append(net.and_(gs[j], *ps[j + 1:i + 1]))
+            terms.append(net.and_(carry_in, *ps[:i + 1]))
+            carries.append(net.or_(*terms))
+        return carries
+
+    blocks = [range(start, min(start + group, len(gs))) for start in range(0, len(gs), group)]
+    group_gs = [_lookahead(net, [gs[i] for i in block], [ps[i] for i in block], net.const(0), group)[-1]
+                for block in blocks]
+    group_ps = [net.and_(*(ps[i] for i in block)) for block in blocks]
+    group_carries = _lookahead(net, group_gs, group_ps, carry_in, group)
+    carries = []
+    for k, block in enumerate(blocks):
+        block_in = carry_in if k == 0 else group_carries[k - 1]
+        inner = _lookahead(net, [gs[i] for i in block], [ps[i] for i in block], block_in, group)
+        carries.extend(inner[:-1] + [group_carries[k]])
+    return carries
+
+# Схема сложения (kind='add') или вычитания (kind='sub') width-разрядных
+# чисел: ripple — последовательный перенос, cla — ускоренный перенос
+# с группами по group разрядов, select — выбор переноса в блоках по group
+# разрядов. Входы x0.., y0.. (0 — младший разряд) и c0, выходы d0.. и p
+ARCHITECTURES = ('ripple', 'cla', 'select')
+
+def build_network(width, architecture='ripple', kind='add', group=4):
+    if width < 1:
+        raise ValueError("Ошибка: разрядность должна быть положительной")
+    if architecture not in ARCHITECTURES:
+        raise ValueError(f"Ошибка: неизвестная архитектура '{architecture}'")
+    if group < 2:
+        raise ValueError("Ошибка: размер группы должен быть не меньше 2")
+    equations = cell_equations(kind)
+    net = Network()
+    xs = [net.add_input(f'x{i}') for i in range(width)]
+    ys = [net.add_input(f'y{i}') for i in range(width)]
+    carry_in = net.add_input('c0')
+
+    if architecture == 'ripple':
+        sums, carry = _ripple(net, equations, xs, ys, carry_in)
+    elif architecture == 'cla':
+        gs = [net.sop(equations['carry0'], [x, y]) for x, y in zip(xs, ys)]
+        ps = [net.sop(equations['carry1'], [x, y]) for x, y in zip(xs, ys)]
+        carries = _lookahead(net, gs, ps, carry_in, group)
+        sums = [net.sop(equations['sum'], [x, y, c]) for x, y, c in zip(xs, ys, [carry_in] + carries[:-1])]
+        carry = carries[-1]
+    else:
+        sums, carry = _ripple(net, equations, xs[:group], ys[:group], carry_in)
+        for start in range(group, width, group):
+            block_xs, block_ys = xs[start:start + group], ys[start:start + group]
+            variants = []
+            for value in '01':
+                first = [net.sop(equations['sum' + value], [block_xs[0], block_ys[0]])]
+                first_carry = net.sop(equations['carry' + value], [block_xs[0], block_ys[0]])
+                rest, block_carry = _ripple(net, equations, block_xs[1:], block_ys[1:], first_carry)
+                variants.append((first + rest, block_carry))
+            (sums0, carry0), (sums1, carry1) = variants
+            sums += [net.mux(carry, one, zero) for one, zero in zip(sums1, sums0)]
+            carry = net.mux(carry, carry1, carry0)
+
+    for i, node in enumerate(sums):
+        net.outputs[f'd{i}'] = node
+    net.outputs['p'] = carry
+    return net
+
+# Сравнение архитектур: число элементов и глубина критического пути
+def architecture_report(width, kind='add', group=4):
+    report = []
+    for architecture in ARCHITECTURES:
+        net = build_network(width, architecture, kind, group)
+        report.append({'architecture': architecture, 'gates': net.gate_count(), 'depth': net.depth()})
+    return report
+
+# Полная проверка перебором: архитектуры сравниваются со схемой ripple на
+# всех 2^(2·width + 1) наборах. Результат — словарь архитектура -> None или
+# (номер набора, различающиеся выходы)
+def verify_architectures(width, kind='add', group=4):
+    reference = netsim.CompiledNetlist(build_network(width, 'ripple', kind, group))
+    result = {}
+    for architecture in ARCHITECTURES[1:]:
+        compiled = netsim.CompiledNetlist(build_network(width, architecture, kind, group))
+        result[architecture] = netsim.first_difference(reference, compiled)
+    return result
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Одноразрядный сумматор и схемы сложения на его основе")
+    parser.add_argument('--width', type=int, default=8, help="разрядность схем для сравнения")
+    parser.add_argument('--kind', choices=CELL_KINDS, default='add', help="сложение или вычитание")
+    parser.add_argument('--group', type=int, default=4, help="размер группы ускоренного переноса и блока выбора")
+    parser.add_argument('--circ', help="записать схему P и D в файл Logisim")
+    parser.add_argument('--verify', action='store_true', help="проверить схемы полным перебором наборов")
+    args = parser.parse_args(argv)
+
+    var_count = int(math.log2(len(TRUTH_TABLE)))
+
+    P_terms = []
+    D_terms = []
+    for x1, x2, x3, p_out, d_out in TRUTH_TABLE:
+        index = (x1 << 2) | (x2 << 1) | x3
+        if p_out:
+            P_terms.append(index)
+        if d_out:
+            D_terms.append(index)
+
+    table_headers = ["X1", "X2", "X3", "P", "D"]
+    table_data = [[x1, x2, x3, p, d] for x1, x2, x3, p, d in TRUTH_TABLE]
+    print(tabulate(table_data, headers=table_headers, tablefmt="grid"))
+
+    result_P = minimize(P_terms, var_count)
+    result_D = minimize(D_terms, var_count)
+
+    print("\nМинимизированная СКНФ:")
+    print("P  =", result_P)
+    print("D  =", result_D)
+
+    shared_terms, area = minimize_shared([P_terms, D_terms], var_count)
+    print("\nОбщие термы P и D:")
+    for imp, outputs in shared_terms:
+        print(format_impl(imp), "->", ', '.join(['P', 'D'][i] for i in outputs))
+    print("Площадь PLA:", area)
+    if args.circ:
+        terms = [(cubes.parse_cube(imp), sum(1 << i for i in outputs)) for imp, outputs in shared_terms]
+        circ.write_terms(args.circ, VARIABLES, ['P', 'D'], terms)
+        print("Схема записана в", args.circ)
+
+    print(f"\nСхемы на {args.width} разрядов ({args.kind}):")
+    print(tabulate(architecture_report(args.width, args.kind, args.group), headers="keys", tablefmt="grid"))
+    if args.verify:
+        for architecture, difference in verify_architectures(args.width, args.kind, args.group).items():
+            print(f"{architecture}: " + ("совпадает с ripple" if difference is None else f"расхождение {difference}"))
+
+if __name__ == "__main__":
+    main()
@@ -1,46 +1,40 @@
-from typing import List, Set
+import os
+import sys
+from typing import Iterable, Tuple
 
-VARIABLES3 = "abc"
-VARIABLES4 = "abcd"
-VARIABLES_AMOUNT = 3
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from logic import minimizer
+from logic import qmc
 
+# Литерал записывается буквой: строчная — переменная со значением 1,
+# заглавная — 0. Терм — строка литералов, например "aBcd"
 def redactor_str(logic_say: str) -> str:
     final_str = ''
     for i in range(len(logic_say)):
-        if logic_say[i - 1] == '!' and logic_say[i] in VARIABLES4:
+        if logic_say[i - 1] == '!' and logic_say[i].isalpha():
             final_str += logic_say[i].upper()
 
         elif logic_say[i] == '(':
             final_str += ' '
-        elif logic_say[i] in VARIABLES4:
+        elif logic_say[i].isalpha():
             final_str += logic_say[i]
     return final_str.strip()
 
-def vybor_both(first: str, second: str) -> str:
-    for i in range(len(first)):
-        if first[i] != second[i]:
-            return first[:i] + first[i + 1:]
-
-def reverse_letter(letter: str) -> str:
-    return letter.upper() if letter.islower() else letter.lower()
-
-def refractor(logic_s: List) -> Set:
-    result = set()
-    for item in logic_s:
-        variantes = []
-        x = False
-        for i in range(len(item)):
-            letter_new = reverse_letter(item[i])
-            new_item = item
-            new_item = new_item.replace(item[i], letter_new)
-            variantes.append(new_item)
-        for item1 in variantes:
-            if item1 in logic_s:
-                result.add(vybor_both(item,item1))
-                x =True
-        if x == False:
-            result.add(item)
-    return result
+# Терм из букв в куб (value, mask) над переменными letters
+# (первая переменная — старший разряд); отсутствующие буквы — прочерки
+def letters_to_cube(item: str, letters: str) -> Tuple[int, int]:
+    value = mask = 0
+    present = {letter.lower(): letter for letter in item}
+    unknown = sorted(set(present) - set(letters))
+    if unknown:
+        raise ValueError(f"Ошибка: переменные {', '.join(unknown)} терма '{item}' не входят в {letters}")
+    for i, letter in enumerate(letters):
+        bit = 1 << (len(letters) - 1 - i)
+        if letter not in present:
+            mask |= bit
+        elif present[letter].islower():
+            value |= bit
+    return value, mask
 
 def formiration_result_cdnf(logic_s: str) -> str:
     final_result = ''
@@ -51,7 +45,7 @@ def formiration_result_cdnf(logic_s: str) -> str:
             if item1.isupper():
                 result += '!'
                 result += item1.lower()
-            elif item1 in VARIABLES4:
+            elif item1.isalpha():
                 result += item1
             if len(item) - 1  > result.count('&'):
                 result += '&'
@@ -61,8 +55,25 @@ def formiration_result_cdnf(logic_s: str) -> str:
         final_result += result
     return final_result
 
-def minimization_cdnf(logic_s: str) -> None:
-    logic_s = redactor_str(logic_s).split(' ')
-    for _ in range(len(logic_s[0]) - 1):
-        logic_s = refractor(logic_s)
-    print(formiration_result_cdnf(logic_s))
\ No newline at end of file
+# Куб (value, mask) в буквенной записи: строчная буква — 1, заглавная — 0
+def cube_to_letters(cube, letters: str) -> str:
+    value, mask = cube
+    item = ''
+    for i, letter in enumerate(letters):
+        bit = 1 << (len(letters) - 1 - i)
+        if not mask & bit:
+            item += letter if value & bit else letter.upper()
+    return item
+
+# Минимизация через общее ядро logic.minimizer. Строчная буква — переменная
+# со значением 1, заглавная — 0. Переменные — все буквы термов по алфавиту,
+# первая — старший разряд; dont_cares — номера безразличных наборов в этом порядке
+def minimization_cdnf(logic_s: str, dont_cares: Iterable[int] = ()) -> None:
+    logic_s = [item for item in redactor_str(logic_s).split(' ') if item]
+    if not logic_s:
+        print(formiration_result_cdnf([]))
+        return
+    letters = ''.join(sorted({letter.lower() for item in logic_s for letter in item}))
+    on = minimizer.to_bitset(m for item in logic_s for m in qmc.cube_minterms(letters_to_cube(item, letters)))
+    cover = minimizer.minimize(len(letters), on, minimizer.to_bitset(dont_cares))
+    print(formiration_result_cdnf([cube_to_letters(cube, letters) for cube in cover]))
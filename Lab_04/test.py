@@ -0,0 +1,231 @@
+import contextlib
+import importlib
+import io
+import itertools
+import os
+import tempfile
+import unittest
+import random
+import D8421
+import ODS_3
+from D8421 import BCDCodeGenerator
+from ODS_3 import ARCHITECTURES, architecture_report, build_network, cell_equations, cell_truth_table
+from logic import circ
+from logic import netsim
+from logic.minimizer import cover_bitset
+from minim import (
+    redactor_str, letters_to_cube, cube_to_letters, formiration_result_cdnf,
+    minimization_cdnf
+)
+
+
+class TestMinim(unittest.TestCase):
+    def test_redactor_str(self):
+        self.assertEqual(redactor_str('(!a&b&c&!d)|(a&!b&!c&d)'), 'AbcD aBCd')
+        self.assertEqual(redactor_str('(x&!y)'), 'xY')
+
+    def test_letters_to_cube(self):
+        self.assertEqual(letters_to_cube('aBcD', 'abcd'), (0b1010, 0))
+        self.assertEqual(letters_to_cube('bD', 'abcd'), (0b0100, 0b1010))
+        self.assertEqual(cube_to_letters((0b0100, 0b1010), 'abcd'), 'bD')
+        with self.assertRaises(ValueError):
+            letters_to_cube('aE', 'abcd')
+
+    def cdnf(self, logic_s, dont_cares=()):
+        stream = io.StringIO()
+        with contextlib.redirect_stdout(stream):
+            minimization_cdnf(logic_s, dont_cares)
+        return stream.getvalue().strip()
+
+    def test_minimization_cdnf_partial_terms(self):
+        # первый терм не содержит c: переменные берутся из всех термов
+        self.assertEqual(self.cdnf('(a&b)|(a&!b&c)'), '(a&c)|(a&b)')
+        # порядок букв в терме не влияет на порядок переменных
+        self.assertEqual(self.cdnf('(b&a)|(!b&a)'), '(a)')
+        self.assertEqual(self.cdnf('(a&!b)', dont_cares=[3]), '(a)')
+
+    def test_minimization_cdnf_dont_cares(self):
+        # младший разряд D8421 + 5: с безразличными наборами 10–15 остаётся !d
+        terms = '|'.join('(' + '&'.join(('' if m >> (3 - i) & 1 else '!') + letter
+                                          for i, letter in enumerate('abcd')) + ')'
+                         for m in (0, 2, 4, 6, 8))
+        self.assertEqual(self.cdnf(terms, dont_cares=range(10, 16)), '(!d)')
+
+    def test_minimization_cdnf_many_variables(self):
+        rng = random.Random(18)
+        letters = 'abcdefg'
+        on = {m for m in range(1 << 7) if rng.random() < 0.4}
+        terms = '|'.join('(' + '&'.join(('' if m >> (6 - i) & 1 else '!') + letter
+                                          for i, letter in enumerate(letters)) + ')' for m in sorted(on))
+        covered = set()
+        for term in redactor_str(self.cdnf(terms)).split(' '):
+            value, mask = letters_to_cube(term, letters)
+            covered |= {m for m in range(1 << 7) if m & ~mask == value}
+        self.assertEqual(covered, on)
+
+    def test_formiration_result_cdnf(self):
+        self.assertEqual(formiration_result_cdnf(['bD', 'xY']), '(b&!d)|(x&!y)')
+
+
+class TestBCDCodeGenerator(unittest.TestCase):
+    def test_import_is_silent(self):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            importlib.reload(D8421)
+        self.assertEqual(output.getvalue(), '')
+
+    def test_single_digit_plus_five(self):
+        generator = BCDCodeGenerator()
+        self.assertEqual(generator.rows(), [(i, (i + 5) % 10) for i in range(10)])
+        self.assertEqual(generator.dont_cares(), 0b1111110000000000)
+
+    def test_excess_three(self):
+        generator = BCDCodeGenerator(addend=0, excess=3)
+        self.assertEqual([word for _, word in generator.rows()], [i + 3 for i in range(10)])
+
+    def test_multi_digit_carry(self):
+        generator = BCDCodeGenerator(addend=37, digits=2)
+        rows = dict(generator.rows())
+        self.assertEqual(len(rows), 100)
+        for value in (0, 9, 62, 63, 99):
+            code = (value // 10) << 4 | value % 10
+            result = (value + 37) % 100
+            self.assertEqual(rows[code], (result // 10) << 4 | result % 10)
+
+    def test_minimized_outputs_match_table(self):
+        generator = BCDCodeGenerator(addend=7)
+        dc = generator.dont_cares()
+        for on, cover in zip(generator.on_sets(), generator.minimize().values()):
+            self.assertEqual(cover_bitset(cover, 4) & ~dc, on)
+
+    def test_equations_and_shared(self):
+        generator = BCDCodeGenerator()
+        self.assertEqual(generator.equations()['G'], '(!d)')
+        terms, area = generator.shared()
+        self.assertEqual((area['terms'], area['shared_terms'], area['literals']), (9, 1, 24))
+
+    def test_invalid_parameters(self):
+        with self.assertRaises(ValueError):
+            BCDCodeGenerator(digits=0)
+        with self.assertRaises(ValueError):
+            BCDCodeGenerator(excess=7)
+
+    def test_verify_netlist(self):
+        for generator in (BCDCodeGenerator(5), BCDCodeGenerator(37, digits=2, excess=3)):
+            netlist = generator.netlist()
+            self.assertIsNone(generator.verify(netlist))
+            netlist.outputs[generator.outputs[0]] = netlist.outputs[generator.outputs[1]]
+            self.assertIsNotNone(generator.verify(netlist))
+
+    def test_verify_circuit(self):
+        # схема D8421.circ: входы in0[3..0] — a..d, выходы out0[3..0] — S, P, F, G
+        netlist = circ.read_circ(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'D8421.circ'))
+        netlist.inputs = {letter: netlist.inputs[f'in0[{3 - i}]'] for i, letter in enumerate('abcd')}
+        netlist.outputs = {name: netlist.outputs[f'out0[{3 - i}]'] for i, name in enumerate('SPFG')}
+        self.assertIsNone(BCDCodeGenerator(5).verify(netlist))
+        self.assertEqual(BCDCodeGenerator(6).verify(netlist), 0)
+
+
+class TestAdderNetworks(unittest.TestCase):
+    def run_network(self, net, width, x, y, carry):
+        values = {f'x{i}': x >> i & 1 for i in range(width)}
+        values.update({f'y{i}': y >> i & 1 for i in range(width)})
+        values['c0'] = carry
+        outputs = net.evaluate(values)
+        return sum(outputs[f'd{i}'] << i for i in range(width)), outputs['p']
+
+    def test_import_is_silent(self):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            importlib.reload(ODS_3)
+        self.assertEqual(output.getvalue(), '')
+
+    def test_cell_truth_table(self):
+        self.assertEqual(ODS_3.TRUTH_TABLE[3], (0, 1, 1, 1, 0))
+        self.assertEqual(cell_truth_table('sub')[1], (0, 0, 1, 1, 1))
+        self.assertEqual(cell_equations('add')['carry'], ['-11', '1-1', '11-'])
+        self.assertEqual(cell_equations('sub')['carry0'], ['01'])
+
+    def test_networks_exhaustive(self):
+        width = 4
+        for kind in ('add', 'sub'):
+            for architecture in ARCHITECTURES:
+                net = build_network(width, architecture, kind, group=2)
+                for x, y, carry in itertools.product(range(1 << width), range(1 << width), (0, 1)):
+                    result = x + y + carry if kind == 'add' else x - y - carry
+                    expected_carry = result >> width & 1 if kind == 'add' else int(result < 0)
+                    self.assertEqual(self.run_network(net, width, x, y, carry),
+                                     (result % (1 << width), expected_carry))
+
+    def test_architecture_depth(self):
+        report = {row['architecture']: row for row in architecture_report(32)}
+        self.assertLess(report['cla']['depth'], report['select']['depth'])
+        self.assertLess(report['select']['depth'], report['ripple']['depth'])
+        self.assertLess(report['ripple']['gates'], report['cla']['gates'])
+
+    def test_structural_sharing(self):
+        net = ODS_3.Network()
+        a = net.add_input('a')
+        b = net.add_input('b')
+        self.assertEqual(net.and_(a, b), net.and_(b, a))
+        self.assertEqual(net.not_(net.not_(a)), a)
+        self.assertEqual(net.or_(a, net.const(1)), net.const(1))
+        self.assertEqual(net.gate_count(), 2)
+
+    def test_invalid_parameters(self):
+        with self.assertRaises(ValueError):
+            build_network(0)
+        with self.assertRaises(ValueError):
+            build_network(4, 'kogge-stone')
+        with self.assertRaises(ValueError):
+            build_network(4, kind='mul')
+
+    def test_compiled_network(self):
+        net = build_network(3, 'cla', 'sub', group=2)
+        compiled = netsim.CompiledNetlist(net)
+        self.assertEqual(compiled.depth(), net.depth())
+        tables = compiled.truth_tables()
+        names = list(net.inputs)
+        for m in range(1 << len(names)):
+            outputs = net.evaluate({name: m >> (len(names) - 1 - i) & 1 for i, name in enumerate(names)})
+            self.assertEqual({name: tables[name] >> m & 1 for name in outputs}, outputs)
+
+    def test_verify_architectures(self):
+        # 21 вход: полный перебор 2^21 наборов
+        self.assertEqual(ODS_3.verify_architectures(10), {'cla': None, 'select': None})
+        reference = netsim.CompiledNetlist(build_network(4, 'ripple'))
+        broken = build_network(4, 'cla')
+        broken.outputs['p'] = broken.outputs['d3']
+        vector, outputs = netsim.first_difference(reference, netsim.CompiledNetlist(broken))
+        self.assertEqual(outputs, ['p'])
+
+
+class TestCircuits(unittest.TestCase):
+    HERE = os.path.dirname(os.path.abspath(__file__))
+
+    def test_d8421_circuit(self):
+        # схема из Logisim совпадает с генератором D8421 + 5 на допустимых кодах
+        netlist = circ.read_circ(os.path.join(self.HERE, 'D8421.circ'))
+        for code, word in BCDCodeGenerator(5).rows():
+            values = netlist.evaluate({f'in0[{bit}]': code >> bit & 1 for bit in range(4)})
+            self.assertEqual(sum(values[f'out0[{bit}]'] << bit for bit in range(4)), word)
+
+    def test_ods3_circuit(self):
+        # восьмиразрядный сумматор: входы in0[7..0], in1[7..0], перенос in2
+        netlist = circ.read_circ(os.path.join(self.HERE, 'ODS_3.circ'))
+        tables = netlist.truth_tables()
+        for bit in range(8):
+            expected = sum(1 << m for m in range(1 << 17) if ((m >> 9) + (m >> 1 & 255) + (m & 1)) >> bit & 1)
+            self.assertEqual(tables[f'out0[{bit}]'], expected)
+
+    def test_export_cell(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'cell.circ')
+            with contextlib.redirect_stdout(io.StringIO()):
+                ODS_3.main(['--width', '2', '--circ', path])
+            tables = circ.read_circ(path).truth_tables(ODS_3.VARIABLES)
+        self.assertEqual(tables, {'P': 0b11101000, 'D': 0b10010110})
+
+
+if __name__ == '__main__':
+    unittest.main()
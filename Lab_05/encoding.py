@@ -0,0 +1,206 @@
+import concurrent.futures
+import math
+import os
+import random
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from logic import cover_cache
+from logic import cubes
+from logic import espresso
+from logic import minimizer
+from fsm import FSM
+
+STRATEGIES = ('binary', 'gray', 'one-hot', 'anneal')
+
+# До этой разрядности кода функции возбуждения минимизируются точно;
+# у более широких кодов (one-hot) почти все наборы безразличны, и Espresso
+# работает со списками единиц и нулей заданных переходов, не строя множеств
+# по всем 2^width кодам
+EXACT_WIDTH = 8
+
+# Точное покрытие канонической формы функции: (покрытие, точно ли оно).
+# Выполняется в процессе-исполнителе
+def solve_function(task):
+    num_vars, target, dc = task
+    return minimizer.minimize(num_vars, target, dc, return_exact=True)
+
+
+# Стоимость широкого кода по Espresso на списках кубов. Выполняется в
+# процессе-исполнителе
+def espresso_cost(task):
+    coded, width, flip_flop = task
+    machine = FSM(dict(coded), width, flip_flop)
+    return covers_cost([espresso.espresso(on, width, off=off) for on, off in zip(*machine.excitation_cubes())], width)
+
+
+# Стоимость кода: (литералы, термы) покрытий всех функций возбуждения
+def covers_cost(covers, width):
+    literals = terms = 0
+    for cover in covers:
+        count, literal_total = cubes.cost(cover, width)
+        terms += count
+        literals += literal_total
+    return literals, terms
+
+
+def binary_encoding(states):
+    return {state: i for i, state in enumerate(states)}
+
+
+# Соседние в списке состояния получают соседние коды
+def gray_encoding(states):
+    return {state: i ^ (i >> 1) for i, state in enumerate(states)}
+
+
+def one_hot_encoding(states):
+    return {state: 1 << i for i, state in enumerate(states)}
+
+
+# Подбор кодов состояний автомата. transitions — словарь состояние ->
+# следующее состояние с произвольными метками; порядок states задаёт
+# двоичный код и код Грея (по умолчанию — обход от первого состояния)
+class EncodingOptimizer:
+    def __init__(self, transitions, flip_flop='T', states=None, width=None, workers=1, cache_path=None, seed=0):
+        self.transitions = dict(transitions)
+        self.states = list(states) if states is not None else self._walk()
+        if set(self.states) != set(self.transitions) | set(self.transitions.values()):
+            raise ValueError("Ошибка: список состояний не совпадает с таблицей переходов")
+        self.flip_flop = flip_flop
+        self.width = max(1, (len(self.states) - 1).bit_length(), width or 0)
+        self.workers = workers
+        # Кэш покрытий живёт только в этом процессе: коды, отличающиеся
+        # перестановкой и инверсией разрядов, дают функции с одним
+        # каноническим ключом, а исполнители лишь решают промахи
+        self.cache = cover_cache.CoverCache(maxsize=4096, path=cache_path)
+        self.seed = seed
+        self.costs = {}
+        self._pool = None
+
+    # Состояния в порядке обхода переходов; недостижимые — в конце
+    def _walk(self):
+        order = []
+        for start in self.transitions:
+            state = start
+            while state not in order:
+                order.append(state)
+                state = self.transitions.get(state, start)
+        for state in self.transitions.values():
+            if state not in order:
+                order.append(state)
+        return order
+
+    # Ключ кода: закодированные переходы и разрядность
+    def _key(self, encoding):
+        if len(set(encoding.values())) != len(encoding):
+            raise ValueError("Ошибка: разные состояния получили одинаковый код")
+        width = max(self.width, max(encoding.values()).bit_length())
+        coded = tuple(sorted((encoding[state], encoding[nxt]) for state, nxt in self.transitions.items()))
+        return coded, width
+
+    def _map(self, function, tasks):
+        if self._pool is not None:
+            return list(self._pool.map(function, tasks))
+        if self.workers == 1 or len(tasks) < 2:
+            return list(map(function, tasks))
+        with concurrent.futures.ProcessPoolExecutor(self.workers) as pool:
+            return list(pool.map(function, tasks))
+
+    # Стоимости кодов; уже оценённые коды берутся из словаря costs. Функции
+    # возбуждения узких кодов ищутся в кэше, промахи решаются в пуле процессов
+    # и записываются в кэш отсюда; широкие коды целиком считаются в пуле
+    def evaluate(self, encodings):
+        keys = [self._key(encoding) for encoding in encodings]
+        missing = list(dict.fromkeys(key for key in keys if key not in self.costs))
+        wide = [key for key in missing if key[1] > EXACT_WIDTH]
+        tasks = [(coded, width, self.flip_flop) for coded, width in wide]
+        self.costs.update(zip(wide, self._map(espresso_cost, tasks)))
+        lookups = {}
+        pending = {}
+        for key in missing:
+            coded, width = key
+            if width > EXACT_WIDTH:
+                continue
+            machine = FSM(dict(coded), width, self.flip_flop)
+            lookups[key] = [self.cache.lookup(width, on, dc) for on, dc in zip(*machine.excitation_sets())]
+            for cover, task in lookups[key]:
+                if cover is None:
+                    pending.setdefault(task[0], task)
+        solved = dict(zip(pending, self._map(solve_function, [task[1:4] for task in pending.values()])))
+        stored = set()
+        for key, functions in lookups.items():
+            covers = []
+            for cover, task in functions:
+                if cover is None:
+                    # каноническое покрытие пишется в кэш один раз, но
+                    # восстанавливается для каждой функции по её перестановке
+                    canon, exact = solved[task[0]]
+                    cover = self.cache.store(task, canon, exact and task[0] not in stored)
+                    stored.add(task[0])
+                covers.append(cover)
+            self.costs[key] = covers_cost(covers, key[1])
+        return [self.costs[key] for key in keys]
+
+    # Отжиг по кодам ширины width: ход — обмен кодов двух состояний или
+    # перенос состояния на свободный код; за шаг оценивается batch соседей
+    def anneal(self, start, steps=40, batch=8, temperature=2.0, cooling=0.9):
+        rng = random.Random(self.seed)
+        codes = list(range(1 << self.width))
+        current = dict(start)
+        current_cost = self.evaluate([current])[0]
+        best, best_cost = current, current_cost
+        for _ in range(steps):
+            neighbours = []
+            for _ in range(batch):
+                candidate = dict(current)
+                a = rng.choice(self.states)
+                free = sorted(set(codes) - set(candidate.values()))
+                if free and rng.random() < 0.5:
+                    candidate[a] = rng.choice(free)
+                else:
+                    b = rng.choice(self.states)
+                    candidate[a], candidate[b] = candidate[b], candidate[a]
+                neighbours.append(candidate)
+            candidate_cost, candidate = min(zip(self.evaluate(neighbours), neighbours),
+                                            key=lambda pair: pair[0])
+            delta = candidate_cost[0] - current_cost[0]
+            if delta <= 0 or rng.random() < math.exp(-delta / temperature):
+                current, current_cost = candidate, candidate_cost
+            if current_cost < best_cost:
+                best, best_cost = current, current_cost
+            temperature = max(temperature * cooling, 1e-3)
+        return best
+
+    def encoding(self, strategy):
+        if strategy == 'binary':
+            return binary_encoding(self.states)
+        if strategy == 'gray':
+            return gray_encoding(self.states)
+        if strategy == 'one-hot':
+            return one_hot_encoding(self.states)
+        if strategy == 'anneal':
+            starts = [binary_encoding(self.states), gray_encoding(self.states)]
+            costs = self.evaluate(starts)
+            return self.anneal(starts[costs.index(min(costs))])
+        raise ValueError(f"Ошибка: неизвестная стратегия кодирования '{strategy}'")
+
+    # Отчёт по стратегиям: список (стратегия, код, (литералы, термы)),
+    # лучший код — первый
+    def optimize(self, strategies=STRATEGIES):
+        if self.workers != 1 and self._pool is None:
+            # один пул на весь поиск: процессы живут до конца
+            with concurrent.futures.ProcessPoolExecutor(self.workers) as self._pool:
+                try:
+                    return self.optimize(strategies)
+                finally:
+                    self._pool = None
+        report = []
+        for strategy in strategies:
+            encoding = self.encoding(strategy)
+            report.append((strategy, encoding, self.evaluate([encoding])[0]))
+        return sorted(report, key=lambda row: row[2])
+
+    # Автомат с выбранными кодами
+    def machine(self, encoding):
+        coded, width = self._key(encoding)
+        return FSM(dict(coded), width, self.flip_flop)
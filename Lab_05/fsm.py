@@ -0,0 +1,150 @@
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from logic import cubes
+from logic import multi_output
+
+# До этой разрядности функции возбуждения строятся битовыми множествами по
+# всем 2^width кодам; у более широких автоматов (например, one-hot) — списками
+# кубов заданных переходов, а неиспользуемые коды безразличны неявно
+SET_WIDTH = 16
+
+# Входы триггеров каждого типа
+FLIP_FLOPS = {'T': 'T', 'D': 'D', 'JK': 'JK', 'SR': 'SR'}
+
+# Значения входов триггера для перехода q -> q_next ('-' — безразлично)
+EXCITATION = {
+    'T': {(0, 0): '0', (0, 1): '1', (1, 0): '1', (1, 1): '0'},
+    'D': {(0, 0): '0', (0, 1): '1', (1, 0): '0', (1, 1): '1'},
+    'JK': {(0, 0): '0-', (0, 1): '1-', (1, 0): '-1', (1, 1): '-0'},
+    'SR': {(0, 0): '0-', (0, 1): '10', (1, 0): '01', (1, 1): '-0'},
+}
+
+
+# Переходы счётчика по модулю modulus с шагом step (step=-1 — вычитающий)
+def counter_transitions(modulus, step=1):
+    if modulus < 2:
+        raise ValueError("Ошибка: модуль счёта должен быть не меньше 2")
+    return {state: (state + step) % modulus for state in range(modulus)}
+
+
+# Переходы по циклической последовательности состояний
+def sequence_transitions(sequence):
+    sequence = list(sequence)
+    if len(set(sequence)) != len(sequence):
+        raise ValueError("Ошибка: состояния последовательности повторяются")
+    return {state: sequence[(i + 1) % len(sequence)] for i, state in enumerate(sequence)}
+
+
+# Куб (value, mask) в выражение над переменными names (первая — старший разряд)
+def cube_to_expr(cube, names):
+    value, mask = cube
+    literals = []
+    for i, name in enumerate(names):
+        bit = 1 << (len(names) - 1 - i)
+        if not mask & bit:
+            literals.append(name if value & bit else f'!{name}')
+    return ' & '.join(literals) or '1'
+
+
+# Синхронный автомат без входов: transitions — словарь состояние -> следующее
+# состояние (целые числа, разряд i — триггер Qi). Состояния, не вошедшие в
+# таблицу, безразличны для всех функций возбуждения
+class FSM:
+    def __init__(self, transitions, width=None, flip_flop='T'):
+        if flip_flop not in FLIP_FLOPS:
+            raise ValueError(f"Ошибка: неизвестный тип триггера '{flip_flop}'")
+        self.transitions = dict(transitions)
+        if not self.transitions:
+            raise ValueError("Ошибка: пустая таблица переходов")
+        needed = max(max(self.transitions), max(self.transitions.values())).bit_length() or 1
+        self.width = width if width is not None else needed
+        if self.width < needed or min(min(self.transitions), min(self.transitions.values())) < 0:
+            raise ValueError(f"Ошибка: состояния не помещаются в {self.width} разрядов")
+        self.flip_flop = flip_flop
+        self.states = [f'Q{i}' for i in range(self.width - 1, -1, -1)]
+        self.inputs = [f'{letter}{i}' for i in range(self.width - 1, -1, -1) for letter in FLIP_FLOPS[flip_flop]]
+        self._sets = None
+        self._terms = None
+
+    # Значения входов триггеров на одном переходе в порядке self.inputs
+    def excitation(self, state, next_state):
+        values = ''
+        for i in range(self.width - 1, -1, -1):
+            values += EXCITATION[self.flip_flop][(state >> i & 1, next_state >> i & 1)]
+        return values
+
+    # Строки таблицы возбуждения: {'Q2': '1', ..., 'T2': '0', ...}
+    def excitation_table(self):
+        table = []
+        for state in sorted(self.transitions):
+            row = dict(zip(self.states, format(state, f'0{self.width}b')))
+            row.update(zip(self.inputs, self.excitation(state, self.transitions[state])))
+            table.append(row)
+        return table
+
+    # Битовые множества единиц и безразличных наборов каждого входа
+    def excitation_sets(self):
+        if self.width > SET_WIDTH:
+            raise ValueError(f"Ошибка: множества наборов строятся не более чем для {SET_WIDTH} разрядов")
+        if self._sets is None:
+            on_sets = [0] * len(self.inputs)
+            dc_sets = [0] * len(self.inputs)
+            unused = (1 << (1 << self.width)) - 1
+            for state, next_state in self.transitions.items():
+                bit = 1 << state
+                unused &= ~bit
+                for k, value in enumerate(self.excitation(state, next_state)):
+                    if value == '1':
+                        on_sets[k] |= bit
+                    elif value == '-':
+                        dc_sets[k] |= bit
+            self._sets = on_sets, [dc | unused for dc in dc_sets]
+        return self._sets
+
+    # Кубы-наборы единиц и нулей каждого входа; остальные коды безразличны
+    def excitation_cubes(self):
+        on_covers = [[] for _ in self.inputs]
+        off_covers = [[] for _ in self.inputs]
+        for state, next_state in sorted(self.transitions.items()):
+            for k, value in enumerate(self.excitation(state, next_state)):
+                if value == '1':
+                    on_covers[k].append((state, 0))
+                elif value == '0':
+                    off_covers[k].append((state, 0))
+        return on_covers, off_covers
+
+    # Совместная минимизация всех функций возбуждения: термы (куб, маска входов).
+    # Минимальны они только при width <= multi_output.EXACT_LIMIT (10 разрядов),
+    # для более широких автоматов это эвристика Espresso по каждой функции
+    def minimize(self):
+        if self._terms is None:
+            if self.width > SET_WIDTH:
+                self._terms = multi_output.minimize_cubes(self.width, *self.excitation_cubes())
+            else:
+                on_sets, dc_sets = self.excitation_sets()
+                self._terms = multi_output.minimize(self.width, on_sets, dc_sets)
+        return self._terms
+
+    def expressions(self):
+        terms = self.minimize()
+        expressions = {}
+        for k, name in enumerate(self.inputs):
+            used = [cube_to_expr(cube, self.states) for cube, mask in terms if mask >> k & 1]
+            expressions[name] = ' | '.join(used) if used else '0'
+        return expressions
+
+    def area(self):
+        return multi_output.pla_area(self.minimize(), self.width, len(self.inputs))
+
+    # Проверка: на каждом заданном переходе минимизированные функции дают
+    # значения, совместимые с таблицей возбуждения
+    def verify(self):
+        terms = self.minimize()
+        for state, next_state in self.transitions.items():
+            for k, value in enumerate(self.excitation(state, next_state)):
+                actual = any(mask >> k & 1 and cubes.contains(cube, (state, 0)) for cube, mask in terms)
+                if value != '-' and actual != (value == '1'):
+                    return False
+        return True
@@ -1,100 +1,154 @@
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from logic import circ
+from logic import cubes
+from logic import minimizer
+from logic import multi_output
+from encoding import STRATEGIES, EncodingOptimizer
+from fsm import FLIP_FLOPS, counter_transitions
+from simulator import MAX_WIDTH, CounterSimulator
+
+
 def bin_str(n, width=3):
     return format(n, f'0{width}b')
 
 def xor(a, b):
     return '1' if a != b else '0'
 
-def build_transition_table():
-    transitions = []
-    for state in range(8):
-        curr = bin_str((7 - state) % 8)  # Счёт от 7 до 0
-        next_ = bin_str((7 - state - 1) % 8)
-        transitions.append((curr, next_))
-    return transitions
+# Вычитающий счётчик на width разрядов: счёт от 2^width - 1 до 0
+def build_transition_table(width=3):
+    modulus = 1 << width
+    transitions = counter_transitions(modulus, -1)
+    return [(bin_str(state, width), bin_str(transitions[state], width))
+            for state in range(modulus - 1, -1, -1)]
+
+# Перекодирование переходов: encoding — словарь номер состояния -> код
+def encode_transitions(transitions, encoding, width=None):
+    width = width or max(max(encoding.values()).bit_length(), len(transitions[0][0]))
+    return [(bin_str(encoding[int(current, 2)], width), bin_str(encoding[int(nxt, 2)], width))
+            for current, nxt in transitions]
 
 def build_T_table(transitions):
     table = []
     for current, nxt in transitions:
-        T2 = xor(current[0], nxt[0])
-        T1 = xor(current[1], nxt[1])
-        T0 = xor(current[2], nxt[2])
-        table.append({
-            'Q2': current[0], 'Q1': current[1], 'Q0': current[2],
-            'T2': T2, 'T1': T1, 'T0': T0
-        })
+        width = len(current)
+        row = {}
+        for i in range(width):
+            row[f'Q{width - 1 - i}'] = current[i]
+        for i in range(width):
+            row[f'T{width - 1 - i}'] = xor(current[i], nxt[i])
+        table.append(row)
     return table
 
+# Переменные состояния строки таблицы: Q(n-1), ..., Q0
+def state_keys(row):
+    return sorted((key for key in row if key.startswith('Q')), key=lambda key: -int(key[1:]))
+
 def minterm_to_expr(minterm):
-    vars = ['Q2', 'Q1', 'Q0']
+    vars = [f'Q{i}' for i in range(len(minterm) - 1, -1, -1)]
     return ' & '.join([
         f'{"" if bit == "1" else "!"}{var}'
         for var, bit in zip(vars, minterm)
         if bit != '-'
     ])
 
-def combine_terms(term1, term2):
-    diff = 0
-    combined = ''
-    for a, b in zip(term1, term2):
-        if a != b:
-            diff += 1
-            combined += '-'
-        else:
-            combined += a
-    return combined if diff == 1 else None
-
-def minimize_sdnf(minterms):
-    groups = {}
-    for m in minterms:
-        ones = m.count('1')
-        groups.setdefault(ones, []).append(m)
-
-    prime_implicants = set()
-    used = set()
-
-    for i in range(3):
-        for a in groups.get(i, []):
-            for b in groups.get(i+1, []):
-                c = combine_terms(a, b)
-                if c:
-                    used.update([a, b])
-                    prime_implicants.add(c)
-
-    for m in minterms:
-        if m not in used:
-            prime_implicants.add(m)
-
-    return [minterm_to_expr(p) for p in sorted(prime_implicants)]
-
+# Минимизация через общее ядро logic.minimizer; наборы — строки из 0 и 1,
+# dont_cares — наборы, на которых значение функции безразлично
+def minimize_sdnf(minterms, dont_cares=()):
+    if not minterms:
+        return []
+    width = len(minterms[0])
+    on = minimizer.to_bitset(int(m, 2) for m in minterms)
+    dc = minimizer.to_bitset(int(m, 2) for m in dont_cares)
+    cover = minimizer.minimize(width, on, dc)
+    # куб без литералов (функция тождественно равна 1) записывается как 1
+    return [minterm_to_expr(cubes.format_cube(cube, width)) or '1' for cube in cover]
+
+# Строки со значением '-' в столбце T_key — безразличные наборы
 def generate_minimized_expr(table, T_key):
     minterms = []
+    dont_cares = []
     for row in table:
+        state = ''.join(row[key] for key in state_keys(row))
         if row[T_key] == '1':
-            minterms.append(row['Q2'] + row['Q1'] + row['Q0'])
-    minimized_terms = minimize_sdnf(minterms)
+            minterms.append(state)
+        elif row[T_key] == '-':
+            dont_cares.append(state)
+    minimized_terms = minimize_sdnf(minterms, dont_cares)
     return ' | '.join(minimized_terms) if minimized_terms else '0'
 
-def hardcoded_minimized_expressions():
-    return {
-        "T2": "!Q1 & !Q0",
-        "T1": "Q0 & !Q1 | !Q2 & !Q1",
-        "T0": "!Q0 | Q1"
-    }
-
-
-def main():
-    transitions = build_transition_table()
-    table = build_T_table(transitions)
+# Совместная минимизация нескольких функций возбуждения: общие термы
+# считаются один раз. Возвращает выражения по ключам и отчёт о площади PLA
+def generate_shared_expressions(table, keys):
+    width = len(state_keys(table[0]))
+    states = [int(''.join(row[key] for key in state_keys(row)), 2) for row in table]
+    on_sets = []
+    dc_sets = []
+    for key in keys:
+        on_sets.append(minimizer.to_bitset(state for state, row in zip(states, table) if row[key] == '1'))
+        dc_sets.append(minimizer.to_bitset(state for state, row in zip(states, table) if row[key] == '-'))
+    terms = multi_output.minimize(width, on_sets, dc_sets)
+    expressions = {}
+    for i, key in enumerate(keys):
+        used = [minterm_to_expr(cubes.format_cube(cube, width)) or '1' for cube, mask in terms if mask >> i & 1]
+        expressions[key] = ' | '.join(used) if used else '0'
+    return expressions, multi_output.pla_area(terms, width, len(keys))
+
+# Счётчик по модулю modulus с шагом step на триггерах flip_flop
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Синтез синхронного счётчика")
+    parser.add_argument('--width', type=int, default=3, help="число триггеров")
+    parser.add_argument('--modulus', type=int, default=None, help="модуль счёта (по умолчанию 2^width)")
+    parser.add_argument('--step', type=int, default=-1, help="шаг счёта (-1 — вычитающий счётчик)")
+    parser.add_argument('--flip-flop', choices=sorted(FLIP_FLOPS), default='T', help="тип триггеров")
+    parser.add_argument('--encoding', choices=STRATEGIES + ('best',), default='binary',
+                        help="кодирование состояний (best — лучшее из всех)")
+    parser.add_argument('--workers', type=int, default=1, help="число процессов для перебора кодов")
+    parser.add_argument('--cycles', type=int, default=1000, help="число тактов проверочного моделирования")
+    parser.add_argument('--circ', help="записать схему возбуждения триггеров в файл Logisim")
+    args = parser.parse_args(argv)
+
+    modulus = args.modulus or 1 << args.width
+    optimizer = EncodingOptimizer(counter_transitions(modulus, args.step), args.flip_flop,
+                                  states=range(modulus), width=args.width, workers=args.workers)
+    report = optimizer.optimize(STRATEGIES if args.encoding == 'best' else [args.encoding])
+    if args.encoding == 'best':
+        print("Кодирование состояний (литералы, термы):")
+        for strategy, _, cost in report:
+            print(f"{strategy}: {cost}")
+    encoding = report[0][1]
+    machine = optimizer.machine(encoding)
+    if args.encoding != 'binary':
+        print("Коды состояний:", ', '.join(f"{state} -> {bin_str(code, machine.width)}"
+                                           for state, code in sorted(encoding.items())))
 
     print("Таблица истинности:")
-    print("Q2 Q1 Q0 | T2 T1 T0")
-    for row in table:
-        print(f"{row['Q2']}  {row['Q1']}  {row['Q0']}  | {row['T2']}  {row['T1']}  {row['T0']}")
+    print(' '.join(machine.states) + " | " + ' '.join(machine.inputs))
+    # строки идут в направлении счёта
+    rows = {int(''.join(row[q] for q in machine.states), 2): row for row in machine.excitation_table()}
+    for state in sorted(encoding, reverse=args.step < 0):
+        row = rows[encoding[state]]
+        print('  '.join(row[q] for q in machine.states) + "  | " + '  '.join(row[name] for name in machine.inputs))
 
     print("\nМинимизированные выражения:")
-    for T in ['T2', 'T1', 'T0']:
-        expr = hardcoded_minimized_expressions()[T]
-        print(f"{T} = {expr}")
+    for name, expr in machine.expressions().items():
+        print(f"{name} = {expr}")
+    print("Площадь PLA:", machine.area())
+
+    if args.cycles and machine.width <= MAX_WIDTH:
+        simulator = CounterSimulator.from_machine(machine)
+        divergence = simulator.run(args.cycles)
+        if divergence is None:
+            print(f"Моделирование: {simulator.lanes} счётчиков, {args.cycles} тактов — расхождений нет")
+        else:
+            print("Моделирование: первое расхождение", divergence)
+
+    if args.circ:
+        circ.write_terms(args.circ, machine.states, machine.inputs, machine.minimize())
+        print("Схема записана в", args.circ)
 
 
 if __name__ == "__main__":
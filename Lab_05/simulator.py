@@ -0,0 +1,202 @@
+import numpy as np
+
+from fsm import FLIP_FLOPS
+
+# Наибольшая разрядность, для которой строится таблица эталонных переходов
+MAX_WIDTH = 20
+
+# Число экземпляров по умолчанию (1024 слова на разряд). Такт — около сотни
+# вызовов numpy, и на коротких массивах время уходит на их накладные расходы:
+# у 16-разрядного счётчика по модулю 1000 при 4096 экземплярах 10^6 тактов
+# занимают около 90 с (~4·10^7 экземпляро-тактов в секунду), при 65536 —
+# около 200 с, но в 16 раз больше экземпляров (~3·10^8 в секунду)
+LANES = 1 << 16
+
+# Обновление состояния триггера: q — текущее значение, остальное — входы
+UPDATE = {
+    'T': '{q} ^ {T}',
+    'D': '{D}',
+    'JK': '({J} & ~{q}) | (~{K} & {q})',
+    'SR': '{S} | (~{R} & {q})',
+}
+
+
+# Выражение вида "!Q1 & Q0 | Q2" в список кубов (value, mask) над Q(width-1)..Q0
+def parse_sop(expr, width):
+    full = (1 << width) - 1
+    expr = expr.strip()
+    if expr == '0':
+        return []
+    cover = []
+    for term in expr.split('|'):
+        value, fixed = 0, 0
+        for literal in term.split('&'):
+            literal = literal.strip()
+            if literal == '1':
+                continue
+            name = literal.lstrip('!')
+            if not name.startswith('Q') or not name[1:].isdigit() or int(name[1:]) >= width:
+                raise ValueError(f"Ошибка: неизвестная переменная '{name}'")
+            bit = 1 << int(name[1:])
+            fixed |= bit
+            if not literal.startswith('!'):
+                value |= bit
+        cover.append((value, full & ~fixed))
+    return cover
+
+
+# Побитово-параллельное моделирование счётчика: каждый разряд слова uint64 —
+# отдельный экземпляр автомата. equations — словарь вход триггера (T2, J0, ...)
+# -> кубы (value, mask), разряд i куба — переменная Qi. transitions — эталонные
+# переходы; экземпляры стартуют из всех заданных состояний по кругу
+class CounterSimulator:
+    def __init__(self, equations, width, flip_flop, transitions, lanes=LANES):
+        if flip_flop not in FLIP_FLOPS:
+            raise ValueError(f"Ошибка: неизвестный тип триггера '{flip_flop}'")
+        if not 1 <= width <= MAX_WIDTH:
+            raise ValueError(f"Ошибка: разрядность должна быть от 1 до {MAX_WIDTH}")
+        if lanes < 1 or lanes % 64:
+            raise ValueError("Ошибка: число экземпляров должно быть кратно 64")
+        self.width = width
+        self.flip_flop = flip_flop
+        self.lanes = lanes
+        self.transitions = dict(transitions)
+        self.source = self._generate(equations)
+        namespace = {}
+        exec(compile(self.source, '<counter>', 'exec'), namespace)
+        self._step = namespace['step']
+
+        # эталон: таблица следующих состояний; индекс 2^width — «не определено»
+        undefined = 1 << width
+        self._lut = np.full(undefined + 1, undefined, dtype=np.int64)
+        for state, nxt in self.transitions.items():
+            if not 0 <= state < undefined or not 0 <= nxt < undefined:
+                raise ValueError(f"Ошибка: переход {state} -> {nxt} вне {width} разрядов")
+            self._lut[state] = nxt
+        self._undefined = undefined
+        self._jumps = {}
+        self._bad = None
+        states = np.array(sorted(self.transitions), dtype=np.int64)
+        self.starts = states[np.arange(lanes) % len(states)]
+
+    @classmethod
+    def from_machine(cls, machine, lanes=LANES):
+        equations = {name: [] for name in machine.inputs}
+        for cube, mask in machine.minimize():
+            for k, name in enumerate(machine.inputs):
+                if mask >> k & 1:
+                    equations[name].append(cube)
+        return cls(equations, machine.width, machine.flip_flop, machine.transitions, lanes)
+
+    # Проверка выражений, записанных строками (например, выписанных вручную)
+    @classmethod
+    def from_expressions(cls, expressions, width, flip_flop, transitions, lanes=LANES):
+        equations = {name: parse_sop(expr, width) for name, expr in expressions.items()}
+        return cls(equations, width, flip_flop, transitions, lanes)
+
+    # Исходный текст функции такта: общие термы вычисляются один раз,
+    # инверсии переменных — тоже
+    def _generate(self, equations):
+        lines = ['def step(q, ones):']
+        for i in range(self.width):
+            lines.append(f'    n{i} = ~q[{i}]')
+        terms = {}
+        for cover in equations.values():
+            for cube in cover:
+                if cube not in terms:
+                    value, mask = cube
+                    literals = [f'q[{i}]' if value >> i & 1 else f'n{i}'
+                                for i in range(self.width) if not mask >> i & 1]
+                    terms[cube] = f't{len(terms)}'
+                    lines.append(f"    {terms[cube]} = {' & '.join(literals) or 'ones'}")
+        names = {}
+        for i in range(self.width):
+            for letter in FLIP_FLOPS[self.flip_flop]:
+                name = f'{letter}{i}'
+                if name not in equations:
+                    raise ValueError(f"Ошибка: нет уравнения для входа {name}")
+                names[name] = f'x_{name}'
+                used = [terms[cube] for cube in equations[name]]
+                lines.append(f"    {names[name]} = {' | '.join(used) or 'ones ^ ones'}")
+        updates = []
+        for i in range(self.width):
+            inputs = {letter: names[f'{letter}{i}'] for letter in FLIP_FLOPS[self.flip_flop]}
+            updates.append(UPDATE[self.flip_flop].format(q=f'q[{i}]', **inputs))
+        lines.append(f"    return [{', '.join(updates)}]")
+        return '\n'.join(lines) + '\n'
+
+    def _pack(self, states):
+        return [np.packbits((states >> i & 1).astype(bool), bitorder='little').view('<u8')
+                for i in range(self.width)]
+
+    def _unpack(self, planes):
+        states = np.zeros(len(planes[0]) * 64, dtype=np.int64)
+        for i, plane in enumerate(planes):
+            states |= np.unpackbits(plane.view(np.uint8), bitorder='little').astype(np.int64) << i
+        return states
+
+    # Состояния, из которых сгенерированная функция такта уходит не туда,
+    # куда ведёт эталон: один такт по всем 2^width состояниям сразу
+    def _faulty(self):
+        if self._bad is None:
+            states = np.arange(max(64, self._undefined), dtype=np.int64) % self._undefined
+            ones = np.full(len(states) // 64, np.uint64(0xFFFFFFFFFFFFFFFF))
+            actual = self._unpack(self._step(self._pack(states), ones))[:self._undefined]
+            expected = self._lut[:self._undefined]
+            self._bad = np.zeros(self._undefined + 1, dtype=bool)
+            self._bad[:self._undefined] = (expected != self._undefined) & (actual != expected)
+        return self._bad
+
+    # Переходы через steps тактов и признак того, что за эти такты эталонная
+    # траектория проходит через ошибочное состояние (удвоением шага)
+    def _jump(self, steps):
+        if steps not in self._jumps:
+            result = np.arange(len(self._lut))
+            hits = np.zeros(len(self._lut), dtype=bool)
+            lut, bad = self._lut, self._faulty()
+            power = steps
+            while power:
+                if power & 1:
+                    hits |= bad[result]
+                    result = lut[result]
+                bad = bad | bad[lut]
+                lut = lut[lut]
+                power >>= 1
+            self._jumps[steps] = result, hits
+        return self._jumps[steps]
+
+    def _mismatch(self, planes, expected):
+        actual = self._unpack(planes)
+        wrong = (expected != self._undefined) & (actual != expected)
+        return actual, np.flatnonzero(wrong)
+
+    # cycles тактов; состояния сверяются с эталоном раз в check_every тактов.
+    # Траектория может разойтись с эталоном и снова сойтись до проверки,
+    # поэтому участок повторяется с проверкой каждого такта и тогда, когда
+    # эталонная траектория какого-то экземпляра проходит через ошибочное
+    # состояние. Результат — None или первое расхождение: такт, экземпляр,
+    # начальное, ожидаемое и полученное состояния
+    def run(self, cycles, check_every=64):
+        ones = np.full(self.lanes // 64, np.uint64(0xFFFFFFFFFFFFFFFF))
+        planes = self._pack(self.starts)
+        expected = self.starts.copy()
+        done = 0
+        while done < cycles:
+            steps = min(check_every, cycles - done)
+            saved = planes
+            for _ in range(steps):
+                planes = self._step(planes, ones)
+            target, hits = self._jump(steps)
+            if hits[expected].any() or len(self._mismatch(planes, target[expected])[1]):
+                replay, state = saved, expected
+                for cycle in range(done + 1, done + steps + 1):
+                    replay = self._step(replay, ones)
+                    state = self._lut[state]
+                    actual, wrong = self._mismatch(replay, state)
+                    if len(wrong):
+                        lane = int(wrong[0])
+                        return {'cycle': cycle, 'lane': lane, 'start': int(self.starts[lane]),
+                                'expected': int(state[lane]), 'actual': int(actual[lane])}
+            expected = target[expected]
+            done += steps
+        return None
@@ -0,0 +1,259 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+from encoding import EncodingOptimizer, binary_encoding, gray_encoding, one_hot_encoding
+from logic import circ
+from fsm import FSM, counter_transitions, sequence_transitions
+from simulator import LANES, CounterSimulator, parse_sop
+from main import (
+    build_transition_table, build_T_table, encode_transitions, minimize_sdnf, generate_minimized_expr,
+    generate_shared_expressions, main
+)
+
+
+class TestCounter(unittest.TestCase):
+    def test_transition_table(self):
+        transitions = build_transition_table()
+        self.assertEqual(transitions[0], ('111', '110'))
+        self.assertEqual(transitions[-1], ('000', '111'))
+
+    def test_minimized_expressions(self):
+        table = build_T_table(build_transition_table())
+        self.assertEqual(generate_minimized_expr(table, 'T2'), '!Q1 & !Q0')
+        self.assertEqual(generate_minimized_expr(table, 'T1'), '!Q0')
+        self.assertEqual(generate_minimized_expr(table, 'T0'), '1')
+
+    def test_minimize_sdnf_dont_cares(self):
+        self.assertEqual(minimize_sdnf(['000', '001']), ['!Q2 & !Q1'])
+        self.assertEqual(minimize_sdnf(['000', '010'], ['100', '110']), ['!Q0'])
+        self.assertEqual(minimize_sdnf([]), [])
+
+    def test_generate_minimized_expr_dont_cares(self):
+        table = [
+            {'Q2': '0', 'Q1': '0', 'Q0': '0', 'T0': '1'},
+            {'Q2': '0', 'Q1': '0', 'Q0': '1', 'T0': '-'},
+            {'Q2': '0', 'Q1': '1', 'Q0': '0', 'T0': '0'},
+        ]
+        self.assertEqual(generate_minimized_expr(table, 'T0'), '!Q2 & !Q1')
+
+    def test_generate_shared_expressions(self):
+        table = build_T_table(build_transition_table())
+        expressions, area = generate_shared_expressions(table, ['T2', 'T1', 'T0'])
+        self.assertEqual(expressions, {'T2': '!Q1 & !Q0', 'T1': '!Q0', 'T0': '1'})
+        self.assertEqual(area['terms'], 3)
+        self.assertEqual(area['literals'], 3)
+
+    def test_generate_shared_expressions_common_term(self):
+        # оба выхода используют набор 000, а второй ещё и 001: терм !Q2 & !Q1 & !Q0 общий
+        table = [
+            {'Q2': '0', 'Q1': '0', 'Q0': '0', 'A': '1', 'B': '1'},
+            {'Q2': '1', 'Q1': '1', 'Q0': '1', 'A': '1', 'B': '0'},
+            {'Q2': '0', 'Q1': '1', 'Q0': '1', 'A': '0', 'B': '1'},
+        ]
+        expressions, area = generate_shared_expressions(table, ['A', 'B'])
+        self.assertEqual(expressions, {'A': '!Q2 & !Q1 & !Q0 | Q2 & Q1 & Q0', 'B': '!Q2 & !Q1 & !Q0 | !Q2 & Q1 & Q0'})
+        self.assertEqual(area['shared_terms'], 1)
+        self.assertEqual(area['terms'], 3)
+
+
+class TestFSM(unittest.TestCase):
+    def test_down_counter_matches_table(self):
+        machine = FSM(counter_transitions(8, -1), flip_flop='T')
+        self.assertEqual(machine.expressions(), {'T2': '!Q1 & !Q0', 'T1': '!Q0', 'T0': '1'})
+        self.assertEqual(build_transition_table(4)[0], ('1111', '1110'))
+        self.assertEqual(len(build_T_table(build_transition_table(4))), 16)
+
+    def test_flip_flop_types(self):
+        for flip_flop in ('T', 'D', 'JK', 'SR'):
+            for transitions in (counter_transitions(10), counter_transitions(6, -1),
+                                sequence_transitions([0, 3, 5, 6, 1])):
+                machine = FSM(transitions, flip_flop=flip_flop)
+                self.assertTrue(machine.verify(), flip_flop)
+
+    def test_excitation(self):
+        self.assertEqual(FSM({0: 1, 1: 0}, flip_flop='JK').excitation(0, 1), '1-')
+        self.assertEqual(FSM({0: 1, 1: 0}, flip_flop='SR').excitation(1, 0), '01')
+        self.assertEqual(FSM({0: 1, 1: 0}, width=2, flip_flop='D').inputs, ['D1', 'D0'])
+
+    def test_mod_ten_dont_cares(self):
+        # состояния 10–15 не используются: J3 не зависит от Q3
+        machine = FSM(counter_transitions(10), width=4, flip_flop='JK')
+        self.assertEqual(machine.expressions()['J3'], 'Q2 & Q1 & Q0')
+        self.assertEqual(machine.area()['shared_terms'], 3)
+
+    def test_wide_counter(self):
+        width = 16
+        machine = FSM(counter_transitions(1 << width), flip_flop='T')
+        expressions = machine.expressions()
+        self.assertEqual(expressions['T0'], '1')
+        self.assertEqual(expressions['T15'], ' & '.join(f'Q{i}' for i in range(14, -1, -1)))
+        self.assertEqual(machine.area()['terms'], width)
+
+    def test_invalid_machines(self):
+        with self.assertRaises(ValueError):
+            FSM({0: 1}, flip_flop='XY')
+        with self.assertRaises(ValueError):
+            FSM({0: 4}, width=2)
+        with self.assertRaises(ValueError):
+            sequence_transitions([1, 2, 1])
+        with self.assertRaises(ValueError):
+            counter_transitions(1)
+
+    def test_main_prints_computed_expressions(self):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            main([])
+        self.assertIn("T1 = !Q0", output.getvalue())
+
+
+class TestEncoding(unittest.TestCase):
+    def test_basic_encodings(self):
+        states = ['a', 'b', 'c', 'd']
+        self.assertEqual(binary_encoding(states), {'a': 0, 'b': 1, 'c': 2, 'd': 3})
+        self.assertEqual(gray_encoding(states), {'a': 0, 'b': 1, 'c': 3, 'd': 2})
+        self.assertEqual(one_hot_encoding(states)['d'], 0b1000)
+
+    def test_encode_transitions(self):
+        transitions = encode_transitions(build_transition_table(2), gray_encoding(range(4)))
+        self.assertEqual(transitions, [('10', '11'), ('11', '01'), ('01', '00'), ('00', '10')])
+        table = build_T_table(transitions)
+        self.assertEqual(sum(row[key] == '1' for row in table for key in ('T1', 'T0')), 4)
+
+    def test_gray_counter_is_cheaper(self):
+        optimizer = EncodingOptimizer(counter_transitions(8), 'T', states=range(8))
+        binary, gray = optimizer.evaluate([optimizer.encoding('binary'), optimizer.encoding('gray')])
+        self.assertEqual(binary, (3, 3))
+        self.assertGreater(gray, binary)
+
+    def test_optimize_picks_best(self):
+        optimizer = EncodingOptimizer(sequence_transitions(['s0', 's3', 's5', 's6', 's1']), 'D')
+        report = optimizer.optimize()
+        self.assertEqual([row[2] for row in report], sorted(row[2] for row in report))
+        strategy, encoding, cost = report[0]
+        self.assertLessEqual(cost, optimizer.evaluate([optimizer.encoding('binary')])[0])
+        self.assertTrue(optimizer.machine(encoding).verify())
+
+    def test_cache_hits_on_equivalent_codes(self):
+        optimizer = EncodingOptimizer(counter_transitions(6), 'JK', states=range(6))
+        optimizer.evaluate([binary_encoding(range(6))])
+        hits = optimizer.cache.hits
+        # инверсия всех разрядов кода даёт те же функции с точностью до инверсии переменных
+        optimizer.evaluate([{state: state ^ 0b111 for state in range(6)}])
+        self.assertGreater(optimizer.cache.hits, hits)
+
+    def test_process_pool(self):
+        transitions = counter_transitions(10)
+        serial = EncodingOptimizer(transitions, 'T', states=range(10)).optimize()
+        parallel = EncodingOptimizer(transitions, 'T', states=range(10), workers=2).optimize()
+        self.assertEqual([row[2] for row in serial], [row[2] for row in parallel])
+
+    def test_persistent_cache_with_process_pool(self):
+        # база покрытий пишется только родительским процессом
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'covers.sqlite')
+            transitions = counter_transitions(10)
+            first = EncodingOptimizer(transitions, 'T', states=range(10), workers=2, cache_path=path).optimize()
+            second = EncodingOptimizer(transitions, 'T', states=range(10), workers=2, cache_path=path)
+            self.assertEqual([row[2] for row in first], [row[2] for row in second.optimize()])
+            self.assertEqual(second.cache.misses, 0)
+
+    def test_best_encoding_five_bits(self):
+        # one-hot даёт 32 разряда: множества по 2^32 наборам не строятся
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            main(['--width', '5', '--encoding', 'best', '--workers', '1', '--cycles', '0'])
+        self.assertIn("one-hot:", output.getvalue())
+        machine = FSM({1 << i: 1 << (i + 1) % 32 for i in range(32)}, 32, 'JK')
+        self.assertTrue(machine.verify())
+        with self.assertRaises(ValueError):
+            machine.excitation_sets()
+
+    def test_invalid_encoding(self):
+        optimizer = EncodingOptimizer({0: 1, 1: 0})
+        with self.assertRaises(ValueError):
+            optimizer.evaluate([{0: 1, 1: 1}])
+        with self.assertRaises(ValueError):
+            optimizer.encoding('random')
+        with self.assertRaises(ValueError):
+            EncodingOptimizer({0: 1, 1: 0}, states=[0, 1, 2])
+
+
+class TestSimulator(unittest.TestCase):
+    def test_synthesized_counters_match(self):
+        for flip_flop in ('T', 'D', 'JK', 'SR'):
+            for transitions in (counter_transitions(8, -1), counter_transitions(10),
+                                sequence_transitions([0, 3, 5, 6, 1])):
+                simulator = CounterSimulator.from_machine(FSM(transitions, flip_flop=flip_flop), lanes=128)
+                self.assertIsNone(simulator.run(500), flip_flop)
+
+    def test_old_hardcoded_expressions_diverge(self):
+        expressions = {"T2": "!Q1 & !Q0", "T1": "Q0 & !Q1 | !Q2 & !Q1", "T0": "!Q0 | Q1"}
+        simulator = CounterSimulator.from_expressions(expressions, 3, 'T', counter_transitions(8, -1), lanes=64)
+        divergence = simulator.run(1000)
+        self.assertEqual(divergence, {'cycle': 1, 'lane': 1, 'start': 1, 'expected': 0, 'actual': 3})
+        self.assertEqual(simulator.run(1000, check_every=1), divergence)
+
+    def test_late_divergence(self):
+        # T2 переключается не на 011 -> 100, а только на 111 -> 000: счётчик из
+        # состояния 0 ошибается на четвёртом такте
+        expressions = {"T2": "Q1 & Q0 & Q2", "T1": "Q0", "T0": "1"}
+        transitions = {0: 1, 1: 2, 2: 3, 3: 4, 4: 5, 5: 6, 6: 7, 7: 0}
+        simulator = CounterSimulator.from_expressions(expressions, 3, 'T', {0: 1, 1: 2, 2: 3, 3: 4}, lanes=64)
+        self.assertEqual(simulator.run(100)['cycle'], 1)
+        simulator = CounterSimulator.from_expressions(expressions, 3, 'T', transitions, lanes=64)
+        simulator.starts[:] = 0
+        self.assertEqual(simulator.run(100), {'cycle': 4, 'lane': 0, 'start': 0, 'expected': 4, 'actual': 0})
+
+    def test_default_lanes_scale(self):
+        # 16-разрядный счётчик по модулю 1000: 1000 тактов по LANES экземплярам —
+        # 6.5·10^7 экземпляро-тактов, около 0.2 с на моделирование
+        simulator = CounterSimulator.from_machine(FSM(counter_transitions(1000), 16, 'T'))
+        self.assertEqual(simulator.lanes, LANES)
+        self.assertIsNone(simulator.run(1000))
+
+    def test_parse_sop(self):
+        self.assertEqual(parse_sop('!Q1 & Q0 | Q2', 3), [(0b001, 0b100), (0b100, 0b011)])
+        self.assertEqual(parse_sop('1', 2), [(0, 0b11)])
+        self.assertEqual(parse_sop('0', 2), [])
+        with self.assertRaises(ValueError):
+            parse_sop('X1', 2)
+
+    def test_invalid_simulator(self):
+        with self.assertRaises(ValueError):
+            CounterSimulator({'T0': []}, 1, 'T', {0: 1, 1: 0}, lanes=100)
+        with self.assertRaises(ValueError):
+            CounterSimulator({'T1': []}, 1, 'T', {0: 1, 1: 0})
+
+
+class TestCircuit(unittest.TestCase):
+    def test_hand_made_counter(self):
+        # триггеры h3, h2, h1 схемы — Q2, Q1, Q0 вычитающего счётчика
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'vichitator_rez.circ')
+        netlist = circ.read_circ(path)
+        machine = FSM(counter_transitions(8, -1), 3, 'T')
+        tables = netlist.truth_tables(['in0', 'h3', 'h2', 'h1'])
+        on_sets, _ = machine.excitation_sets()
+        for name, on in zip(['h3.T', 'h2.T'], on_sets):
+            # вход in0 (старший разряд набора) подан только на T младшего триггера
+            self.assertEqual(tables[name] & 0xFF, on)
+            self.assertEqual(tables[name] >> 8, on)
+        self.assertEqual(tables['h1.T'], 0xFF00)
+
+    def test_export(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'counter.circ')
+            with contextlib.redirect_stdout(io.StringIO()):
+                main(['--flip-flop', 'JK', '--cycles', '0', '--circ', path])
+            netlist = circ.read_circ(path)
+        machine = FSM(counter_transitions(8, -1), 3, 'JK')
+        self.assertEqual(list(netlist.outputs), machine.inputs)
+        covers = {name: [cube for cube, mask in machine.minimize() if mask >> k & 1]
+                  for k, name in enumerate(machine.inputs)}
+        self.assertEqual(circ.mismatched_outputs(netlist, machine.states, covers), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,580 @@
+# Чтение и запись схем Logisim (.circ).
+# Запись потоковая: элементы выводятся в поток по мере размещения, дерево
+# документа не строится. Схема по термам (куб, маска выходов) двухуровневая:
+# вертикальные шины входов и их инверсий, элемент И на каждый терм, элемент
+# ИЛИ на каждый выход. Кубы — (value, mask), первый вход — старший разряд.
+# Чтение через iterparse: каждый разобранный элемент сразу удаляется из
+# дерева, в памяти остаются только точки проводов и список компонентов.
+# Из схемы извлекается граф вентилей (Netlist); триггеры разрезаются:
+# выход Q становится входом графа, информационный вход — его выходом
+
+import xml.etree.ElementTree as ET
+from xml.sax.saxutils import quoteattr
+
+from logic import cover_cache
+from logic import minimizer
+
+# Наибольшее число входов элемента в Logisim
+MAX_GATE_INPUTS = 32
+
+# Наибольшее число входов графа, для которого строятся таблицы истинности
+TRUTH_TABLE_LIMIT = 24
+
+HEADER = """<?xml version="1.0" encoding="UTF-8" standalone="no"?>
+<project source="2.7.1" version="1.0">
+This file is intended to be loaded by Logisim (http://www.cburch.com/logisim/).
+  <lib desc="#Wiring" name="0"/>
+  <lib desc="#Gates" name="1"/>
+  <main name={name}/>
+  <options>
+    <a name="gateUndefined" val="ignore"/>
+    <a name="simlimit" val="1000"/>
+    <a name="simrand" val="0"/>
+  </options>
+  <circuit name={name}>
+    <a name="circuit" val={name}/>
+"""
+
+FOOTER = """  </circuit>
+</project>
+"""
+
+# Элементы библиотеки Gates: операция, инверсия выхода, добавка к длине
+GATES = {
+    'AND Gate': ('and', False, 0),
+    'OR Gate': ('or', False, 0),
+    'XOR Gate': ('xor', False, 10),
+    'NAND Gate': ('and', True, 10),
+    'NOR Gate': ('or', True, 10),
+    'XNOR Gate': ('xor', True, 20),
+}
+SIZES = {'narrow': 30, 'medium': 50, 'wide': 70}
+FLIP_FLOPS = {'T Flip-Flop': 'T', 'D Flip-Flop': 'D'}
+# Компоненты, не влияющие на логику схемы
+PASSIVE = {'Probe', 'Text', 'Clock'}
+
+
+# Смещения входов элемента И/ИЛИ поперёк его оси (правило Logisim)
+def input_offsets(count, size=50):
+    if count <= 3:
+        if size < 40:
+            start, dist, lower = -5, 10, 10
+        elif size < 60 or count <= 2:
+            start, dist, lower = -10, 20, 20
+        else:
+            start, dist, lower = -15, 30, 30
+    elif count == 4 and size >= 60:
+        start, dist, lower = -5, 20, 0
+    else:
+        start, dist, lower = -5, 10, 10
+    if count % 2:
+        return [start * (count - 1) + dist * i for i in range(count)]
+    return [start * count + dist * i + (lower if i >= count // 2 else 0) for i in range(count)]
+
+
+def _point(text):
+    x, y = text.strip('()').split(',')
+    return int(x), int(y)
+
+
+def _format_point(point):
+    return f'({point[0]},{point[1]})'
+
+
+# Потоковая запись схемы: компоненты и провода пишутся сразу в stream
+class CircWriter:
+    def __init__(self, stream, name='main'):
+        self.stream = stream
+        self.name = name
+
+    def __enter__(self):
+        self.stream.write(HEADER.format(name=quoteattr(self.name)))
+        return self
+
+    def __exit__(self, *exc):
+        self.stream.write(FOOTER)
+        return False
+
+    def component(self, lib, name, loc, attrs=None):
+        head = f'    <comp lib="{lib}" loc="{_format_point(loc)}" name={quoteattr(name)}'
+        if not attrs:
+            self.stream.write(head + '/>\n')
+            return
+        self.stream.write(head + '>\n')
+        for key, value in attrs.items():
+            self.stream.write(f'      <a name={quoteattr(key)} val={quoteattr(str(value))}/>\n')
+        self.stream.write('    </comp>\n')
+
+    def wire(self, a, b):
+        if a != b:
+            self.stream.write(f'    <wire from="{_format_point(a)}" to="{_format_point(b)}"/>\n')
+
+
+# Элемент ИЛИ (лицом вниз) с count входами правее x: центр, смещения входов
+# и следующая свободная позиция
+def _place(x, count):
+    offsets = input_offsets(count) if count > 1 else [0]
+    half = 30 if count > 1 else 0
+    cx = x + max(-min(offsets), half)
+    return cx, offsets, cx + max(max(offsets), half) + 40
+
+
+# Размещение двухуровневой схемы. Провода Logisim соединяются только концами,
+# поэтому шины и линии термов режутся в точках отводов, а каждая строка
+# отводов принадлежит одному литералу
+def _write_terms(writer, inputs, outputs, terms):
+    n = len(inputs)
+    if n > MAX_GATE_INPUTS:
+        raise ValueError(f"Ошибка: больше {MAX_GATE_INPUTS} входов")
+    rails = {}
+    for i in range(n):
+        rails[i, 1] = 100 + 40 * i
+        rails[i, 0] = 120 + 40 * i
+    port_x = 100 + 40 * n
+    and_x = port_x + 50
+
+    # строки термов: литералы (вход, значение) и их смещения на входах И
+    rows = []
+    y = 150
+    for cube, _ in terms:
+        value, mask = cube
+        literals = [(i, value >> (n - 1 - i) & 1) for i in range(n) if not mask >> (n - 1 - i) & 1]
+        offsets = input_offsets(len(literals)) if len(literals) > 1 else [0]
+        y -= min(offsets)
+        rows.append((y, literals, offsets))
+        y += max(offsets) + 30
+
+    # столбцы плоскости ИЛИ: входы элемента ИЛИ выхода k лежат на его
+    # столбцах. Выход, у которого термов больше MAX_GATE_INPUTS, собирается
+    # из нескольких элементов ИЛИ и общего элемента под ними
+    columns = {}
+    plane = []
+    x = and_x + 40
+    for k in range(len(outputs)):
+        used = [t for t, (_, mask) in enumerate(terms) if mask >> k & 1]
+        chunks = [used[i:i + MAX_GATE_INPUTS] for i in range(0, len(used), MAX_GATE_INPUTS)] or [[]]
+        if len(chunks) > MAX_GATE_INPUTS:
+            raise ValueError(f"Ошибка: у выхода больше {MAX_GATE_INPUTS ** 2} термов")
+        gates = []
+        for chunk in chunks:
+            cx, offsets, x = _place(x, len(chunk))
+            for t, dy in zip(chunk, offsets):
+                columns.setdefault(t, []).append(cx + dy)
+            gates.append((cx, len(chunk)))
+        final = _place(x, len(chunks)) if len(chunks) > 1 else None
+        if final:
+            x = final[2]
+        plane.append((gates, final))
+    or_port_y = y + 10
+    or_y = or_port_y + 50
+    # у элемента с одним термом столбец идёт прямо к его выходу
+    direct = {cx for gates, _ in plane for cx, count in gates if count == 1}
+
+    for i, name in enumerate(inputs):
+        writer.component(0, 'Pin', (rails[i, 1], 40), {'facing': 'south', 'label': name, 'labelloc': 'north'})
+    last = {}
+    for i in range(n):
+        last[i, 1] = 40
+        if any((i, 0) in literals for _, literals, _ in rows):
+            writer.wire((rails[i, 1], 40), (rails[i, 1], 60))
+            writer.wire((rails[i, 1], 60), (rails[i, 0], 60))
+            writer.component(1, 'NOT Gate', (rails[i, 0], 90), {'facing': 'south', 'size': 30})
+            last[i, 1] = 60
+            last[i, 0] = 90
+
+    for t, (y, literals, offsets) in enumerate(rows):
+        for (i, bit), dy in zip(literals, offsets):
+            rail = rails[i, bit]
+            writer.wire((rail, last[i, bit]), (rail, y + dy))
+            last[i, bit] = y + dy
+            writer.wire((rail, y + dy), (port_x if len(literals) > 1 else and_x, y + dy))
+        if len(literals) > 1:
+            writer.component(1, 'AND Gate', (and_x, y), {'size': 50, 'inputs': len(literals)})
+        elif not literals:
+            writer.component(0, 'Constant', (and_x, y), {'value': '0x1'})
+        start = and_x
+        for column in sorted(columns.get(t, ())):
+            writer.wire((start, y), (column, y))
+            writer.wire((column, y), (column, or_y if column in direct else or_port_y))
+            start = column
+
+    for (gates, final), name in zip(plane, outputs):
+        for cx, count in gates:
+            if count > 1:
+                writer.component(1, 'OR Gate', (cx, or_y), {'facing': 'south', 'size': 50, 'inputs': count})
+            elif count == 0:
+                writer.component(0, 'Constant', (cx, or_y), {'facing': 'south', 'value': '0x0'})
+        out = (gates[0][0], or_y)
+        if final:
+            fx, offsets, _ = final
+            port_y = or_y + 30 + 10 * len(gates)
+            for j, ((cx, _), dy) in enumerate(zip(gates, offsets)):
+                row = or_y + 20 + 10 * j
+                writer.wire((cx, or_y), (cx, row))
+                writer.wire((cx, row), (fx + dy, row))
+                writer.wire((fx + dy, row), (fx + dy, port_y))
+            out = (fx, port_y + 50)
+            writer.component(1, 'OR Gate', out, {'facing': 'south', 'size': 50, 'inputs': len(gates)})
+        writer.wire(out, (out[0], out[1] + 30))
+        writer.component(0, 'Pin', (out[0], out[1] + 30),
+                         {'facing': 'north', 'output': 'true', 'label': name, 'labelloc': 'south'})
+
+
+# Запись термов (куб, маска выходов) в файл или поток
+def write_terms(target, inputs, outputs, terms, name='main'):
+    if hasattr(target, 'write'):
+        with CircWriter(target, name) as writer:
+            _write_terms(writer, list(inputs), list(outputs), list(terms))
+        return
+    with open(target, 'w', encoding='utf-8') as stream:
+        write_terms(stream, inputs, outputs, terms, name)
+
+
+# Отдельные покрытия выходов (словарь имя -> кубы); одинаковые кубы разных
+# выходов становятся одним термом
+def write_covers(target, inputs, covers, name='main'):
+    terms = {}
+    for k, cover in enumerate(covers.values()):
+        for cube in cover:
+            terms[cube] = terms.get(cube, 0) | 1 << k
+    write_terms(target, inputs, list(covers), sorted(terms.items()), name)
+
+
+# Граф вентилей: узел — (операция, аргументы), аргументы ссылаются только на
+# предыдущие узлы. Операции: input (имя), const (0 или 1), not, and, or, xor
+class Netlist:
+    def __init__(self):
+        self.nodes = []
+        self.inputs = {}
+        self.outputs = {}
+        self._ids = {}
+
+    def add(self, op, *args):
+        if op in ('and', 'or', 'xor'):
+            args = tuple(sorted(args))
+            if len(args) == 1:
+                return args[0]
+        if op == 'not' and self.nodes[args[0]][0] == 'not':
+            return self.nodes[args[0]][1][0]
+        key = (op, args)
+        if key not in self._ids:
+            self._ids[key] = len(self.nodes)
+            self.nodes.append(key)
+            if op == 'input':
+                self.inputs[args[0]] = self._ids[key]
+        return self._ids[key]
+
+    # Двухуровневый граф по термам (куб, маска выходов), как у write_terms
+    @classmethod
+    def from_terms(cls, inputs, outputs, terms):
+        netlist = cls()
+        signals = [netlist.add('input', name) for name in inputs]
+        n = len(signals)
+        products = []
+        for (value, mask), _ in terms:
+            literals = [signal if value >> (n - 1 - i) & 1 else netlist.add('not', signal)
+                        for i, signal in enumerate(signals) if not mask >> (n - 1 - i) & 1]
+            products.append(netlist.add('and', *literals) if literals else netlist.add('const', 1))
+        for k, name in enumerate(outputs):
+            used = [product for product, (_, mask) in zip(products, terms) if mask >> k & 1]
+            netlist.outputs[name] = netlist.add('or', *used) if used else netlist.add('const', 0)
+        return netlist
+
+    def gate_count(self):
+        return sum(1 for op, _ in self.nodes if op not in ('input', 'const'))
+
+    # Значения всех узлов; columns — значения входов (целые, full — маска)
+    def _run(self, columns, full):
+        values = []
+        for op, args in self.nodes:
+            if op == 'input':
+                values.append(columns[args[0]])
+            elif op == 'const':
+                values.append(full if args[0] else 0)
+            elif op == 'not':
+                values.append(full & ~values[args[0]])
+            else:
+                value = values[args[0]]
+                for arg in args[1:]:
+                    if op == 'and':
+                        value &= values[arg]
+                    elif op == 'or':
+                        value |= values[arg]
+                    else:
+                        value ^= values[arg]
+                values.append(value)
+        return values
+
+    def evaluate(self, values):
+        missing = set(self.inputs) - set(values)
+        if missing:
+            raise ValueError(f"Ошибка: не заданы входы {', '.join(sorted(missing))}")
+        result = self._run({name: 1 if values[name] else 0 for name in self.inputs}, 1)
+        return {name: result[node] for name, node in self.outputs.items()}
+
+    # Таблицы истинности выходов как битовые множества наборов; inputs задаёт
+    # порядок переменных (первая — старший разряд номера набора)
+    def truth_tables(self, inputs=None):
+        inputs = list(self.inputs) if inputs is None else list(inputs)
+        if set(self.inputs) - set(inputs):
+            raise ValueError(f"Ошибка: не заданы входы {', '.join(sorted(set(self.inputs) - set(inputs)))}")
+        n = len(inputs)
+        if n > TRUTH_TABLE_LIMIT:
+            raise ValueError(f"Ошибка: больше {TRUTH_TABLE_LIMIT} входов")
+        columns = {name: cover_cache.ones_mask(n, n - 1 - i) for i, name in enumerate(inputs)}
+        values = self._run(columns, (1 << (1 << n)) - 1)
+        return {name: values[node] for name, node in self.outputs.items()}
+
+
+# Разбор точек и компонентов одной схемы файла. Элементы удаляются из дерева
+# сразу после обработки; атрибуты <a> собираются в словарь компонента
+def _scan(path, circuit=None):
+    parent = []
+    points = {}
+    components = []
+    legacy = True
+    stack = []
+    attrs = None
+    active = False
+
+    def find(p):
+        while parent[p] != p:
+            parent[p] = parent[parent[p]]
+            p = parent[p]
+        return p
+
+    # точка хранится одним целым, а не кортежем
+    def point_id(point):
+        key = (point[0] << 32) + point[1]
+        if key not in points:
+            points[key] = len(parent)
+            parent.append(len(parent))
+        return points[key]
+
+    for event, elem in ET.iterparse(path, events=('start', 'end')):
+        if event == 'start':
+            if elem.tag == 'project':
+                version = tuple(int(part) for part in elem.get('source', '2.7.1').split('.')[:2] if part.isdigit())
+                legacy = version <= (2, 7)
+            elif elem.tag == 'main' and circuit is None:
+                circuit = elem.get('name')
+            elif elem.tag == 'circuit':
+                active = elem.get('name') == circuit
+            elif elem.tag == 'comp':
+                attrs = {}
+            stack.append(elem)
+            continue
+        stack.pop()
+        if active and elem.tag == 'a' and stack and stack[-1].tag == 'comp':
+            attrs[elem.get('name')] = elem.get('val')
+        elif active and elem.tag == 'wire':
+            a, b = point_id(_point(elem.get('from'))), point_id(_point(elem.get('to')))
+            parent[find(a)] = find(b)
+        elif active and elem.tag == 'comp':
+            components.append((elem.get('name'), _point(elem.get('loc')), attrs))
+        elif elem.tag == 'circuit':
+            active = False
+        if stack:
+            stack[-1].remove(elem)
+    if circuit is None:
+        raise ValueError("Ошибка: в файле нет схемы")
+
+    def group(point):
+        return find(point_id(point))
+    return components, group, legacy
+
+
+def _facing_offset(facing, back, side):
+    if facing == 'west':
+        return back, side
+    if facing == 'north':
+        return side, back
+    if facing == 'south':
+        return side, -back
+    return -back, side
+
+
+# Концы разветвителя: смещения от точки общего конца (правило Logisim)
+def _splitter_ends(attrs):
+    fanout = int(attrs.get('fanout', 2))
+    facing = attrs.get('facing', 'east')
+    justify = {'left': -1, 'center': 0, 'right': 1}.get(attrs.get('appear', 'left'))
+    if justify is None:
+        raise ValueError("Ошибка: вид разветвителя 'legacy' не поддерживается")
+    if facing in ('east', 'west'):
+        m = -1 if facing == 'west' else 1
+        dy0 = -10 * (fanout // 2) if justify == 0 else (10 if m * justify > 0 else -10 * fanout)
+        return [(m * 20, dy0 + 10 * j) for j in range(fanout)]
+    m = 1 if facing == 'north' else -1
+    dx0 = 10 * ((fanout + 1) // 2 - 1) if justify == 0 else (-10 if m * justify < 0 else 10 * fanout)
+    return [(dx0 - 10 * j, -m * 20) for j in range(fanout)]
+
+
+def _gate_size(attrs, default):
+    size = attrs.get('size', default)
+    return SIZES[size] if size in SIZES else int(size)
+
+
+# Граф вентилей схемы circuit (по умолчанию — главной) из файла path.
+# Безымянные контакты называются in0, in1, ... и out0, ... сверху вниз;
+# разряд b многоразрядного контакта name — name[b]
+def read_circ(path, circuit=None):
+    components, group, legacy = _scan(path, circuit)
+
+    nets = {}
+
+    def net(point, bit):
+        key = (group(point), bit)
+        while nets.get(key, key) != key:
+            key = nets[key]
+        return key
+
+    def join(a, b):
+        a, b = net(*a), net(*b)
+        if a != b:
+            nets[a] = b
+
+    drivers = {}
+
+    def drive(key, source):
+        key = net(*key)
+        if key in drivers:
+            raise ValueError(f"Ошибка: у цепи в точке {_format_point(source[-1])} несколько источников")
+        drivers[key] = source
+
+    # сначала соединения разрядов (разветвители, туннели), затем источники
+    tunnels = {}
+    for name, loc, attrs in components:
+        x, y = loc
+        width = int(attrs.get('width', 1))
+        if name == 'Tunnel':
+            label = attrs.get('label', '')
+            if label in tunnels:
+                for bit in range(width):
+                    join((loc, bit), (tunnels[label], bit))
+            else:
+                tunnels[label] = loc
+        elif name == 'Splitter':
+            incoming = int(attrs.get('incoming', 2))
+            fanout = int(attrs.get('fanout', 2))
+            ends = _splitter_ends(attrs)
+            filled = [0] * fanout
+            for bit in range(incoming):
+                end = attrs.get(f'bit{bit}', str(bit * fanout // incoming))
+                if end == 'none':
+                    continue
+                end = int(end)
+                dx, dy = ends[end]
+                join((loc, bit), ((x + dx, y + dy), filled[end]))
+                filled[end] += 1
+
+    pins = {'in': [], 'out': []}
+    gates = []
+    flip_flops = []
+    for name, loc, attrs in components:
+        x, y = loc
+        width = int(attrs.get('width', 1))
+        facing = attrs.get('facing', 'east')
+        if name == 'Pin':
+            pins['out' if attrs.get('output') == 'true' else 'in'].append((loc, width, attrs.get('label', '')))
+        elif name == 'Constant':
+            value = int(attrs.get('value', '0x1'), 16)
+            for bit in range(width):
+                drive((loc, bit), ('const', value >> bit & 1, loc))
+        elif name in GATES or name in ('NOT Gate', 'Buffer'):
+            if name in GATES:
+                op, negate, bonus = GATES[name]
+                size = _gate_size(attrs, 50)
+                count = int(attrs.get('inputs', 5 if legacy else 2))
+                ports = [_facing_offset(facing, size + bonus, dy) for dy in input_offsets(count, size)]
+            else:
+                op, negate = 'buf', name == 'NOT Gate'
+                ports = [_facing_offset(facing, _gate_size(attrs, 30), 0)]
+            inverted = [attrs.get(f'negate{i}') == 'true' for i in range(len(ports))]
+            for bit in range(width):
+                drive((loc, bit), ('gate', len(gates), loc))
+                gates.append((op, negate, [((x + dx, y + dy), bit, inv) for (dx, dy), inv in zip(ports, inverted)]))
+        elif name in FLIP_FLOPS:
+            if legacy or facing != 'east':
+                raise ValueError(f"Ошибка: триггер '{name}' поддерживается только в схемах Logisim-evolution")
+            label = attrs.get('label') or f'ff{len(flip_flops)}'
+            drive(((x + 50, y + 10), 0), ('input', label, loc))
+            drive(((x + 50, y + 50), 0), ('inverted', label, loc))
+            flip_flops.append((label, f'{label}.{FLIP_FLOPS[name]}', (x - 10, y + 10)))
+        elif name not in PASSIVE and name not in ('Splitter', 'Tunnel'):
+            raise ValueError(f"Ошибка: компонент '{name}' не поддерживается")
+
+    # входы графа: контакты сверху вниз (старший разряд первым), затем триггеры
+    netlist = Netlist()
+    outputs = []
+    for kind in ('in', 'out'):
+        for number, (loc, width, label) in enumerate(sorted(pins[kind], key=lambda pin: (pin[0][1], pin[0][0]))):
+            label = label or f'{kind}{number}'
+            for bit in range(width - 1, -1, -1):
+                name = f'{label}[{bit}]' if width > 1 else label
+                if kind == 'in':
+                    drive((loc, bit), ('input', name, loc))
+                    netlist.add('input', name)
+                else:
+                    outputs.append((name, (loc, bit)))
+    for label, name, point in flip_flops:
+        netlist.add('input', label)
+        outputs.append((name, (point, 0)))
+
+    # узлы создаются обходом в глубину от выходов: аргументы раньше вентиля
+    done = {}
+
+    def resolve(key):
+        stack = [key]
+        visiting = set()
+        while stack:
+            key = stack[-1]
+            if key in done:
+                stack.pop()
+                continue
+            source = drivers.get(key)
+            if source is None:
+                done[key] = None
+                stack.pop()
+                continue
+            if source[0] == 'input':
+                done[key] = netlist.add('input', source[1])
+            elif source[0] == 'inverted':
+                done[key] = netlist.add('not', netlist.add('input', source[1]))
+            elif source[0] == 'const':
+                done[key] = netlist.add('const', source[1])
+            else:
+                op, negate, ports = gates[source[1]]
+                args = [net(point, bit) for point, bit, _ in ports]
+                pending = [arg for arg in args if arg not in done]
+                if pending:
+                    if key in visiting:
+                        raise ValueError(f"Ошибка: комбинационная петля через элемент в точке {_format_point(source[2])}")
+                    visiting.add(key)
+                    stack.extend(pending)
+                    continue
+                values = []
+                for arg, (_, _, inverted) in zip(args, ports):
+                    if done[arg] is not None:
+                        values.append(netlist.add('not', done[arg]) if inverted else done[arg])
+                if not values:
+                    raise ValueError(f"Ошибка: у элемента в точке {_format_point(source[2])} не подключены входы")
+                node = values[0] if op == 'buf' else netlist.add(op, *values)
+                done[key] = netlist.add('not', node) if negate else node
+            stack.pop()
+        return done[key]
+
+    for label, (point, bit) in outputs:
+        node = resolve(net(point, bit))
+        if node is None:
+            raise ValueError(f"Ошибка: выход '{label}' ни к чему не подключён")
+        netlist.outputs[label] = node
+    return netlist
+
+
+# Сравнение графа с покрытиями: словарь выход -> кубы над inputs.
+# Возвращает список выходов, на которых функции различаются
+def mismatched_outputs(netlist, inputs, covers):
+    tables = netlist.truth_tables(inputs)
+    return [name for name, cover in covers.items()
+            if tables.get(name) != minimizer.cover_bitset(cover, len(inputs))]
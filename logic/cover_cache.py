@@ -0,0 +1,225 @@
+# Кэш минимальных покрытий. Ключ — каноническая форма задачи (target, dc)
+# относительно перестановок и инверсий переменных; инверсия выхода учтена
+# тем, что ДНФ функции и КНФ её отрицания покрывают одно и то же множество.
+# Функция всегда минимизируется в канонических координатах, поэтому результат
+# не зависит от того, было ли покрытие уже в кэше.
+# Каноническая форма строится по сигнатурам переменных (числу единиц в
+# кофакторах); при равных сигнатурах перебираются все варианты, если их не
+# больше MAX_CANDIDATES, иначе берётся первый — кэш остаётся корректным,
+# но эквивалентные функции могут попасть в разные ключи
+
+import collections
+import functools
+import itertools
+import sqlite3
+
+from logic import minimizer
+from logic import qmc
+
+MAX_CANDIDATES = 1024
+
+
+# Наборы, в которых разряд bit равен единице, как битовое множество
+@functools.lru_cache(maxsize=None)
+def ones_mask(num_vars, bit):
+    block = ((1 << (1 << bit)) - 1) << (1 << bit)
+    mask = 0
+    for start in range(0, 1 << num_vars, 2 << bit):
+        mask |= block << start
+    return mask
+
+
+# Инверсия переменной в разряде bit: набор m переходит в m ^ (1 << bit)
+def flip(bits, num_vars, bit):
+    high = ones_mask(num_vars, bit)
+    shift = 1 << bit
+    return ((bits & high) >> shift) | ((bits & ~high) << shift) & high
+
+
+# Обмен переменных в разрядах a < b
+def swap(bits, num_vars, a, b):
+    moved = ones_mask(num_vars, a) & ~ones_mask(num_vars, b)
+    shift = (1 << b) - (1 << a)
+    return (bits & ~(moved | moved << shift)) | ((bits & moved) << shift) | ((bits >> shift) & moved)
+
+
+# Преобразование order, neg: разряд j канонического набора — разряд order[j]
+# исходного, проинвертированный, если order[j] входит в маску neg
+def transform(bits, num_vars, order, neg):
+    for bit in qmc.iter_bits(neg):
+        bits = flip(bits, num_vars, bit)
+    current = list(range(num_vars))
+    for j, bit in enumerate(order):
+        k = current.index(bit)
+        if k != j:
+            bits = swap(bits, num_vars, j, k)
+            current[j], current[k] = current[k], current[j]
+    return bits
+
+
+# Куб из канонических координат в исходные
+def restore_cube(cube, order, neg):
+    value, mask = cube
+    orig_value = orig_mask = 0
+    for j, bit in enumerate(order):
+        if mask >> j & 1:
+            orig_mask |= 1 << bit
+        elif (value >> j ^ neg >> bit) & 1:
+            orig_value |= 1 << bit
+    return orig_value, orig_mask
+
+
+def _signature(target, dc, num_vars, bit):
+    high = ones_mask(num_vars, bit)
+    return ((target & high).bit_count(), (dc & high).bit_count()), \
+           ((target & ~high).bit_count(), (dc & ~high).bit_count())
+
+
+# Варианты (order, neg), из которых выбирается каноническая форма
+def _candidates(target, dc, num_vars):
+    fixed_neg = 0
+    free = []
+    keys = {}
+    for bit in range(num_vars):
+        one, zero = _signature(target, dc, num_vars, bit)
+        if one < zero:
+            fixed_neg |= 1 << bit
+        elif one == zero:
+            free.append(bit)
+        keys[bit] = max(one, zero), min(one, zero)
+
+    groups = [list(group) for _, group in
+              itertools.groupby(sorted(range(num_vars), key=lambda b: (keys[b], b)), key=keys.get)]
+    count = 1 << len(free)
+    for group in groups:
+        for k in range(2, len(group) + 1):
+            count *= k
+    if count > MAX_CANDIDATES:
+        yield [bit for group in groups for bit in group], fixed_neg
+        return
+
+    for orders in itertools.product(*(itertools.permutations(group) for group in groups)):
+        order = [bit for group in orders for bit in group]
+        for flips in itertools.product((0, 1), repeat=len(free)):
+            neg = fixed_neg
+            for bit, flipped in zip(free, flips):
+                neg |= flipped << bit
+            yield order, neg
+
+
+# Каноническая форма: (target, dc) и преобразование, которое к ней приводит
+def canonical_form(num_vars, target, dc=0):
+    best = None
+    for order, neg in _candidates(target, dc, num_vars):
+        form = (transform(target, num_vars, order, neg), transform(dc, num_vars, order, neg))
+        if best is None or form < best[0]:
+            best = form, order, neg
+    return best
+
+
+def _encode_cover(cover):
+    return ';'.join(f"{value:x},{mask:x}" for value, mask in cover)
+
+
+def _decode_cover(text):
+    if not text:
+        return []
+    return [tuple(int(part, 16) for part in cube.split(',')) for cube in text.split(';')]
+
+
+# LRU-кэш в памяти; если задан path — покрытия дополнительно хранятся в sqlite
+class CoverCache:
+    def __init__(self, maxsize=1024, path=None):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._covers = collections.OrderedDict()
+        self._db = None
+        if path is not None:
+            self._db = sqlite3.connect(path)
+            self._db.execute("CREATE TABLE IF NOT EXISTS covers (key TEXT PRIMARY KEY, cover TEXT)")
+            self._db.commit()
+
+    def _lookup(self, key):
+        if key in self._covers:
+            self._covers.move_to_end(key)
+            return self._covers[key]
+        if self._db is not None:
+            row = self._db.execute("SELECT cover FROM covers WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                cover = _decode_cover(row[0])
+                self._remember(key, cover)
+                return cover
+        return None
+
+    def _remember(self, key, cover):
+        self._covers[key] = cover
+        self._covers.move_to_end(key)
+        while len(self._covers) > self.maxsize:
+            self._covers.popitem(last=False)
+
+    def _store(self, key, cover):
+        self._remember(key, cover)
+        if self._db is not None:
+            self._db.execute("INSERT OR REPLACE INTO covers VALUES (?, ?)", (key, _encode_cover(cover)))
+            self._db.commit()
+
+    # Поиск без решения: пара (покрытие в исходных координатах или None, задача).
+    # Задача — (ключ, num_vars, canon_target, canon_dc, order, neg); при промахе
+    # каноническую форму можно решить где угодно (например, в процессе-исполнителе)
+    # и передать покрытие в store. Кэш и база при этом остаются в одном процессе
+    def lookup(self, num_vars, target, dc=0):
+        dc &= (1 << (1 << num_vars)) - 1
+        target &= ~dc
+        (canon_target, canon_dc), order, neg = canonical_form(num_vars, target, dc)
+        task = f"{num_vars}:{canon_target:x}:{canon_dc:x}", num_vars, canon_target, canon_dc, order, neg
+        cover = self._lookup(task[0])
+        if cover is None:
+            self.misses += 1
+            return None, task
+        self.hits += 1
+        return sorted(restore_cube(cube, order, neg) for cube in cover), task
+
+    # Покрытие канонической формы задачи из lookup: запоминается, если оно
+    # точное, и возвращается в исходных координатах
+    def store(self, task, cover, exact=True):
+        key, _, _, _, order, neg = task
+        if exact:
+            self._store(key, cover)
+        return sorted(restore_cube(cube, order, neg) for cube in cover)
+
+    # Минимальное покрытие target с безразличными наборами dc в исходных
+    # координатах. solver(num_vars, target, dc, on_stage) вызывается только при
+    # промахе, его результат кэшируется как есть; без solver используется
+    # minimizer.minimize, и покрытие, перебор которого оборван по qmc.MAX_STEPS,
+    # возвращается, но не кэшируется. on_stage получает кубы стадий уже в
+    # исходных координатах
+    def minimize(self, num_vars, target, dc=0, solver=None, on_stage=None):
+        if num_vars > minimizer.EXACT_LIMIT:
+            dc &= (1 << (1 << num_vars)) - 1
+            target &= ~dc
+            if solver is None:
+                return minimizer.minimize(num_vars, target, dc, on_stage=on_stage)
+            return solver(num_vars, target, dc, on_stage)
+        cover, task = self.lookup(num_vars, target, dc)
+        if cover is not None:
+            return cover
+        _, _, canon_target, canon_dc, order, neg = task
+        stage = None
+        if on_stage is not None:
+            def stage(number, cubes):
+                on_stage(number, sorted(restore_cube(cube, order, neg) for cube in cubes))
+        if solver is None:
+            cover, exact = minimizer.minimize(num_vars, canon_target, canon_dc, on_stage=stage, return_exact=True)
+        else:
+            cover, exact = solver(num_vars, canon_target, canon_dc, stage), True
+        return self.store(task, cover, exact)
+
+    def clear(self):
+        self._covers.clear()
+        self.hits = self.misses = 0
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
@@ -0,0 +1,263 @@
+# Алгебра кубов над num_vars переменными без перебора таблицы истинности.
+# Куб — пара (value, mask), как в logic.qmc: mask — безразличные разряды,
+# value — значения остальных разрядов (в разрядах mask — нули)
+
+from logic.qmc import iter_bits
+
+
+def full_mask(num_vars):
+    return (1 << num_vars) - 1
+
+
+def universe(num_vars):
+    return 0, full_mask(num_vars)
+
+
+def parse_cube(text):
+    value = mask = 0
+    for char in text:
+        value <<= 1
+        mask <<= 1
+        if char == '1':
+            value |= 1
+        elif char in '-2':
+            mask |= 1
+        elif char != '0':
+            raise ValueError(f"Ошибка: недопустимый символ '{char}' в кубе")
+    return value, mask
+
+
+def format_cube(cube, num_vars):
+    value, mask = cube
+    chars = []
+    for i in range(num_vars - 1, -1, -1):
+        chars.append('-' if mask >> i & 1 else str(value >> i & 1))
+    return ''.join(chars)
+
+
+def literal_count(cube, num_vars):
+    return num_vars - (cube[1] & full_mask(num_vars)).bit_count()
+
+
+def cost(cover, num_vars):
+    return len(cover), sum(literal_count(cube, num_vars) for cube in cover)
+
+
+# Число разрядов, в которых кубы фиксированы противоположно
+def distance(a, b):
+    return ((a[0] ^ b[0]) & ~(a[1] | b[1])).bit_count()
+
+
+def intersect(a, b):
+    if (a[0] ^ b[0]) & ~(a[1] | b[1]):
+        return None
+    return a[0] | b[0], a[1] & b[1]
+
+
+# a содержит b
+def contains(a, b):
+    return not b[1] & ~a[1] and not (a[0] ^ b[0]) & ~a[1]
+
+
+# Наименьший куб, содержащий все кубы списка
+def supercube(cubes):
+    value, mask = cubes[0]
+    for v, m in cubes[1:]:
+        mask |= m | (value ^ v)
+        value &= ~mask
+    return value, mask
+
+
+# Слияние соседних кубов (одинаковая маска, различие в одном разряде) за
+# один проход по каждой переменной. Покрываемое множество не меняется, а
+# список из 2^k наборов одного куба сворачивается в этот куб за k проходов
+def merge_adjacent(cover, num_vars):
+    cover = set(cover)
+    for bit in range(num_vars):
+        b = 1 << bit
+        merged = set()
+        for value, mask in cover:
+            if mask & b:
+                merged.add((value, mask))
+            elif value & b:
+                if (value & ~b, mask) not in cover:
+                    merged.add((value, mask))
+            elif (value | b, mask) in cover:
+                merged.add((value, mask | b))
+            else:
+                merged.add((value, mask))
+        cover = merged
+    return sorted(cover)
+
+
+# Коэффициент покрытия по кубу: кубы, пересекающие cube, с его литералами,
+# заменёнными на безразличные
+def cofactor(cover, cube, num_vars):
+    fixed = full_mask(num_vars) & ~cube[1]
+    return [(v & ~fixed, m | fixed) for v, m in cover if not (v ^ cube[0]) & fixed & ~m]
+
+
+def _split(cover, bit):
+    b = 1 << bit
+    low = [(v, m | b) for v, m in cover if m & b or not v & b]
+    high = [(v & ~b, m | b) for v, m in cover if m & b or v & b]
+    return low, high
+
+
+# Разряд для разбиения: из «бинарных» (встречаются с обоими значениями) —
+# самый частый; если таких нет, покрытие унатно и берётся любой разряд носителя
+def _split_bit(cover, free):
+    ones = zeros = 0
+    for v, m in cover:
+        ones |= v & ~m
+        zeros |= ~v & ~m
+    binate = ones & zeros & free
+    if not binate:
+        support = (ones | zeros) & free
+        return (support.bit_length() - 1 if support else None), False
+    return _most_frequent(cover, binate), True
+
+
+# Разряд из bits, чаще всего встречающийся литералом (при равенстве — младший);
+# счёт идёт по литералам кубов, а не по всем разрядам для каждого куба
+def _most_frequent(cover, bits):
+    counts = {}
+    for v, m in cover:
+        for bit in iter_bits(bits & ~m):
+            counts[bit] = counts.get(bit, 0) + 1
+    return max(sorted(counts), key=counts.get)
+
+
+# Разряды из free, которые встречаются в покрытии литералами только одного знака
+def _unate_bits(cover, free):
+    ones = zeros = 0
+    for v, m in cover:
+        ones |= v & ~m
+        zeros |= ~v & ~m
+    return (ones ^ zeros) & free
+
+
+# Рекурсивная проверка тождественной истинности покрытия на разрядах free
+def _tautology(cover, free):
+    if not cover:
+        return False
+    size = 0
+    for v, m in cover:
+        dashes = (m & free).bit_count()
+        if dashes == free.bit_count():
+            return True
+        size += 1 << dashes
+    if size < 1 << free.bit_count():
+        return False
+    unate = _unate_bits(cover, free)
+    if unate:
+        # унатная редукция: кубы с литералами унатных разрядов не нужны —
+        # набор против этих литералов их не покрывает
+        return _tautology([(v, m) for v, m in cover if unate & ~m == 0], free & ~unate)
+    bit, _ = _split_bit(cover, free)
+    low, high = _split(cover, bit)
+    free &= ~(1 << bit)
+    return _tautology(low, free) and _tautology(high, free)
+
+
+def is_tautology(cover, num_vars):
+    return _tautology(list(cover), full_mask(num_vars))
+
+
+# Куб целиком покрывается объединением кубов cover
+def cover_contains(cover, cube, num_vars):
+    return _tautology(cofactor(cover, cube, num_vars), cube[1] & full_mask(num_vars))
+
+
+def _complement(cover, free, full):
+    if not cover:
+        return [(0, full)]
+    for v, m in cover:
+        if m & free == free:
+            return []
+    if len(cover) == 1:
+        v, m = cover[0]
+        return [(~v & (1 << bit), full & ~(1 << bit)) for bit in iter_bits(free & ~m)]
+
+    bit, _ = _split_bit(cover, free)
+    b = 1 << bit
+    low, high = _split(cover, bit)
+    low = _complement(low, free & ~b, full)
+    high = _complement(high, free & ~b, full)
+    # кубы, общие для обеих половин, не зависят от разряда
+    low_set, high_set = set(low), set(high)
+    result = [cube for cube in low if cube in high_set]
+    result += [(v, m & ~b) for v, m in low if (v, m) not in high_set]
+    result += [(v | b, m & ~b) for v, m in high if (v, m) not in low_set]
+    return result
+
+
+# Дополнение покрытия (тоже покрытие, кубы могут пересекаться)
+def complement(cover, num_vars):
+    full = full_mask(num_vars)
+    return _complement(list(cover), full, full)
+
+
+# Куб на разрядах free, не пересекающий ни одного куба cover; None, если
+# покрытие тождественно. Унатные разряды фиксируются против своих литералов
+# (кубы с такими литералами этим не покрываются), остальные кубы — задача
+# меньшей размерности, как в унатной редукции _tautology
+def _uncovered(cover, free):
+    if not cover:
+        return 0, free
+    ones = zeros = 0
+    for v, m in cover:
+        if m & free == free:
+            return None
+        ones |= v & ~m
+        zeros |= ~v & ~m
+    unate = (ones ^ zeros) & free
+    if unate:
+        found = _uncovered([(v, m) for v, m in cover if unate & ~m == 0], free & ~unate)
+        return None if found is None else (found[0] | (zeros & unate), found[1])
+    bit = _most_frequent(cover, ones & zeros & free)
+    b = 1 << bit
+    low, high = _split(cover, bit)
+    # сначала половина с меньшим числом кубов: в ней непокрытый куб вероятнее
+    for half, value in sorted(((low, 0), (high, b)), key=lambda item: len(item[0])):
+        found = _uncovered(half, free & ~b)
+        if found is not None:
+            return found[0] | value, found[1]
+    return None
+
+
+# Куб внутри cube, не пересекающий кубов cover (часть разности cube # cover);
+# None, если cube покрыт целиком
+def uncovered(cube, cover, num_vars):
+    found = _uncovered(cofactor(cover, cube, num_vars), cube[1] & full_mask(num_vars))
+    return None if found is None else (cube[0] | found[0], found[1])
+
+
+# Наименьший куб, содержащий часть cube, не покрытую cover
+# (без построения самой разности); None, если cube покрыт целиком.
+# Первый непокрытый куб задаёт начальную оценку; затем для каждого разряда,
+# ещё фиксированного в оценке, ищется непокрытый куб в противоположной половине
+def sharp_supercube(cube, cover, num_vars):
+    cover = cofactor(cover, cube, num_vars)
+    free = cube[1] & full_mask(num_vars)
+    found = _uncovered(cover, free)
+    if found is None:
+        return None
+    value, mask = found
+    for bit in iter_bits(free & ~mask):
+        b = 1 << bit
+        if mask & b:
+            continue
+        low, high = _split(cover, bit)
+        other = _uncovered(low if value & b else high, free & ~b)
+        if other is not None:
+            mask |= other[1] | b | ((other[0] ^ value) & ~b)
+            value &= ~mask
+    return cube[0] | value, mask
+
+
+# Часть куба, не покрытая кубами cover (операция sharp)
+def sharp(cube, cover, num_vars):
+    full = full_mask(num_vars)
+    rest = _complement(cofactor(cover, cube, num_vars), cube[1] & full, full)
+    return [intersect(cube, other) for other in rest]
@@ -0,0 +1,124 @@
+# Эвристическая двухуровневая минимизация в духе Espresso: цикл
+# expand / irredundant / reduce над списками кубов (logic.cubes), без
+# перебора таблицы истинности. Подходит для функций с десятками входов
+
+import sys
+
+from logic import cubes
+from logic import pla as pla_format
+
+
+# Расширение куба: литералы снимаются по одному, пока куб не пересекает
+# запрещённое множество (матрица блокировки): conflicts[i] — разряды, в которых
+# куб расходится с i-м кубом off. Если off не задан, полное дополнение on ∪ dc,
+# которое для десятков входов бывает огромным, не строится: запрещённые кубы
+# находятся по мере надобности (cubes.uncovered для отброшенной половины) и
+# накапливаются в списке found, общем для всех вызовов одной минимизации
+def expand_cube(cube, num_vars, allowed, off=None, found=None):
+    value, mask = cube
+    fixed = cubes.full_mask(num_vars) & ~mask
+    # сначала снимаются литералы, по которым куб не совпадает с большинством кубов allowed
+    order = sorted(cubes.iter_bits(fixed),
+                   key=lambda bit: -sum(1 for v, m in allowed if (m | (v ^ value)) >> bit & 1))
+    lazy = off is None
+    if lazy:
+        off = [] if found is None else found
+    conflicts = [(value ^ v) & ~(mask | m) for v, m in off]
+    if not all(conflicts):
+        raise ValueError(f"Ошибка: куб {cubes.format_cube(cube, num_vars)} пересекает запрещённое множество")
+    for bit in order:
+        b = 1 << bit
+        if not all(k & ~b for k in conflicts):
+            continue
+        if lazy:
+            blocked = cubes.uncovered((value ^ b, mask), allowed, num_vars)
+            if blocked is not None:
+                off.append(blocked)
+                conflicts.append(b)
+                continue
+        conflicts = [k & ~b for k in conflicts]
+        value &= ~b
+        mask |= b
+    return value, mask
+
+
+def expand(cover, num_vars, allowed, off=None, found=None):
+    result = []
+    for cube in sorted(set(cover), key=lambda c: (-c[1].bit_count(), c)):
+        if any(cubes.contains(done, cube) for done in result):
+            continue
+        cube = expand_cube(cube, num_vars, allowed, off, found)
+        result = [done for done in result if not cubes.contains(cube, done)]
+        result.append(cube)
+    return result
+
+
+# Удаление кубов, покрытых остальными кубами и безразличным множеством
+def irredundant(cover, dc, num_vars):
+    result = list(cover)
+    for cube in sorted(cover, key=lambda c: (c[1].bit_count(), c)):
+        others = [other for other in result if other != cube]
+        if cubes.cover_contains(others + list(dc), cube, num_vars):
+            result = others
+    return result
+
+
+# Сжатие куба до наименьшего куба, содержащего его часть, не покрытую
+# остальными кубами и безразличным множеством
+def reduce(cover, dc, num_vars):
+    result = sorted(cover, key=lambda c: (-c[1].bit_count(), c))
+    i = 0
+    while i < len(result):
+        cube = result[i]
+        others = result[:i] + result[i + 1:] + list(dc)
+        reduced = cubes.sharp_supercube(cube, others, num_vars)
+        if reduced is None:
+            del result[i]
+            continue
+        result[i] = reduced
+        i += 1
+    return result
+
+
+# on, dc, off — списки кубов; off необязателен (по умолчанию запрещено всё,
+# что не входит в on ∪ dc)
+def espresso(on, num_vars, dc=(), off=None):
+    # соседние наборы сливаются заранее: на входах из тысяч наборов это
+    # сокращает число кубов для expand на порядки
+    on = cubes.merge_adjacent(on, num_vars)
+    dc = cubes.merge_adjacent(dc, num_vars)
+    if off is not None:
+        off = cubes.merge_adjacent(off, num_vars)
+    if not on:
+        return []
+
+    allowed = on + dc
+    found = []
+    cover = irredundant(expand(on, num_vars, allowed, off, found), dc, num_vars)
+    best = cubes.cost(cover, num_vars)
+    while True:
+        candidate = reduce(cover, dc, num_vars)
+        candidate = irredundant(expand(candidate, num_vars, allowed, off, found), dc, num_vars)
+        candidate_cost = cubes.cost(candidate, num_vars)
+        if candidate_cost >= best:
+            break
+        cover, best = candidate, candidate_cost
+    return sorted(cover)
+
+
+# Минимизация каждого выхода PLA; результат — PLA типа f
+def minimize_pla(table):
+    result = pla_format.PLA(table.num_inputs, table.num_outputs,
+                            table.input_labels, table.output_labels, 'f')
+    for output in range(table.num_outputs):
+        on, dc, off = table.output_sets(output)
+        for cube in espresso(on, table.num_inputs, dc, off):
+            result.add(cube, output)
+    return result
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Использование: python -m logic.espresso файл.pla")
+        sys.exit(1)
+    print(pla_format.format_pla(minimize_pla(pla_format.read_pla(sys.argv[1]))), end='')
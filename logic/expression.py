@@ -0,0 +1,238 @@
+import re
+
+# Бинарные операции: символ -> (приоритет, правая ассоциативность, операция).
+# Чем больше приоритет, тем сильнее связывание; отрицание сильнее всех бинарных
+BINARY_OPERATORS = {
+    '~': (1, False, 'eqv'), '↔': (1, False, 'eqv'), '<->': (1, False, 'eqv'),
+    '->': (2, True, 'impl'), '→': (2, True, 'impl'),
+    '|': (3, False, 'or'), '∨': (3, False, 'or'),
+    '^': (4, False, 'xor'), '⊕': (4, False, 'xor'),
+    '&': (5, False, 'and'), '∧': (5, False, 'and'),
+}
+UNARY_OPERATORS = {'!', '¬'}
+COMMUTATIVE = {'and', 'or', 'xor'}
+# Символы операций графа при выводе выражения
+_SYMBOLS = {'and': '&', 'xor': '^', 'or': '|'}
+
+TOKEN_PATTERN = re.compile(
+    r'\s*(?:(?P<op><->|->|[~↔→|∨^⊕&∧!¬()])|(?P<var>[A-Za-z_]\w*)|(?P<const>[01](?!\w))|(?P<bad>\S))'
+)
+
+
+def tokenize(expr, operators=None):
+    tokens = []
+    for match in TOKEN_PATTERN.finditer(expr):
+        if match.group('bad') is not None:
+            raise ValueError(f"Ошибка: недопустимый символ '{match.group('bad')}' в позиции {match.start('bad')}")
+        if match.group('op') is not None:
+            token = match.group('op')
+            if operators is not None and token not in operators and token not in '()':
+                raise ValueError(f"Ошибка: операция '{token}' не поддерживается")
+            tokens.append(('op', token))
+        elif match.group('var') is not None:
+            tokens.append(('var', match.group('var')))
+        elif match.group('const') is not None:
+            tokens.append(('const', int(match.group('const'))))
+    return tokens
+
+
+# Ориентированный ациклический граф выражения с хэш-консингом: одинаковые
+# подвыражения хранятся в одном узле и вычисляются один раз.
+# Узел — (операция, левый, правый); импликация и эквивалентность раскрываются
+# через not/or/xor, поэтому вычислителям хватает пяти операций
+class ExpressionGraph:
+    def __init__(self):
+        self.nodes = []
+        self.root = None
+        self._ids = {}
+
+    def add(self, op, left=None, right=None):
+        if op == 'impl':
+            return self.add('or', self.add('not', left), right)
+        if op == 'eqv':
+            return self.add('not', self.add('xor', left, right))
+        if op == 'not' and self.nodes[left][0] == 'not':
+            return self.nodes[left][1]
+        if op in ('and', 'or') and left == right:
+            return left
+        if op in COMMUTATIVE and left > right:
+            left, right = right, left
+        key = (op, left, right)
+        if key not in self._ids:
+            self._ids[key] = len(self.nodes)
+            self.nodes.append(key)
+        return self._ids[key]
+
+    def variables(self):
+        return sorted(name for op, name, _ in self.nodes if op == 'var')
+
+    # Запись узла (по умолчанию корня) с минимумом скобок; импликация и
+    # эквивалентность выводятся в раскрытом виде: a -> b как !a | b
+    def format(self, node=None):
+        op, left, right = self.nodes[self.root if node is None else node]
+        if op == 'var':
+            return left
+        if op == 'const':
+            return str(left)
+        if op == 'not':
+            operand = self.format(left)
+            return f"!{operand}" if self.nodes[left][0] in ('var', 'const', 'not') else f"!({operand})"
+        symbol = _SYMBOLS[op]
+        parts = []
+        for child in (left, right):
+            text = self.format(child)
+            child_op = self.nodes[child][0]
+            if child_op in _SYMBOLS and BINARY_OPERATORS[_SYMBOLS[child_op]][0] < BINARY_OPERATORS[symbol][0]:
+                text = f"({text})"
+            parts.append(text)
+        return f" {symbol} ".join(parts)
+
+    # Компиляция в массив инструкций над ячейками: первые ячейки — переменные
+    # в порядке variables, затем только узлы, достижимые из корня
+    def compile(self, variables=None):
+        variables = self.variables() if variables is None else list(variables)
+        reachable = set()
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node in reachable:
+                continue
+            reachable.add(node)
+            op, left, right = self.nodes[node]
+            if op in COMMUTATIVE:
+                stack.extend((left, right))
+            elif op == 'not':
+                stack.append(left)
+
+        var_cells = {name: i for i, name in enumerate(variables)}
+        cells = {}
+        instructions = []
+        for node, (op, left, right) in enumerate(self.nodes):
+            if node not in reachable:
+                continue
+            if op == 'var':
+                if left not in var_cells:
+                    raise ValueError(f"Ошибка: переменная '{left}' не задана")
+                cells[node] = var_cells[left]
+                continue
+            if op == 'const':
+                instructions.append(('const', left, None))
+            elif op == 'not':
+                instructions.append(('not', cells[left], None))
+            else:
+                instructions.append((op, cells[left], cells[right]))
+            cells[node] = len(variables) + len(instructions) - 1
+        return instructions, cells[self.root]
+
+
+# Рекурсивный спуск с подъёмом по приоритетам (Pratt)
+class _Parser:
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.pos = 0
+        self.graph = ExpressionGraph()
+
+    def peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else (None, None)
+
+    def advance(self):
+        token = self.peek()
+        self.pos += 1
+        return token
+
+    def parse(self, min_precedence=1):
+        left = self.parse_prefix()
+        while True:
+            kind, value = self.peek()
+            if kind != 'op' or value not in BINARY_OPERATORS:
+                return left
+            precedence, right_assoc, op = BINARY_OPERATORS[value]
+            if precedence < min_precedence:
+                return left
+            self.advance()
+            right = self.parse(precedence if right_assoc else precedence + 1)
+            left = self.graph.add(op, left, right)
+
+    def parse_prefix(self):
+        kind, value = self.advance()
+        if kind == 'var':
+            return self.graph.add('var', value)
+        if kind == 'const':
+            return self.graph.add('const', value)
+        if kind == 'op' and value in UNARY_OPERATORS:
+            return self.graph.add('not', self.parse_prefix())
+        if kind == 'op' and value == '(':
+            node = self.parse()
+            if self.advance() != ('op', ')'):
+                raise ValueError("Ошибка: не хватает закрывающей скобки")
+            return node
+        if kind is None:
+            raise ValueError("Ошибка: неожиданный конец выражения")
+        raise ValueError(f"Ошибка: неожиданный символ '{value}'")
+
+
+# Разбор строки в граф выражения; operators ограничивает допустимые операции
+def parse(expr, operators=None):
+    parser = _Parser(tokenize(expr, operators))
+    parser.graph.root = parser.parse()
+    if parser.pos != len(parser.tokens):
+        raise ValueError(f"Ошибка: лишний символ '{parser.peek()[1]}'")
+    return parser.graph
+
+
+# Вычисление скомпилированного выражения на одном наборе значений
+def evaluate(program, values):
+    instructions, output = program
+    cells = list(values)
+    for op, left, right in instructions:
+        if op == 'and':
+            cells.append(cells[left] & cells[right])
+        elif op == 'or':
+            cells.append(cells[left] | cells[right])
+        elif op == 'xor':
+            cells.append(cells[left] ^ cells[right])
+        elif op == 'not':
+            cells.append(1 - cells[left])
+        else:
+            cells.append(left)
+    return int(cells[output])
+
+
+# Побитовое вычисление: каждая ячейка — столбец значений, full — маска столбца
+def evaluate_columns(program, columns, full):
+    instructions, output = program
+    cells = list(columns)
+    for op, left, right in instructions:
+        if op == 'and':
+            cells.append(cells[left] & cells[right])
+        elif op == 'or':
+            cells.append(cells[left] | cells[right])
+        elif op == 'xor':
+            cells.append(cells[left] ^ cells[right])
+        elif op == 'not':
+            cells.append(~cells[left] & full)
+        else:
+            cells.append(full if left else 0)
+    return cells[output]
+
+
+# Битовый столбец переменной index из num_vars: значение в строке r хранится
+# в бите size - 1 - (r - start), т.е. первая строка блока — старший бит.
+# size — степень двойки, start кратен size
+def variable_column(index, num_vars, start=0, size=None):
+    size = size or 1 << num_vars
+    shift = num_vars - 1 - index
+    half = 1 << shift
+    if half >= size:
+        return (1 << size) - 1 if (start >> shift) & 1 else 0
+    column = (1 << half) - 1
+    length = half * 2
+    while length < size:
+        column |= column << length
+        length *= 2
+    return column
+
+
+def evaluate_block(program, num_vars, start, size):
+    columns = [variable_column(i, num_vars, start, size) for i in range(num_vars)]
+    return evaluate_columns(program, columns, (1 << size) - 1)
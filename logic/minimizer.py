@@ -0,0 +1,68 @@
+# Общее ядро минимизации для всех лабораторных. Функция задаётся битовыми
+# множествами наборов on, dc и off: бит m соответствует набору с номером m
+# (первая переменная — старший разряд номера).
+# Наборы из dc исключаются из on и off. Если off не задан, в него входит всё,
+# что не попало в on и dc; если задан — незаданные наборы считаются безразличными
+
+from logic import cubes
+from logic import espresso
+from logic import qmc
+
+# До этого числа переменных — точный метод Квайна–Мак-Класки, дальше — Espresso
+EXACT_LIMIT = 16
+
+
+def to_bitset(indices):
+    bits = 0
+    for index in indices:
+        bits |= 1 << index
+    return bits
+
+
+def from_bitset(bits):
+    return list(qmc.iter_bits(bits))
+
+
+# Приведение множеств к непересекающимся on, dc, off, покрывающим все наборы
+def split_sets(num_vars, on, dc=0, off=None):
+    full = (1 << (1 << num_vars)) - 1
+    if (on | dc | (off or 0)) & ~full:
+        raise ValueError(f"Ошибка: номер набора вне диапазона для {num_vars} переменных")
+    on &= ~dc
+    if off is None:
+        off = full & ~(on | dc)
+    else:
+        off &= ~dc
+        if on & off:
+            raise ValueError("Ошибка: набор входит одновременно в on и off")
+        dc |= full & ~(on | off)
+    return on, dc, off
+
+
+# Минимальная ДНФ (mode='dnf', кубы покрывают on) или КНФ (mode='cnf', кубы
+# покрывают off и читаются как дизъюнкции инверсий). Результат — кубы (value, mask),
+# а при return_exact — пара (кубы, exact): exact ложно, если покрытие найдено
+# Espresso или перебор Квайна–Мак-Класки оборван по qmc.MAX_STEPS
+def minimize(num_vars, on, dc=0, off=None, mode='dnf', on_stage=None, return_exact=False):
+    if mode not in ('dnf', 'cnf'):
+        raise ValueError(f"Ошибка: неизвестный режим минимизации '{mode}'")
+    on, dc, off = split_sets(num_vars, on, dc, off)
+    target = on if mode == 'dnf' else off
+    if num_vars <= EXACT_LIMIT:
+        return qmc.minimize(from_bitset(target), num_vars, from_bitset(dc), on_stage, return_exact)
+    cover = espresso.espresso([(m, 0) for m in qmc.iter_bits(target)], num_vars,
+                              [(m, 0) for m in qmc.iter_bits(dc)])
+    return (cover, False) if return_exact else cover
+
+
+# Наборы, покрытые кубами, как битовое множество
+def cover_bitset(cover, num_vars):
+    bits = 0
+    for cube in cover:
+        for m in qmc.cube_minterms(cube):
+            bits |= 1 << m
+    return bits & ((1 << (1 << num_vars)) - 1)
+
+
+def literal_total(cover, num_vars):
+    return cubes.cost(cover, num_vars)[1]
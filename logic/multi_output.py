@@ -0,0 +1,183 @@
+# Совместная минимизация системы функций с общими термами.
+# Выход i задаётся битовыми множествами on_sets[i] и dc_sets[i] (как в
+# logic.minimizer). Импликанта помечается маской выходов tag: куб входит
+# в on ∪ dc каждого выхода из tag. Результат — термы (куб, маска выходов),
+# каждый терм — одна строка PLA, общая для всех выходов своей маски
+
+from logic import espresso
+from logic import pla as pla_format
+from logic import qmc
+
+# До этого числа переменных — точная совместная минимизация, дальше —
+# Espresso по каждому выходу с объединением одинаковых кубов; такой
+# результат не минимален ни по числу термов, ни по их разделению
+EXACT_LIMIT = 10
+
+
+def _tags(on_sets, dc_sets):
+    tags = {}
+    for i, (on, dc) in enumerate(zip(on_sets, dc_sets)):
+        for m in qmc.iter_bits(on | dc):
+            tags[m] = tags.get(m, 0) | 1 << i
+    return tags
+
+
+# Шаг склеивания с метками: метка склеенного куба — пересечение меток.
+# Куб вычёркивается, только если склеенный куб сохранил всю его метку
+def merge_step(cubes):
+    groups = {}
+    for (value, mask), tag in cubes.items():
+        groups.setdefault((mask, value.bit_count()), {})[value] = tag
+
+    merged = {}
+    used = set()
+    for (mask, ones), values in groups.items():
+        upper = groups.get((mask, ones + 1))
+        if not upper:
+            continue
+        width = max(max(values), max(upper)).bit_length()
+        for value, tag in values.items():
+            for bit in qmc.iter_bits(~(value | mask) & ((1 << width) - 1)):
+                partner = value | (1 << bit)
+                common = tag & upper.get(partner, 0)
+                if not common:
+                    continue
+                key = (value, mask | (1 << bit))
+                merged[key] = merged.get(key, 0) | common
+                if common == tag:
+                    used.add((value, mask))
+                if common == upper[partner]:
+                    used.add((partner, mask))
+    return merged, used
+
+
+# Простые импликанты системы: пары (куб, маска выходов)
+def prime_implicants(on_sets, dc_sets=None):
+    dc_sets = dc_sets or [0] * len(on_sets)
+    cubes = {(m, 0): tag for m, tag in _tags(on_sets, dc_sets).items()}
+    primes = []
+    while cubes:
+        merged, used = merge_step(cubes)
+        primes.extend((cube, tag) for cube, tag in cubes.items() if cube not in used)
+        cubes = merged
+    return sorted(primes)
+
+
+# Для каждого выхода оставляются только нужные ему подключения термов
+def _connect(terms, on_sets, num_vars):
+    masks = [0] * len(terms)
+    for i, on in enumerate(on_sets):
+        candidates = [t for t, (cube, tag) in enumerate(terms) if tag >> i & 1]
+        covered = {t: _cube_bitset(terms[t][0]) & on for t in candidates}
+        candidates = [t for t in candidates if covered[t]]
+        # сначала пробуются отключения самых маленьких термов
+        candidates.sort(key=lambda t: (terms[t][0][1].bit_count(), terms[t][0]))
+        kept = set(candidates)
+        for t in candidates:
+            others = 0
+            for other in kept:
+                if other != t:
+                    others |= covered[other]
+            if covered[t] & ~others == 0:
+                kept.discard(t)
+        for t in kept:
+            masks[t] |= 1 << i
+    return sorted((terms[t][0], mask) for t, mask in enumerate(masks) if mask)
+
+
+def _cube_bitset(cube):
+    bits = 0
+    for m in qmc.cube_minterms(cube):
+        bits |= 1 << m
+    return bits
+
+
+# Минимальное число термов (затем литералов) на всю систему; строки задачи
+# покрытия — пары (выход, набор из on этого выхода). При num_vars > EXACT_LIMIT
+# вызывается minimize_heuristic, и результат не минимален: общими становятся
+# только одинаковые кубы, найденные Espresso для отдельных выходов.
+# max_steps по умолчанию — qmc.MAX_STEPS на момент вызова
+def minimize(num_vars, on_sets, dc_sets=None, max_steps=None):
+    if num_vars > EXACT_LIMIT:
+        return minimize_heuristic(num_vars, on_sets, dc_sets)
+    max_steps = qmc.MAX_STEPS if max_steps is None else max_steps
+    dc_sets = dc_sets or [0] * len(on_sets)
+    on_sets = [on & ~dc for on, dc in zip(on_sets, dc_sets)]
+    primes = prime_implicants(on_sets, dc_sets)
+
+    offsets = []
+    num_rows = 0
+    for on in on_sets:
+        offsets.append({m: num_rows + k for k, m in enumerate(qmc.iter_bits(on))})
+        num_rows += len(offsets[-1])
+    rows_of = []
+    for cube, tag in primes:
+        members = _cube_bitset(cube)
+        rows = 0
+        for i in qmc.iter_bits(tag):
+            for m in qmc.iter_bits(members & on_sets[i]):
+                rows |= 1 << offsets[i][m]
+        rows_of.append(rows)
+
+    costs = [qmc.literal_count(cube, num_vars) for cube, _ in primes]
+    chosen = qmc.solve_cover(rows_of, costs, num_rows, max_steps)
+    return _connect([primes[p] for p in chosen], on_sets, num_vars)
+
+
+# Раздельная минимизация выходов (одинаковые кубы всё равно занимают одну строку PLA)
+def minimize_separately(num_vars, on_sets, dc_sets=None):
+    dc_sets = dc_sets or [0] * len(on_sets)
+    terms = {}
+    for i, (on, dc) in enumerate(zip(on_sets, dc_sets)):
+        on &= ~dc
+        for cube in qmc.minimize(list(qmc.iter_bits(on)), num_vars, list(qmc.iter_bits(dc))):
+            terms[cube] = terms.get(cube, 0) | 1 << i
+    return sorted(terms.items())
+
+
+# Эвристика для больших систем: каждый выход минимизируется Espresso,
+# одинаковые кубы разных выходов становятся общими термами
+def minimize_heuristic(num_vars, on_sets, dc_sets=None):
+    dc_sets = dc_sets or [0] * len(on_sets)
+    terms = {}
+    for i, (on, dc) in enumerate(zip(on_sets, dc_sets)):
+        cover = espresso.espresso([(m, 0) for m in qmc.iter_bits(on & ~dc)], num_vars,
+                                  [(m, 0) for m in qmc.iter_bits(dc)])
+        for cube in cover:
+            terms[cube] = terms.get(cube, 0) | 1 << i
+    return sorted(terms.items())
+
+
+# Та же эвристика для систем, заданных списками кубов: on_covers[i] и
+# off_covers[i] — единицы и нули выхода i, всё остальное безразлично.
+# Множества по всем 2^num_vars наборам не строятся
+def minimize_cubes(num_vars, on_covers, off_covers):
+    terms = {}
+    for i, (on, off) in enumerate(zip(on_covers, off_covers)):
+        for cube in espresso.espresso(on, num_vars, off=off):
+            terms[cube] = terms.get(cube, 0) | 1 << i
+    return sorted(terms.items())
+
+
+# Площадь PLA: строк (термов) × (2 · входов + выходов); отдельно — число
+# общих термов, литералов в плоскости И и подключений в плоскости ИЛИ
+def pla_area(terms, num_vars, num_outputs):
+    return {
+        'terms': len(terms),
+        'shared_terms': sum(1 for _, mask in terms if mask & (mask - 1)),
+        'literals': sum(qmc.literal_count(cube, num_vars) for cube, _ in terms),
+        'connections': sum(mask.bit_count() for _, mask in terms),
+        'area': len(terms) * (2 * num_vars + num_outputs),
+    }
+
+
+# Выходы, использующие терм, в порядке номеров
+def term_outputs(mask, num_outputs):
+    return [i for i in range(num_outputs) if mask >> i & 1]
+
+
+def to_pla(terms, num_vars, num_outputs, input_labels=None, output_labels=None):
+    table = pla_format.PLA(num_vars, num_outputs, input_labels, output_labels, 'f')
+    for cube, mask in terms:
+        table.add(cube, ''.join('1' if mask >> i & 1 else '0' for i in range(num_outputs)))
+    return table
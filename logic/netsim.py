@@ -0,0 +1,152 @@
+# Уровневое моделирование схем на массивах numpy.
+# Схема — любой объект с полями nodes (список (операция, аргументы), аргументы
+# ссылаются на предыдущие узлы), inputs и outputs (имя -> узел): граф
+# logic.circ.Netlist или ODS_3.Network. Узлы хранятся массивами: код
+# операции, уровень и входы в виде индексов (fanin_start[i]..fanin_start[i+1]
+# в fanin). Узлы одного уровня с одинаковой операцией и числом входов
+# вычисляются одной векторной операцией; каждый разряд слова uint64 — свой
+# входной набор, слова обрабатываются блоками по block слов
+
+import numpy as np
+
+OPS = ('input', 'const', 'not', 'and', 'or', 'xor')
+
+# Наибольшее число входов для полного перебора наборов
+EXHAUSTIVE_LIMIT = 30
+
+ONES = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+# Слова, в которых разряд p номера набора внутри слова (p < 6) равен единице
+LANE_PATTERNS = [np.uint64(sum(1 << j for j in range(64) if j >> p & 1)) for p in range(6)]
+
+
+class CompiledNetlist:
+    def __init__(self, netlist, block=1024):
+        count = len(netlist.nodes)
+        self.block = block
+        self.ops = np.zeros(count, dtype=np.int8)
+        self.levels = np.zeros(count, dtype=np.int32)
+        self.fanin_start = np.zeros(count + 1, dtype=np.int64)
+        fanin = []
+        self.consts = {}
+        for node, (op, args) in enumerate(netlist.nodes):
+            op = 'input' if op.lower() == 'in' else op.lower()
+            if op not in OPS:
+                raise ValueError(f"Ошибка: неизвестная операция '{op}'")
+            self.ops[node] = OPS.index(op)
+            if op == 'const':
+                self.consts[node] = args[0]
+            elif op != 'input':
+                if any(not 0 <= arg < node for arg in args):
+                    raise ValueError(f"Ошибка: узел {node} ссылается на более поздний узел")
+                fanin.extend(args)
+                self.levels[node] = 1 + max(self.levels[arg] for arg in args)
+            self.fanin_start[node + 1] = len(fanin)
+        self.fanin = np.array(fanin, dtype=np.int32)
+        self.inputs = dict(netlist.inputs)
+        self.outputs = dict(netlist.outputs)
+        self.steps = self._levelize()
+
+    # Шаги вычисления по уровням: (операция, узлы, матрица их входов)
+    def _levelize(self):
+        arity = np.diff(self.fanin_start)
+        steps = []
+        gates = np.flatnonzero(self.ops >= OPS.index('not'))
+        order = gates[np.lexsort((arity[gates], self.ops[gates], self.levels[gates]))]
+        if not len(order):
+            return steps
+        keys = np.stack([self.levels[order], self.ops[order], arity[order]], axis=1)
+        bounds = np.flatnonzero(np.any(keys[1:] != keys[:-1], axis=1)) + 1
+        for group in np.split(order, bounds):
+            columns = [self.fanin[self.fanin_start[group] + k] for k in range(arity[group[0]])]
+            steps.append((OPS[self.ops[group[0]]], group, np.stack(columns, axis=1)))
+        return steps
+
+    def depth(self):
+        return int(max((self.levels[node] for node in self.outputs.values()), default=0))
+
+    # Значения всех узлов: columns — входы в виде массивов слов одной длины
+    def run(self, columns):
+        missing = set(self.inputs) - set(columns)
+        if missing:
+            raise ValueError(f"Ошибка: не заданы входы {', '.join(sorted(missing))}")
+        words = len(next(iter(columns.values()))) if columns else 1
+        values = np.zeros((len(self.ops), words), dtype=np.uint64)
+        for name, node in self.inputs.items():
+            values[node] = columns[name]
+        for node, value in self.consts.items():
+            values[node] = ONES if value else 0
+        for op, nodes, fanin in self.steps:
+            if op == 'not':
+                values[nodes] = ~values[fanin[:, 0]]
+            elif op == 'and':
+                values[nodes] = np.bitwise_and.reduce(values[fanin], axis=1)
+            elif op == 'or':
+                values[nodes] = np.bitwise_or.reduce(values[fanin], axis=1)
+            else:
+                values[nodes] = np.bitwise_xor.reduce(values[fanin], axis=1)
+        return values
+
+    def simulate(self, columns):
+        values = self.run(columns)
+        return {name: values[node] for name, node in self.outputs.items()}
+
+    def _order(self, inputs):
+        inputs = list(self.inputs) if inputs is None else list(inputs)
+        if set(self.inputs) - set(inputs):
+            raise ValueError(f"Ошибка: не заданы входы {', '.join(sorted(set(self.inputs) - set(inputs)))}")
+        if len(inputs) > EXHAUSTIVE_LIMIT:
+            raise ValueError(f"Ошибка: больше {EXHAUSTIVE_LIMIT} входов")
+        return inputs
+
+    # Полный перебор наборов блоками: пары (номер первого слова, выходы).
+    # Разряд j слова w — набор 64 · w + j, первый из inputs — старший разряд
+    def blocks(self, inputs=None):
+        inputs = self._order(inputs)
+        n = len(inputs)
+        total = max(1, (1 << n) // 64)
+        for start in range(0, total, self.block):
+            index = np.arange(start, min(start + self.block, total), dtype=np.uint64)
+            columns = {}
+            for i, name in enumerate(inputs):
+                p = n - 1 - i
+                if p < 6:
+                    columns[name] = np.full(len(index), LANE_PATTERNS[p])
+                else:
+                    columns[name] = np.where(index >> np.uint64(p - 6) & np.uint64(1), ONES, np.uint64(0))
+            yield start, self.simulate(columns)
+
+    # Таблицы истинности выходов как битовые множества наборов (как в
+    # logic.circ.Netlist.truth_tables)
+    def truth_tables(self, inputs=None):
+        inputs = self._order(inputs)
+        full = (1 << (1 << len(inputs))) - 1
+        parts = {name: [] for name in self.outputs}
+        for _, outputs in self.blocks(inputs):
+            for name, words in outputs.items():
+                parts[name].append(words)
+        return {name: int.from_bytes(np.concatenate(words).astype('<u8').tobytes(), 'little') & full
+                for name, words in parts.items()}
+
+
+# Первый набор, на котором схемы различаются (полный перебор по общим
+# выходам). Результат — None или (номер набора, различающиеся выходы)
+def first_difference(a, b, inputs=None):
+    if set(a.inputs) != set(b.inputs):
+        raise ValueError("Ошибка: у схем разные входы")
+    inputs = a._order(inputs)
+    names = [name for name in a.outputs if name in b.outputs]
+    if not names:
+        return None
+    # при n < 6 лишние разряды слова повторяют младшие наборы, поэтому
+    # первое различие всегда в пределах 2^n
+    for (start, left), (_, right) in zip(a.blocks(inputs), b.blocks(inputs)):
+        diff = np.zeros_like(left[names[0]])
+        for name in names:
+            diff |= left[name] ^ right[name]
+        for word in np.flatnonzero(diff)[:1]:
+            bits = int(diff[word])
+            lane = (bits & -bits).bit_length() - 1
+            wrong = [name for name in names if int(left[name][word] ^ right[name][word]) >> lane & 1]
+            return (start + int(word)) * 64 + lane, wrong
+    return None
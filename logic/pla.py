@@ -0,0 +1,120 @@
+# Чтение и запись таблиц в формате PLA (Berkeley/Espresso).
+# Строка таблицы — куб входов (0, 1, -) и столбец выходов:
+# 1/4 — единица, 0 — ноль, -/2 — безразлично, ~ — не задано.
+# Тип (.type) определяет, какие множества заданы явно: f — on, d — dc, r — off
+
+from logic import cubes
+
+PLA_TYPES = {'f', 'fd', 'fr', 'fdr'}
+
+
+class PLA:
+    def __init__(self, num_inputs, num_outputs, input_labels=None, output_labels=None, pla_type='fd'):
+        if pla_type not in PLA_TYPES:
+            raise ValueError(f"Ошибка: неизвестный тип PLA '{pla_type}'")
+        self.num_inputs = num_inputs
+        self.num_outputs = num_outputs
+        self.input_labels = input_labels
+        self.output_labels = output_labels
+        self.type = pla_type
+        self.rows = []
+
+    # Добавление куба в выход output (или строки выходов целиком)
+    def add(self, cube, outputs):
+        if isinstance(outputs, int):
+            outputs = ''.join('1' if i == outputs else '0' for i in range(self.num_outputs))
+        if len(outputs) != self.num_outputs:
+            raise ValueError(f"Ошибка: ожидается {self.num_outputs} выходов, получено {len(outputs)}")
+        self.rows.append((cube, outputs))
+
+    # on, dc и off для одного выхода; множество, не заданное типом, равно None
+    # (off) или вычисляется как дополнение (dc при типе fr)
+    def output_sets(self, output):
+        on, dc, off = [], [], []
+        for cube, outputs in self.rows:
+            char = outputs[output]
+            if char in '14':
+                on.append(cube)
+            elif char in '-2' and 'd' in self.type:
+                dc.append(cube)
+            elif char == '0' and 'r' in self.type:
+                off.append(cube)
+        if 'r' not in self.type:
+            return on, dc, None
+        if 'd' not in self.type:
+            dc = cubes.complement(on + off, self.num_inputs)
+        return on, dc, off
+
+
+def parse_pla(text):
+    num_inputs = num_outputs = None
+    input_labels = output_labels = None
+    pla_type = 'fd'
+    rows = []
+    for line_no, line in enumerate(text.splitlines(), 1):
+        line = line.split('#', 1)[0].strip()
+        if not line:
+            continue
+        if line.startswith('.'):
+            keyword, *args = line.split()
+            if keyword == '.i':
+                num_inputs = int(args[0])
+            elif keyword == '.o':
+                num_outputs = int(args[0])
+            elif keyword == '.ilb':
+                input_labels = args
+            elif keyword == '.ob':
+                output_labels = args
+            elif keyword == '.type':
+                pla_type = args[0]
+            elif keyword in ('.e', '.end'):
+                break
+            # .p и прочие директивы не влияют на таблицу
+            continue
+        if num_inputs is None or num_outputs is None:
+            raise ValueError(f"Ошибка: строка {line_no}: куб до директив .i и .o")
+        chars = ''.join(line.replace('|', ' ').split())
+        if len(chars) != num_inputs + num_outputs:
+            raise ValueError(f"Ошибка: строка {line_no}: ожидается {num_inputs + num_outputs} символов")
+        outputs = chars[num_inputs:]
+        if any(char not in '01-24~' for char in outputs):
+            raise ValueError(f"Ошибка: строка {line_no}: недопустимое значение выхода")
+        rows.append((cubes.parse_cube(chars[:num_inputs]), outputs))
+
+    if num_inputs is None or num_outputs is None:
+        raise ValueError("Ошибка: не заданы директивы .i и .o")
+    table = PLA(num_inputs, num_outputs, input_labels, output_labels, pla_type)
+    for cube, outputs in rows:
+        table.add(cube, outputs)
+    return table
+
+
+def read_pla(path):
+    with open(path, encoding='utf-8') as file:
+        return parse_pla(file.read())
+
+
+# Строки с одинаковым кубом входов объединяются в одну
+def format_pla(table):
+    merged = {}
+    for cube, outputs in table.rows:
+        if cube in merged:
+            outputs = ''.join(a if a in '14' else b for a, b in zip(merged[cube], outputs))
+        merged[cube] = outputs
+    lines = [f".i {table.num_inputs}", f".o {table.num_outputs}"]
+    if table.input_labels:
+        lines.append(".ilb " + ' '.join(table.input_labels))
+    if table.output_labels:
+        lines.append(".ob " + ' '.join(table.output_labels))
+    if table.type != 'fd':
+        lines.append(f".type {table.type}")
+    lines.append(f".p {len(merged)}")
+    for cube, outputs in merged.items():
+        lines.append(f"{cubes.format_cube(cube, table.num_inputs)} {outputs}")
+    lines.append(".e")
+    return '\n'.join(lines) + '\n'
+
+
+def write_pla(table, path):
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(format_pla(table))
@@ -0,0 +1,282 @@
+# Метод Квайна–Мак-Класки на целочисленных импликантах.
+# Импликанта — пара (value, mask): mask — склеенные разряды, value — значения
+# остальных разрядов (в склеенных разрядах value равно 0).
+# Первая переменная из num_vars — старший бит, как в номере строки таблицы истинности
+
+import heapq
+
+# Ограничение перебора при выборе покрытия (суммарное число строк, просмотренных
+# в узлах): после него возвращается лучшее найденное покрытие, которое может
+# быть не минимальным (return_exact=True сообщает, закончился ли перебор)
+MAX_STEPS = 500_000
+
+
+# Номера единичных битов по возрастанию; поиск по строке линеен и для длинных чисел
+def iter_bits(bits):
+    text = bin(bits)[:1:-1]
+    pos = text.find('1')
+    while pos >= 0:
+        yield pos
+        pos = text.find('1', pos + 1)
+
+
+def literal_count(cube, num_vars):
+    return num_vars - cube[1].bit_count()
+
+
+def covers(cube, minterm):
+    value, mask = cube
+    return minterm & ~mask == value
+
+
+# Все минтермы, покрываемые импликантой
+def cube_minterms(cube):
+    value, mask = cube
+    subset = mask
+    while True:
+        yield value | subset
+        if subset == 0:
+            return
+        subset = (subset - 1) & mask
+
+
+# Импликанта в виде кортежа 0/1/'X' (формат Lab_03)
+def cube_to_tuple(cube, num_vars):
+    value, mask = cube
+    result = []
+    for i in range(num_vars):
+        bit = 1 << (num_vars - 1 - i)
+        result.append('X' if mask & bit else int(bool(value & bit)))
+    return tuple(result)
+
+
+def tuple_to_cube(values):
+    value = mask = 0
+    for val in values:
+        value <<= 1
+        mask <<= 1
+        if val == 'X':
+            mask |= 1
+        else:
+            value |= int(val)
+    return value, mask
+
+
+# Один шаг склеивания: импликанты группируются по маске и числу единиц,
+# пара ищется только в соседней группе (на одну единицу больше) по хэшу
+def merge_step(cubes):
+    groups = {}
+    for value, mask in cubes:
+        groups.setdefault((mask, value.bit_count()), set()).add(value)
+
+    merged = set()
+    used = set()
+    for (mask, ones), values in groups.items():
+        upper = groups.get((mask, ones + 1))
+        if not upper:
+            continue
+        width = max(max(values), max(upper)).bit_length()
+        for value in values:
+            for bit in iter_bits(~(value | mask) & ((1 << width) - 1)):
+                if value | (1 << bit) in upper:
+                    merged.add((value, mask | (1 << bit)))
+                    used.add((value, mask))
+                    used.add((value | (1 << bit), mask))
+    return merged, used
+
+
+# Все простые импликанты; безразличные наборы участвуют в склеивании.
+# on_stage(номер, импликанты) вызывается после каждого шага склеивания
+def prime_implicants(minterms, dont_cares=(), on_stage=None):
+    cubes = {(m, 0) for m in minterms} | {(m, 0) for m in dont_cares}
+    primes = set()
+    stage = 1
+    while cubes:
+        merged, used = merge_step(cubes)
+        primes |= cubes - used
+        if merged and on_stage is not None:
+            on_stage(stage, sorted(merged))
+        cubes = merged
+        stage += 1
+    return sorted(primes)
+
+
+# Задача покрытия: строки — минтермы, столбцы — импликанты, всё в битовых множествах
+class _CoverProblem:
+    def __init__(self, rows_of, costs, num_rows, max_steps):
+        self.rows_of = rows_of
+        self.costs = costs
+        self.primes_of = [0] * num_rows
+        for p, rows in enumerate(rows_of):
+            for r in iter_bits(rows):
+                self.primes_of[r] |= 1 << p
+        self.max_steps = max_steps
+        self.steps = 0
+        self.best = None
+        self.best_cost = None
+        self.exact = True
+
+    # Существенные столбцы и (если dominance) доминирование столбцов
+    def reduce(self, uncovered, allowed, dominance=True):
+        chosen = []
+        while uncovered:
+            essential = 0
+            for r in iter_bits(uncovered):
+                candidates = self.primes_of[r] & allowed
+                if candidates == 0:
+                    return None
+                if candidates & (candidates - 1) == 0:
+                    essential |= candidates
+            if essential:
+                for p in iter_bits(essential):
+                    chosen.append(p)
+                    uncovered &= ~self.rows_of[p]
+                allowed &= ~essential
+                continue
+            if not dominance:
+                break
+
+            # столбец p исключается, если другой не дороже и покрывает все его строки;
+            # кандидаты на доминирование — пересечение столбцов строк p
+            removed = 0
+            for p in iter_bits(allowed):
+                rows = self.rows_of[p] & uncovered
+                if not rows:
+                    removed |= 1 << p
+                    continue
+                others = allowed & ~removed & ~(1 << p)
+                for r in iter_bits(rows):
+                    others &= self.primes_of[r]
+                    if not others:
+                        break
+                for q in iter_bits(others):
+                    if self.costs[q] < self.costs[p] or (
+                            self.costs[q] == self.costs[p] and (self.rows_of[q] & uncovered != rows or q < p)):
+                        removed |= 1 << p
+                        break
+            if not removed:
+                break
+            allowed &= ~removed
+        return chosen, uncovered, allowed
+
+    # Нижняя оценка: строки без общих столбцов требуют разных импликант
+    def lower_bound(self, uncovered, allowed):
+        taken = 0
+        bound = 0
+        rows = sorted(iter_bits(uncovered), key=lambda r: (self.primes_of[r] & allowed).bit_count())
+        for r in rows:
+            candidates = self.primes_of[r] & allowed
+            if not candidates & taken:
+                taken |= candidates
+                bound += 1
+        return bound
+
+    # Жадное покрытие с ленивой очередью: покрытие столбца только убывает,
+    # поэтому пересчитывается лишь вершина очереди
+    def greedy(self, uncovered, allowed):
+        queue = [(-(self.rows_of[p] & uncovered).bit_count(), self.costs[p], p) for p in iter_bits(allowed)]
+        heapq.heapify(queue)
+        chosen = []
+        while uncovered:
+            _, cost, p = heapq.heappop(queue)
+            gain = (self.rows_of[p] & uncovered).bit_count()
+            if queue and (-gain, cost, p) > queue[0]:
+                if gain:
+                    heapq.heappush(queue, (-gain, cost, p))
+                continue
+            chosen.append(p)
+            uncovered &= ~self.rows_of[p]
+        return chosen
+
+    # Ветви и границы обходом в глубину с явным стеком (глубина равна числу
+    # выбранных импликант и может превышать предел рекурсии).
+    # Выбранные импликанты хранятся связным списком (p, родитель)
+    def search(self, uncovered, allowed):
+        stack = [(uncovered, allowed, None, 0, 0)]
+        while stack and self.steps < self.max_steps:
+            uncovered, allowed, chosen, count, literals = stack.pop()
+            self.steps += uncovered.bit_count()
+            reduced = self.reduce(uncovered, allowed, dominance=False)
+            if reduced is None:
+                continue
+            extra, uncovered, allowed = reduced
+            for p in extra:
+                chosen = (p, chosen)
+                literals += self.costs[p]
+            count += len(extra)
+            if not uncovered:
+                if (count, literals) < self.best_cost:
+                    self.best_cost = (count, literals)
+                    self.best = []
+                    while chosen is not None:
+                        p, chosen = chosen
+                        self.best.append(p)
+                continue
+            if count + self.lower_bound(uncovered, allowed) > self.best_cost[0]:
+                continue
+
+            row = min(iter_bits(uncovered), key=lambda r: (self.primes_of[r] & allowed).bit_count())
+            candidates = sorted(iter_bits(self.primes_of[row] & allowed),
+                                key=lambda p: (-(self.rows_of[p] & uncovered).bit_count(), self.costs[p]))
+            children = []
+            for p in candidates:
+                children.append((uncovered & ~self.rows_of[p], allowed & ~(1 << p),
+                                 (p, chosen), count + 1, literals + self.costs[p]))
+                allowed &= ~(1 << p)
+            stack.extend(reversed(children))
+        self.exact = not stack
+
+    def solve(self, uncovered, allowed):
+        reduced = self.reduce(uncovered, allowed)
+        if reduced is None:
+            raise ValueError("Ошибка: импликанты не покрывают все минтермы")
+        chosen, uncovered, allowed = reduced
+        if not uncovered:
+            return chosen
+        self.best = self.greedy(uncovered, allowed)
+        self.best_cost = (len(self.best), sum(self.costs[p] for p in self.best))
+        self.search(uncovered, allowed)
+        return chosen + self.best
+
+
+# Задача покрытия в общем виде: rows_of[p] — битовое множество строк столбца p,
+# costs[p] — его цена. Возвращает номера выбранных столбцов, а при return_exact —
+# пару (номера, exact), где exact ложно, если перебор оборван по max_steps
+def solve_cover(rows_of, costs, num_rows, max_steps=None, return_exact=False):
+    if not num_rows:
+        return ([], True) if return_exact else []
+    problem = _CoverProblem(rows_of, costs, num_rows, MAX_STEPS if max_steps is None else max_steps)
+    chosen = problem.solve((1 << num_rows) - 1, (1 << len(rows_of)) - 1)
+    return (chosen, problem.exact) if return_exact else chosen
+
+
+# Минимальное покрытие минтермов простыми импликантами: сначала существенные
+# импликанты, затем ветви и границы (минимум импликант, затем литералов)
+def minimal_cover(primes, minterms, num_vars, max_steps=None, return_exact=False):
+    minterms = sorted(set(minterms))
+    if not minterms:
+        return ([], True) if return_exact else []
+    position = {m: i for i, m in enumerate(minterms)}
+    rows_of = []
+    for cube in primes:
+        rows = 0
+        if 1 << cube[1].bit_count() <= len(minterms):
+            for m in cube_minterms(cube):
+                i = position.get(m)
+                if i is not None:
+                    rows |= 1 << i
+        else:
+            for m, i in position.items():
+                if covers(cube, m):
+                    rows |= 1 << i
+        rows_of.append(rows)
+
+    costs = [literal_count(cube, num_vars) for cube in primes]
+    chosen, exact = solve_cover(rows_of, costs, len(minterms), max_steps, return_exact=True)
+    cover = sorted(primes[p] for p in chosen)
+    return (cover, exact) if return_exact else cover
+
+
+def minimize(minterms, num_vars, dont_cares=(), on_stage=None, return_exact=False):
+    primes = prime_implicants(minterms, dont_cares, on_stage)
+    return minimal_cover(primes, minterms, num_vars, return_exact=return_exact)
@@ -0,0 +1,675 @@
+import io
+import itertools
+import os
+import random
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from logic import qmc
+from logic.expression import parse, tokenize, evaluate, evaluate_columns, variable_column, evaluate_block
+from logic.qmc import (
+    literal_count, covers, cube_minterms, cube_to_tuple, tuple_to_cube,
+    merge_step, prime_implicants, minimal_cover, minimize
+)
+from logic.cubes import (
+    parse_cube, format_cube, intersect, contains, supercube, is_tautology, cover_contains,
+    complement, sharp, sharp_supercube, merge_adjacent, uncovered
+)
+from logic.circ import (
+    TRUTH_TABLE_LIMIT, Netlist, input_offsets, mismatched_outputs, read_circ, write_covers, write_terms
+)
+from logic.cover_cache import CoverCache, canonical_form, transform
+from logic.espresso import espresso, minimize_pla
+from logic.minimizer import (
+    EXACT_LIMIT, to_bitset, from_bitset, split_sets, minimize as minimize_sets, cover_bitset, literal_total
+)
+from logic.multi_output import (
+    EXACT_LIMIT as EXACT_SYSTEM_LIMIT, prime_implicants as system_primes, minimize as minimize_system,
+    minimize_separately, pla_area, term_outputs, to_pla
+)
+from logic.netsim import CompiledNetlist, first_difference
+from logic.pla import parse_pla, format_pla
+
+
+def implies(a, b):
+    return (not a) or b
+
+
+class TestExpression(unittest.TestCase):
+
+    def truth(self, expr):
+        graph = parse(expr)
+        program = graph.compile()
+        num_vars = len(graph.variables())
+        return [evaluate(program, values) for values in itertools.product((0, 1), repeat=num_vars)]
+
+    def test_tokenize(self):
+        self.assertEqual(tokenize("a->b1 & 0"),
+                         [("var", "a"), ("op", "->"), ("var", "b1"), ("op", "&"), ("const", 0)])
+
+    def test_keywords_are_plain_variables(self):
+        self.assertEqual(parse("order & nota | andy").variables(), ["andy", "nota", "order"])
+
+    def test_precedence(self):
+        cases = {
+            "a | b & c": lambda a, b, c: a or (b and c),
+            "a ^ b | c": lambda a, b, c: (a != b) or c,
+            "a & b ^ c": lambda a, b, c: (a and b) != c,
+            "!a & b ^ c": lambda a, b, c: ((not a) and b) != c,
+            "a ~ b -> c": lambda a, b, c: a == implies(b, c),
+            "a | b -> c": lambda a, b, c: implies(a or b, c),
+        }
+        for expr, func in cases.items():
+            expected = [int(bool(func(*values))) for values in itertools.product((0, 1), repeat=3)]
+            self.assertEqual(self.truth(expr), expected, expr)
+
+    def test_implication_is_right_associative(self):
+        expected = [int(implies(a, implies(b, c))) for a, b, c in itertools.product((0, 1), repeat=3)]
+        self.assertEqual(self.truth("a -> b -> c"), expected)
+        self.assertNotEqual(self.truth("(a -> b) -> c"), expected)
+
+    def test_unicode_operators_and_constants(self):
+        self.assertEqual(self.truth("¬a ∨ b"), self.truth("a → b"))
+        self.assertEqual(self.truth("a ↔ b"), [1, 0, 0, 1])
+        self.assertEqual(self.truth("a ⊕ 1"), [1, 0])
+        self.assertEqual(self.truth("1 & !0"), [1])
+
+    def test_hash_consing_shares_subexpressions(self):
+        program = parse("(a & b) | (b & a) | !(a & b)").compile()
+        instructions, _ = program
+        self.assertEqual(sum(op == "and" for op, _, _ in instructions), 1)
+        self.assertEqual(parse("!!a").compile(), ([], 0))
+
+    def test_format(self):
+        self.assertEqual(parse("a | b -> c").format(), "c | !(a | b)")
+        self.assertEqual(parse("(a | b) & !c ^ 1").format(), "(a | b) & !c ^ 1")
+        self.assertEqual(parse("a ~ b").format(), "!(a ^ b)")
+        for expr in ("a ~ (b ^ c) -> !d | a", "!(a & b) & (c | d)", "a -> b -> c"):
+            self.assertEqual(self.truth(parse(expr).format()), self.truth(expr), expr)
+
+    def test_syntax_errors(self):
+        for expr in ("a &", "(a", "a b", "a + b", "2", "a)", ""):
+            with self.assertRaises(ValueError):
+                parse(expr)
+
+    def test_restricted_operators(self):
+        with self.assertRaises(ValueError):
+            parse("a ^ b", operators={"&", "|", "!"})
+        self.assertEqual(parse("a & !b", operators={"&", "!"}).variables(), ["a", "b"])
+
+    def test_columns_match_rows(self):
+        graph = parse("a ~ (b ^ c) -> !d | a")
+        program = graph.compile()
+        column = evaluate_block(program, 4, 0, 16)
+        self.assertEqual(format(column, "016b"), "".join(map(str, self.truth("a ~ (b ^ c) -> !d | a"))))
+        columns = [variable_column(i, 4) for i in range(4)]
+        self.assertEqual(evaluate_columns(program, columns, 0xFFFF), column)
+        self.assertEqual(evaluate_block(program, 4, 8, 4), column >> 4 & 0xF)
+
+
+class TestQMC(unittest.TestCase):
+    def covered(self, cover, num_vars):
+        return {m for m in range(1 << num_vars) if any(covers(cube, m) for cube in cover)}
+
+    def test_cube_tuple_round_trip(self):
+        cube = tuple_to_cube((1, 'X', 0, 'X'))
+        self.assertEqual(cube, (0b1000, 0b0101))
+        self.assertEqual(cube_to_tuple(cube, 4), (1, 'X', 0, 'X'))
+        self.assertEqual(sorted(cube_minterms(cube)), [8, 9, 12, 13])
+
+    def test_merge_step_adjacent_groups(self):
+        merged, used = merge_step({(0b000, 0), (0b001, 0), (0b011, 0), (0b110, 0)})
+        self.assertEqual(merged, {(0b000, 0b001), (0b001, 0b010)})
+        self.assertEqual(used, {(0b000, 0), (0b001, 0), (0b011, 0)})
+
+    def test_prime_implicants(self):
+        primes = prime_implicants([0, 1, 2, 5, 6, 7])
+        self.assertEqual(len(primes), 6)
+        self.assertTrue(all(literal_count(cube, 3) == 2 for cube in primes))
+
+    def test_cyclic_cover(self):
+        # циклическая таблица покрытия без существенных импликант
+        cover = minimize([0, 1, 2, 5, 6, 7], 3)
+        self.assertEqual(len(cover), 3)
+        self.assertEqual(self.covered(cover, 3), {0, 1, 2, 5, 6, 7})
+
+    def test_step_budget_reported(self):
+        on = [0, 1, 2, 5, 6, 7]
+        primes = prime_implicants(on)
+        cover, exact = minimal_cover(primes, on, 3, return_exact=True)
+        self.assertTrue(exact)
+        cover, exact = minimal_cover(primes, on, 3, max_steps=0, return_exact=True)
+        self.assertFalse(exact)
+        self.assertEqual(self.covered(cover, 3), set(on))
+
+    def test_dont_cares(self):
+        cover = minimize([1, 3, 5], 3, dont_cares=[7])
+        self.assertEqual(cover, [(0b001, 0b110)])
+
+    def test_on_stage(self):
+        stages = []
+        minimize([0, 1, 2, 3], 2, on_stage=lambda stage, cubes: stages.append((stage, cubes)))
+        self.assertEqual([stage for stage, _ in stages], [1, 2])
+        self.assertEqual(stages[-1][1], [(0, 0b11)])
+
+    def test_random_functions_exact(self):
+        rng = random.Random(1)
+        for _ in range(50):
+            num_vars = rng.randint(2, 4)
+            on = {m for m in range(1 << num_vars) if rng.random() < 0.5}
+            primes = prime_implicants(on)
+            cover = minimal_cover(primes, on, num_vars)
+            self.assertEqual(self.covered(cover, num_vars), on)
+            best = next(k for k in range(len(primes) + 1)
+                        if any(self.covered(subset, num_vars) == on
+                               for subset in itertools.combinations(primes, k)))
+            self.assertEqual(len(cover), best)
+
+    def test_twelve_variables(self):
+        rng = random.Random(2)
+        on = {m for m in range(1 << 12) if rng.random() < 0.3}
+        cover = minimize(on, 12)
+        self.assertEqual(self.covered(cover, 12), on)
+
+
+def points(cover, num_vars):
+    return {m for m in range(1 << num_vars) if any(covers(cube, m) for cube in cover)}
+
+
+def random_cube(rng, num_vars, dash=0.5):
+    value = mask = 0
+    for i in range(num_vars):
+        r = rng.random()
+        if r < dash:
+            mask |= 1 << i
+        elif r < (1 + dash) / 2:
+            value |= 1 << i
+    return value, mask
+
+
+class TestCubes(unittest.TestCase):
+    def test_parse_format(self):
+        cube = parse_cube('1-0-')
+        self.assertEqual(cube, (0b1000, 0b0101))
+        self.assertEqual(format_cube(cube, 4), '1-0-')
+        with self.assertRaises(ValueError):
+            parse_cube('1x0')
+
+    def test_intersect_contains(self):
+        self.assertEqual(intersect(parse_cube('1--'), parse_cube('-0-')), parse_cube('10-'))
+        self.assertIsNone(intersect(parse_cube('1--'), parse_cube('0--')))
+        self.assertTrue(contains(parse_cube('1--'), parse_cube('10-')))
+        self.assertFalse(contains(parse_cube('10-'), parse_cube('1--')))
+        self.assertEqual(supercube([parse_cube('100'), parse_cube('110')]), parse_cube('1-0'))
+
+    def test_tautology(self):
+        self.assertTrue(is_tautology([parse_cube('1-'), parse_cube('0-')], 2))
+        self.assertFalse(is_tautology([parse_cube('1-'), parse_cube('01')], 2))
+        self.assertTrue(cover_contains([parse_cube('1-'), parse_cube('-1')], parse_cube('-1'), 2))
+
+    def test_random_against_enumeration(self):
+        rng = random.Random(3)
+        for _ in range(200):
+            num_vars = rng.randint(1, 6)
+            cover = [random_cube(rng, num_vars) for _ in range(rng.randint(0, 5))]
+            cube = random_cube(rng, num_vars)
+            covered = points(cover, num_vars)
+            self.assertEqual(is_tautology(cover, num_vars), len(covered) == 1 << num_vars)
+            self.assertEqual(points(complement(cover, num_vars), num_vars),
+                             set(range(1 << num_vars)) - covered)
+            rest = points([cube], num_vars) - covered
+            self.assertEqual(points(sharp(cube, cover, num_vars), num_vars), rest)
+            reduced = sharp_supercube(cube, cover, num_vars)
+            if rest:
+                self.assertEqual(reduced, supercube([(m, 0) for m in rest]))
+            else:
+                self.assertIsNone(reduced)
+
+    def test_uncovered(self):
+        rng = random.Random(23)
+        for _ in range(200):
+            num_vars = rng.randint(1, 6)
+            cover = [random_cube(rng, num_vars) for _ in range(rng.randint(0, 6))]
+            cube = random_cube(rng, num_vars)
+            found = uncovered(cube, cover, num_vars)
+            if found is None:
+                self.assertTrue(cover_contains(cover, cube, num_vars))
+            else:
+                self.assertTrue(contains(cube, found))
+                self.assertFalse(points([found], num_vars) & points(cover, num_vars))
+
+    def test_merge_adjacent(self):
+        minterms = [(m, 0) for m in range(16) if m & 0b0011 == 0b0011]
+        self.assertEqual(merge_adjacent(minterms, 4), [(0b0011, 0b1100)])
+        self.assertEqual(merge_adjacent([(0, 0), (3, 0)], 2), [(0, 0), (3, 0)])
+
+
+class TestEspresso(unittest.TestCase):
+    def test_small_functions(self):
+        rng = random.Random(4)
+        for _ in range(100):
+            num_vars = rng.randint(1, 6)
+            on = [random_cube(rng, num_vars) for _ in range(rng.randint(1, 6))]
+            dc = [random_cube(rng, num_vars) for _ in range(rng.randint(0, 2))]
+            required = points(on, num_vars) - points(dc, num_vars)
+            allowed = points(on + dc, num_vars)
+            for off in (None, complement(on + dc, num_vars)):
+                result = points(espresso(on, num_vars, dc, off), num_vars)
+                self.assertTrue(required <= result <= allowed)
+
+    def test_merges_split_cubes(self):
+        # 40 входов: каждый исходный куб разрезан на 8 частей
+        rng = random.Random(5)
+        base = [random_cube(rng, 40, 0.8) for _ in range(10)]
+        on = []
+        for value, mask in base:
+            bits = rng.sample([b for b in range(40) if mask >> b & 1], 3)
+            parts = [(value, mask)]
+            for b in bits:
+                parts = [part for v, m in parts for part in ((v, m & ~(1 << b)), (v | 1 << b, m & ~(1 << b)))]
+            on.extend(parts)
+        result = espresso(on, 40)
+        self.assertLessEqual(len(result), len(base))
+        self.assertTrue(all(cover_contains(result, cube, 40) for cube in on))
+        self.assertTrue(all(cover_contains(on, cube, 40) for cube in result))
+
+    def test_wide_random_cover_is_fast(self):
+        # 40 входов, 100 кубов по 5 литералов: дополнение не строится,
+        # запрещённые кубы для expand находятся по мере надобности
+        rng = random.Random(24)
+        on = []
+        for _ in range(100):
+            value, mask = 0, (1 << 40) - 1
+            for bit in rng.sample(range(40), 5):
+                mask &= ~(1 << bit)
+                value |= rng.getrandbits(1) << bit
+            on.append((value, mask))
+        start = time.perf_counter()
+        result = espresso(on, 40)
+        self.assertLess(time.perf_counter() - start, 10)
+        self.assertLessEqual(len(result), len(on))
+        self.assertTrue(all(cover_contains(result, cube, 40) for cube in on))
+        self.assertTrue(all(cover_contains(on, cube, 40) for cube in result))
+
+    def test_dont_cares(self):
+        # f = a'b'c' + a'b'c, dc = a'bc: ответ — один куб a'b' или a'c
+        result = espresso([parse_cube('000'), parse_cube('001')], 3, [parse_cube('011')])
+        self.assertEqual(len(result), 1)
+        self.assertEqual(literal_count(result[0], 3), 2)
+
+    def test_off_set_conflict(self):
+        with self.assertRaises(ValueError):
+            espresso([parse_cube('1-')], 2, off=[parse_cube('11')])
+
+
+class TestPLA(unittest.TestCase):
+    TEXT = (
+        "# пример\n"
+        ".i 3\n.o 2\n.ilb a b c\n.ob f g\n.p 5\n"
+        "000 10\n001 1-\n011 11\n111 01\n101 -1\n.e\n"
+    )
+
+    def test_parse(self):
+        table = parse_pla(self.TEXT)
+        self.assertEqual((table.num_inputs, table.num_outputs), (3, 2))
+        self.assertEqual(table.input_labels, ['a', 'b', 'c'])
+        on, dc, off = table.output_sets(1)
+        self.assertEqual(on, [parse_cube('011'), parse_cube('111'), parse_cube('101')])
+        self.assertEqual(dc, [parse_cube('001')])
+        self.assertIsNone(off)
+
+    def test_parse_errors(self):
+        with self.assertRaises(ValueError):
+            parse_pla("000 1\n")
+        with self.assertRaises(ValueError):
+            parse_pla(".i 3\n.o 1\n00 1\n")
+        with self.assertRaises(ValueError):
+            parse_pla(".i 2\n.o 1\n.type fx\n")
+
+    def test_round_trip(self):
+        table = parse_pla(self.TEXT)
+        again = parse_pla(format_pla(table))
+        self.assertEqual(again.rows, table.rows)
+
+    def test_minimize_pla(self):
+        result = minimize_pla(parse_pla(self.TEXT))
+        self.assertEqual(result.type, 'f')
+        self.assertEqual(sorted((format_cube(cube, 3), outputs) for cube, outputs in result.rows),
+                         [('--1', '01'), ('0-1', '10'), ('00-', '10')])
+
+    def test_minimize_pla_fr(self):
+        table = parse_pla(self.TEXT.replace('.p 5', '.type fr'))
+        result = minimize_pla(table)
+        self.assertEqual(sorted((format_cube(cube, 3), outputs) for cube, outputs in result.rows),
+                         [('--1', '01'), ('0--', '10')])
+
+
+class TestMinimizer(unittest.TestCase):
+    def test_bitsets(self):
+        self.assertEqual(to_bitset([0, 3, 5]), 0b101001)
+        self.assertEqual(from_bitset(0b101001), [0, 3, 5])
+
+    def test_split_sets(self):
+        on, dc, off = split_sets(2, 0b0011, dc=0b0010)
+        self.assertEqual((on, dc, off), (0b0001, 0b0010, 0b1100))
+        on, dc, off = split_sets(2, 0b0001, off=0b1000)
+        self.assertEqual((on, dc, off), (0b0001, 0b0110, 0b1000))
+        with self.assertRaises(ValueError):
+            split_sets(2, 0b0001, off=0b0001)
+        with self.assertRaises(ValueError):
+            split_sets(2, 1 << 4)
+
+    def test_bcd_dont_cares(self):
+        # младший разряд D8421 + 5: без безразличных наборов 10–15 нужны два куба
+        on = to_bitset([0, 2, 4, 6, 8])
+        dc = to_bitset(range(10, 16))
+        self.assertEqual(len(minimize_sets(4, on)), 2)
+        self.assertEqual(minimize_sets(4, on, dc), [(0, 0b1110)])
+
+    def test_cnf_mode(self):
+        on = to_bitset([3, 5, 6, 7])
+        cover = minimize_sets(3, on, mode='cnf')
+        self.assertEqual(cover_bitset(cover, 3), to_bitset([0, 1, 2, 4]))
+        self.assertEqual(literal_total(cover, 3), 6)
+        with self.assertRaises(ValueError):
+            minimize_sets(3, on, mode='xnf')
+
+    def test_random_against_sets(self):
+        rng = random.Random(6)
+        for _ in range(100):
+            num_vars = rng.randint(1, 6)
+            size = 1 << num_vars
+            on = rng.getrandbits(size)
+            dc = rng.getrandbits(size) & ~on
+            cover = cover_bitset(minimize_sets(num_vars, on, dc), num_vars)
+            self.assertEqual(cover & ~dc, on)
+
+    def test_espresso_beyond_exact_limit(self):
+        num_vars = EXACT_LIMIT + 1
+        on = to_bitset(m for m in range(1 << num_vars) if m >> (num_vars - 1) and m & 1)
+        high = 1 << (num_vars - 1)
+        self.assertEqual(minimize_sets(num_vars, on), [(high | 1, (1 << num_vars) - 2 - high)])
+
+
+class TestMultiOutput(unittest.TestCase):
+    def check_system(self, num_vars, on_sets, dc_sets, terms):
+        for i, (on, dc) in enumerate(zip(on_sets, dc_sets)):
+            cover = [cube for cube, mask in terms if mask >> i & 1]
+            self.assertEqual(cover_bitset(cover, num_vars) & ~dc, on & ~dc)
+
+    def test_prime_tags(self):
+        # f0 = a, f1 = a & b: куб 11 общий для обоих выходов, 1- только для f0
+        primes = system_primes([0b1100, 0b1000])
+        self.assertEqual(primes, [((2, 1), 0b01), ((3, 0), 0b11)])
+
+    def test_shared_term(self):
+        # f0 = a&b | !a&!b, f1 = a&b: общий терм a&b выбирается один раз
+        on_sets = [0b1001, 0b1000]
+        terms = minimize_system(2, on_sets)
+        self.assertEqual(terms, [((0, 0), 0b01), ((3, 0), 0b11)])
+        area = pla_area(terms, 2, 2)
+        self.assertEqual(area, {'terms': 2, 'shared_terms': 1, 'literals': 4,
+                                'connections': 3, 'area': 12})
+
+    def test_random_systems(self):
+        rng = random.Random(16)
+        for _ in range(60):
+            num_vars = rng.randint(1, 5)
+            num_outputs = rng.randint(1, 4)
+            size = 1 << num_vars
+            on_sets = [rng.getrandbits(size) for _ in range(num_outputs)]
+            dc_sets = [rng.getrandbits(size) & rng.getrandbits(size) for _ in range(num_outputs)]
+            terms = minimize_system(num_vars, on_sets, dc_sets)
+            self.check_system(num_vars, on_sets, dc_sets, terms)
+            self.assertLessEqual(len(terms), len(minimize_separately(num_vars, on_sets, dc_sets)))
+
+    def test_to_pla(self):
+        terms = minimize_system(2, [0b1001, 0b1000])
+        text = format_pla(to_pla(terms, 2, 2, ['a', 'b'], ['f', 'g']))
+        self.assertIn(".type f", text)
+        self.assertIn("00 10", text)
+        self.assertIn("11 11", text)
+        self.assertEqual(term_outputs(0b101, 3), [0, 2])
+
+    def test_heuristic_beyond_exact_limit(self):
+        num_vars = EXACT_SYSTEM_LIMIT + 2
+        size = 1 << num_vars
+        # разряды следующего состояния суммирующего счётчика
+        on_sets = [to_bitset(s for s in range(size) if ((s + 1) % size) >> i & 1) for i in range(3)]
+        terms = minimize_system(num_vars, on_sets)
+        self.check_system(num_vars, on_sets, [0] * 3, terms)
+        self.assertEqual(len(terms), 6)
+
+
+class TestCoverCache(unittest.TestCase):
+    def random_transform(self, rng, num_vars):
+        order = list(range(num_vars))
+        rng.shuffle(order)
+        return order, rng.getrandbits(num_vars)
+
+    def test_transform(self):
+        rng = random.Random(17)
+        for _ in range(50):
+            num_vars = rng.randint(1, 5)
+            bits = rng.getrandbits(1 << num_vars)
+            order, neg = self.random_transform(rng, num_vars)
+            moved = transform(bits, num_vars, order, neg)
+            for m in range(1 << num_vars):
+                image = sum(((m ^ neg) >> bit & 1) << j for j, bit in enumerate(order))
+                self.assertEqual(moved >> image & 1, bits >> m & 1)
+
+    def test_canonical_form_is_invariant(self):
+        rng = random.Random(18)
+        for _ in range(100):
+            num_vars = rng.randint(1, 5)
+            target = rng.getrandbits(1 << num_vars)
+            dc = rng.getrandbits(1 << num_vars) & rng.getrandbits(1 << num_vars)
+            order, neg = self.random_transform(rng, num_vars)
+            self.assertEqual(canonical_form(num_vars, target, dc)[0],
+                             canonical_form(num_vars, transform(target, num_vars, order, neg),
+                                            transform(dc, num_vars, order, neg))[0])
+
+    def test_hit_is_remapped(self):
+        rng = random.Random(19)
+        for _ in range(50):
+            cache = CoverCache()
+            num_vars = rng.randint(1, 5)
+            target = rng.getrandbits(1 << num_vars)
+            order, neg = self.random_transform(rng, num_vars)
+            moved = transform(target, num_vars, order, neg)
+            first = cache.minimize(num_vars, target)
+            second = cache.minimize(num_vars, moved)
+            self.assertEqual((cache.hits, cache.misses), (1, 1))
+            self.assertEqual(cover_bitset(first, num_vars), target)
+            self.assertEqual(cover_bitset(second, num_vars), moved)
+            self.assertEqual(literal_total(second, num_vars), literal_total(minimize_sets(num_vars, moved), num_vars))
+
+    def test_lru_eviction(self):
+        cache = CoverCache(maxsize=1)
+        cache.minimize(2, 0b1000)
+        cache.minimize(2, 0b1110)
+        cache.minimize(2, 0b0001)
+        self.assertEqual((cache.hits, cache.misses), (0, 3))
+
+    def test_cut_search_not_cached(self):
+        # циклическая функция: без перебора покрытие не доказано минимальным
+        target = to_bitset([0, 1, 2, 5, 6, 7])
+        cache = CoverCache()
+        with mock.patch.object(qmc, 'MAX_STEPS', 0):
+            cover = cache.minimize(3, target)
+        self.assertEqual(cover_bitset(cover, 3), target)
+        cache.minimize(3, target)
+        self.assertEqual((cache.hits, cache.misses), (0, 2))
+        cache.minimize(3, target)
+        self.assertEqual(cache.hits, 1)
+
+    def test_sqlite_persistence(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'covers.db')
+            cache = CoverCache(path=path)
+            cover = cache.minimize(3, 0b11101000)
+            cache.close()
+            cache = CoverCache(path=path)
+            solver = lambda *args: self.fail("покрытие должно браться из базы")
+            self.assertEqual(cache.minimize(3, 0b11101000, solver=solver), cover)
+            self.assertEqual(cache.hits, 1)
+            cache.close()
+
+
+class TestCirc(unittest.TestCase):
+    def roundtrip(self, inputs, outputs, terms):
+        stream = io.StringIO()
+        write_terms(stream, inputs, outputs, terms)
+        return read_circ(io.BytesIO(stream.getvalue().encode('utf-8')))
+
+    def test_input_offsets(self):
+        self.assertEqual(input_offsets(2), [-20, 20])
+        self.assertEqual(input_offsets(3), [-20, 0, 20])
+        self.assertEqual(input_offsets(4), [-20, -10, 10, 20])
+        self.assertEqual(input_offsets(5), [-20, -10, 0, 10, 20])
+
+    def test_roundtrip_random(self):
+        rng = random.Random(5)
+        for _ in range(30):
+            n = rng.randint(1, 5)
+            on_sets = [rng.getrandbits(1 << n) for _ in range(rng.randint(1, 3))]
+            inputs = [f'x{i}' for i in range(n)]
+            outputs = [f'f{k}' for k in range(len(on_sets))]
+            netlist = self.roundtrip(inputs, outputs, minimize_system(n, on_sets))
+            self.assertEqual(list(netlist.inputs), inputs)
+            tables = netlist.truth_tables()
+            self.assertEqual([tables[name] for name in outputs], on_sets)
+
+    def test_wide_or(self):
+        # нечётность 7 переменных: 64 терма, больше входов одного элемента ИЛИ
+        odd = [m for m in range(128) if bin(m).count('1') % 2]
+        inputs = [f'x{i}' for i in range(7)]
+        netlist = self.roundtrip(inputs, ['p', 'one', 'zero'], [((m, 0), 1) for m in odd] + [((0, 127), 2)])
+        self.assertEqual(netlist.truth_tables(), {'p': to_bitset(odd), 'one': (1 << 128) - 1, 'zero': 0})
+
+    def test_write_covers(self):
+        covers = {'f': [(0b10, 0b01)], 'g': [(0b10, 0b01), (0b01, 0)]}
+        stream = io.StringIO()
+        write_covers(stream, ['a', 'b'], covers)
+        netlist = read_circ(io.BytesIO(stream.getvalue().encode('utf-8')))
+        self.assertEqual(mismatched_outputs(netlist, ['a', 'b'], covers), [])
+        self.assertEqual(mismatched_outputs(netlist, ['b', 'a'], covers), ['f'])
+        self.assertEqual(netlist.evaluate({'a': 0, 'b': 1}), {'f': 0, 'g': 1})
+        # общий куб a — одна линия терма на оба выхода: NOT, AND и OR
+        self.assertEqual(stream.getvalue().count('AND Gate'), 1)
+        self.assertEqual(netlist.gate_count(), 3)
+
+    def test_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'f.circ')
+            write_terms(path, ['a', 'b'], ['f'], [((0b11, 0), 1)])
+            self.assertEqual(read_circ(path).truth_tables(), {'f': 0b1000})
+
+    CIRCUIT = """<project source="2.7.1" version="1.0"><main name="main"/>
+<circuit name="main">{}</circuit></project>"""
+
+    def read(self, body):
+        return read_circ(io.BytesIO(self.CIRCUIT.format(body).encode('utf-8')))
+
+    def test_gates_and_splitter(self):
+        # двухразрядный вход через разветвитель на NAND, за ним NOT
+        netlist = self.read("""
+<comp lib="0" loc="(20,50)" name="Pin"><a name="width" val="2"/><a name="label" val="x"/></comp>
+<comp lib="0" loc="(20,50)" name="Splitter"/>
+<wire from="(40,30)" to="(60,30)"/><wire from="(60,30)" to="(60,60)"/>
+<wire from="(40,40)" to="(50,40)"/><wire from="(50,40)" to="(50,100)"/><wire from="(50,100)" to="(60,100)"/>
+<comp lib="1" loc="(120,80)" name="NAND Gate"><a name="inputs" val="2"/></comp>
+<wire from="(120,80)" to="(130,80)"/>
+<comp lib="1" loc="(160,80)" name="NOT Gate"/>
+<comp lib="0" loc="(120,80)" name="Pin"><a name="output" val="true"/><a name="label" val="z"/></comp>
+<comp lib="0" loc="(160,80)" name="Pin"><a name="output" val="true"/><a name="label" val="y"/></comp>
+""")
+        self.assertEqual(list(netlist.inputs), ['x[1]', 'x[0]'])
+        self.assertEqual(netlist.truth_tables(), {'z': 0b0111, 'y': 0b1000})
+        self.assertEqual(netlist.gate_count(), 2)
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            self.read('<comp lib="2" loc="(10,10)" name="Multiplexer"/>')
+        with self.assertRaises(ValueError):
+            self.read('<comp lib="0" loc="(10,10)" name="Pin"><a name="output" val="true"/></comp>')
+        # петля: выход элемента И подан на его же вход
+        with self.assertRaises(ValueError):
+            self.read("""
+<comp lib="1" loc="(100,100)" name="AND Gate"><a name="inputs" val="2"/></comp>
+<wire from="(100,100)" to="(100,80)"/><wire from="(100,80)" to="(50,80)"/>
+<comp lib="0" loc="(50,120)" name="Pin"/>
+<comp lib="0" loc="(110,100)" name="Pin"><a name="output" val="true"/></comp>
+<wire from="(100,100)" to="(110,100)"/>""")
+        with self.assertRaises(ValueError):
+            Netlist().truth_tables(['a'] * (TRUTH_TABLE_LIMIT + 1))
+
+
+class TestNetsim(unittest.TestCase):
+    def build(self):
+        netlist = Netlist()
+        a, b, c = (netlist.add('input', name) for name in 'abc')
+        ab = netlist.add('and', a, b)
+        netlist.outputs['f'] = netlist.add('or', ab, netlist.add('not', c))
+        netlist.outputs['g'] = netlist.add('xor', a, b, c)
+        netlist.outputs['one'] = netlist.add('const', 1)
+        return netlist
+
+    def test_arrays_and_levels(self):
+        compiled = CompiledNetlist(self.build())
+        self.assertEqual(compiled.levels.tolist(), [0, 0, 0, 1, 1, 2, 1, 0])
+        self.assertEqual(compiled.fanin_start.tolist(), [0, 0, 0, 0, 2, 3, 5, 8, 8])
+        self.assertEqual(compiled.fanin.tolist(), [0, 1, 2, 3, 4, 0, 1, 2])
+        # уровень 1: not, and, xor — три шага; уровень 2: or
+        self.assertEqual([(op, nodes.tolist()) for op, nodes, _ in compiled.steps],
+                         [('not', [4]), ('and', [3]), ('xor', [6]), ('or', [5])])
+        self.assertEqual(compiled.depth(), 2)
+
+    def test_truth_tables(self):
+        netlist = self.build()
+        self.assertEqual(CompiledNetlist(netlist).truth_tables(), netlist.truth_tables())
+        self.assertEqual(CompiledNetlist(netlist).truth_tables(['c', 'b', 'a']), netlist.truth_tables(['c', 'b', 'a']))
+        rng = random.Random(11)
+        for n in (3, 7):
+            on_sets = [rng.getrandbits(1 << n) for _ in range(3)]
+            inputs = [f'x{i}' for i in range(n)]
+            netlist = Netlist.from_terms(inputs, 'fgh', minimize_system(n, on_sets))
+            tables = CompiledNetlist(netlist, block=1).truth_tables()
+            self.assertEqual([tables[name] for name in 'fgh'], on_sets)
+
+    def test_simulate(self):
+        compiled = CompiledNetlist(self.build())
+        columns = {name: np.array([value], dtype=np.uint64) for name, value in zip('abc', (0b1100, 0b1010, 0b0110))}
+        outputs = compiled.simulate(columns)
+        self.assertEqual(int(outputs['f'][0]) & 0xF, 0b1001)
+        self.assertEqual(int(outputs['g'][0]) & 0xF, 0b0000)
+
+    def test_first_difference(self):
+        good = CompiledNetlist(self.build())
+        self.assertIsNone(first_difference(good, CompiledNetlist(self.build())))
+        broken = self.build()
+        broken.outputs['f'] = broken.nodes.index(('and', (0, 1)))
+        self.assertEqual(first_difference(good, CompiledNetlist(broken)), (0, ['f']))
+        # двенадцать входов: расхождение только на последнем наборе
+        inputs = [f'x{i}' for i in range(12)]
+        full = Netlist.from_terms(inputs, ['f'], [((0, 0xFFF), 1)])
+        almost = Netlist.from_terms(inputs, ['f'], [((0, 0xFFF ^ 1 << i), 1) for i in range(12)])
+        self.assertEqual(first_difference(CompiledNetlist(full), CompiledNetlist(almost)), (0xFFF, ['f']))
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            CompiledNetlist(type('Graph', (), {'nodes': [('and', (1,))], 'inputs': {}, 'outputs': {}})())
+        with self.assertRaises(ValueError):
+            CompiledNetlist(type('Graph', (), {'nodes': [('mux', ())], 'inputs': {}, 'outputs': {}})())
+        with self.assertRaises(ValueError):
+            CompiledNetlist(self.build()).simulate({})
+        with self.assertRaises(ValueError):
+            first_difference(CompiledNetlist(self.build()), CompiledNetlist(Netlist.from_terms(['a'], ['f'], [])))
+
+
+if __name__ == "__main__":
+    unittest.main()